@@ -21,12 +21,11 @@
 import command
 import confreader
 import drawer
+import eventloop
 import hook
 import configurable
 import window
 
-import gobject
-
 USE_BAR_DRAW_QUEUE = True
 
 class Gap(command.CommandObject):
@@ -152,6 +151,14 @@ class Bar(Gap, configurable.Configurable):
         self.saved_focus = None
 
         self.queued_draws = 0
+        # Widgets to repaint on the next draw, unless damagedAll is set.
+        self.damaged = set()
+        self.damagedAll = True
+        # The (offset, width) each widget was last painted at, and where
+        # the last widget ended.
+        self.painted = {}
+        self.paintedEnd = None
+        self.drawStats = dict(drawn=0, avoided=0)
 
     def _configure(self, qtile, screen):
         if not self in [screen.top, screen.bottom]:
@@ -210,7 +217,9 @@ class Bar(Gap, configurable.Configurable):
             offset += i.width
 
     def handle_Expose(self, e):
-        self.draw()
+        # The pixmap still holds what was last drawn, or is waiting for a
+        # queued draw.
+        self.drawer.copy(e.x, e.width, e.y, e.height)
 
     def get_widget_in_position(self, e):
         for i in self.widgets:
@@ -253,10 +262,18 @@ class Bar(Gap, configurable.Configurable):
         if not self.saved_focus is None:
             self.saved_focus.window.set_input_focus()
 
-    def draw(self):
+    def draw(self, widget=None):
+        """
+            Redraw widget, or every widget if it is None. Widgets moved or
+            resized as a result are redrawn too.
+        """
+        if widget is None:
+            self.damagedAll = True
+        else:
+            self.damaged.add(widget)
         if USE_BAR_DRAW_QUEUE:
             if self.queued_draws == 0:
-                gobject.idle_add(self._actual_draw)
+                eventloop.idle_add(self._actual_draw)
             self.queued_draws += 1
         else:
             self._actual_draw()
@@ -264,16 +281,53 @@ class Bar(Gap, configurable.Configurable):
     def _actual_draw(self):
         self.queued_draws = 0
         self._resize(self.width, self.widgets)
-        for i in self.widgets:
-            i.draw()
-        if self.widgets:
-            end = i.offset + i.width
-            if end < self.width:
-                self.drawer.draw(end, self.width - end)
+        damaged, everything = self.damaged, self.damagedAll
+        self.damaged, self.damagedAll = set(), False
+
+        # The widgets all draw into our pixmap, which is then copied to the
+        # window a span at a time.
+        spans = []
+        end = 0
+        self.drawer.holdCopies = True
+        try:
+            for i in self.widgets:
+                region = (i.offset, i.width)
+                if everything or i in damaged or \
+                        self.painted.get(i) != region:
+                    i.drawer.set_region(*region)
+                    i.draw()
+                    self.painted[i] = region
+                    spans.append(region)
+                    self.drawStats["drawn"] += 1
+                else:
+                    self.drawStats["avoided"] += 1
+                end = i.offset + i.width
+        finally:
+            self.drawer.holdCopies = False
+        if end < self.width and (everything or end != self.paintedEnd):
+            self.drawer.set_source_rgb(self.background)
+            self.drawer.fillrect(end, 0, self.width - end, self.height)
+            spans.append((end, self.width - end))
+        self.paintedEnd = end
+
+        for offset, width in self._merge(spans):
+            self.drawer.copy(offset, width)
 
         # have to return False here to avoid getting called again
         return False
 
+    def _merge(self, spans):
+        """
+            Join adjacent (offset, width) spans, which are in order.
+        """
+        merged = []
+        for offset, width in spans:
+            if merged and merged[-1][0] + merged[-1][1] == offset:
+                merged[-1] = (merged[-1][0], merged[-1][1] + width)
+            elif width:
+                merged.append((offset, width))
+        return merged
+
     def info(self):
         return dict(
             width=self.width,
@@ -282,6 +336,18 @@ class Bar(Gap, configurable.Configurable):
             window=self.window.window.wid
         )
 
+    def cmd_draw_stats(self, reset=False):
+        """
+            Return the number of widgets drawn, and the number left alone
+            because they were unchanged, when drawing the bar.
+
+            :reset Zero the counters after reading them.
+        """
+        stats = dict(self.drawStats)
+        if reset:
+            self.drawStats = dict(drawn=0, avoided=0)
+        return stats
+
     def cmd_fake_button_press(self, screen, position, x, y, button=1):
         """
             Fake a mouse-button-press on the bar. Co-ordinates are relative
@@ -88,6 +88,8 @@ class _Server(ipc.Server):
         if not cmd:
             return (ERROR, "No such command.")
         self.qtile.log.info("Command: %s(%s, %s)" % (name, args, kwargs))
+        # Commands see the geometry of relayouts asked for earlier.
+        self.qtile.flushLayout()
         try:
             return (SUCCESS, cmd(*args, **kwargs))
         except CommandError, v:
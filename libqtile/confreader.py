@@ -81,6 +81,10 @@ class File(object):
             "auto_fullscreen",
             "widget_defaults",
             "bring_front_click",
+            "coalesce_events",
+            "main_loop",
+            "drag_frame_rate",
+            "text_cache_pixels",
         ]
 
         # We delay importing here to avoid a circular import issue when
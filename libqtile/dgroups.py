@@ -1,6 +1,6 @@
 import itertools
-import gobject
 
+import libqtile.eventloop
 import libqtile.hook
 from libqtile.config import Key
 from libqtile.command import lazy
@@ -46,6 +46,9 @@ def simple_key_binder(mod, keynames=None):
 
 class DGroups(object):
     """ Dynamic Groups """
+    # The window properties read by Match.compare.
+    matchKeys = ["wm_class", "wm_type", "wm_window_role"]
+
     def __init__(self, qtile, dgroups, key_binder=None, delay=1):
         self.qtile = qtile
 
@@ -97,13 +100,20 @@ class DGroups(object):
     def _add(self, client):
         if client in self.timeout:
             self.qtile.log.info('Remove dgroup source')
-            gobject.source_remove(self.timeout[client])
+            libqtile.eventloop.source_remove(self.timeout[client])
             del(self.timeout[client])
 
         # ignore static windows
         if client.defunct:
             return
 
+        # Ask for everything the rules may look at in one round trip.
+        with self.qtile.conn.batch() as batch:
+            batch.snapshot(client.window, self.matchKeys)
+            self._apply_rules(client)
+        self.sort_groups()
+
+    def _apply_rules(self, client):
         group_set = False
         intrusive = False
 
@@ -162,7 +172,6 @@ class DGroups(object):
 
                 self.add_dgroup(Group(group_name, persist=False), start=True)
                 client.togroup(group_name)
-        self.sort_groups()
 
     def sort_groups(self):
         self.qtile.groups.sort(key=lambda g: self.groupMap[g.name].position)
@@ -181,7 +190,7 @@ class DGroups(object):
 
         # Wait the delay until really delete the group
         self.qtile.log.info('Add dgroup timer')
-        self.timeout[client] = gobject.timeout_add_seconds(
+        self.timeout[client] = libqtile.eventloop.timeout_add(
             self.delay,
             delete_client
         )
@@ -7,6 +7,139 @@ import pango
 import xcb.xproto
 
 
+class ExtentCache(object):
+    """
+        The pixel sizes of laid out text, shared by every drawer so that
+        recurring strings are only measured once. Entries are keyed by the
+        text, font family, font size, markup flag, width constraint and wrap
+        flag of the layout, so changing any of them is a miss. Past size
+        entries, the least recently used one is dropped.
+    """
+    def __init__(self, size=1000):
+        self.size = size
+        self.reset()
+
+    def reset(self):
+        self.sizes = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, measure):
+        """
+            The size cached for key, or the result of measure() if there is
+            none yet.
+        """
+        try:
+            value = self.sizes.pop(key)
+            self.hits += 1
+        except KeyError:
+            value = measure()
+            self.misses += 1
+            if len(self.sizes) >= self.size:
+                self.sizes.popitem(last=False)
+        self.sizes[key] = value
+        return value
+
+extentCache = ExtentCache()
+
+
+class SurfaceCache(object):
+    """
+        Rendered text, as image surfaces that TextLayout.draw paints instead
+        of laying the text out again. Entries are keyed like those of
+        ExtentCache, plus the colour and shadow colour. The least recently
+        used surfaces are dropped to keep the total number of pixels below
+        maxPixels, and a maxPixels of 0 disables the cache.
+    """
+    def __init__(self, maxPixels=0):
+        self.maxPixels = maxPixels
+        self.reset()
+
+    def reset(self):
+        self.surfaces = collections.OrderedDict()
+        self.pixels = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        """
+            The (surface, x, y) cached for key, or the one returned by
+            render() if there is none yet. x, y is the position of the
+            surface relative to the layout.
+        """
+        try:
+            value = self.surfaces.pop(key)
+            self.hits += 1
+        except KeyError:
+            value = render()
+            self.misses += 1
+            pixels = self._pixels(value)
+            if pixels > self.maxPixels:
+                return value
+            self.pixels += pixels
+            while self.pixels > self.maxPixels:
+                _, dropped = self.surfaces.popitem(last=False)
+                self.pixels -= self._pixels(dropped)
+        self.surfaces[key] = value
+        return value
+
+    def _pixels(self, value):
+        surface = value[0]
+        return surface.get_width() * surface.get_height()
+
+surfaceCache = SurfaceCache()
+
+
+class PatternCache(object):
+    """
+        Colours parsed into RGBA tuples, and the vertical gradients built
+        from them for a given height, shared by every drawer. Configured
+        colours are few, so each table is just emptied if it ever grows past
+        size entries.
+    """
+    def __init__(self, size=1000):
+        self.size = size
+        self.colours = {}
+        self.gradients = {}
+
+    def rgba(self, colour):
+        """
+            The (r, g, b, a) tuple of colour, in any form utils.rgb accepts.
+        """
+        if isinstance(colour, list):
+            colour = tuple(colour)
+        try:
+            return self.colours[colour]
+        except KeyError:
+            if len(self.colours) >= self.size:
+                self.colours.clear()
+            value = self.colours[colour] = tuple(utils.rgb(colour))
+            return value
+
+    def gradient(self, colours, height):
+        """
+            A gradient from the first to the second of colours, from the top
+            to the bottom of height.
+        """
+        # Stops can be given as lists, which can't be hashed.
+        key = (
+            tuple(tuple(c) if isinstance(c, list) else c for c in colours),
+            height
+        )
+        try:
+            return self.gradients[key]
+        except KeyError:
+            if len(self.gradients) >= self.size:
+                self.gradients.clear()
+            linear = cairo.LinearGradient(0.0, 0.0, 0.0, height)
+            linear.add_color_stop_rgba(0.0, *self.rgba(colours[0]))
+            linear.add_color_stop_rgba(1.0, *self.rgba(colours[1]))
+            self.gradients[key] = linear
+            return linear
+
+patternCache = PatternCache()
+
+
 class TextLayout(object):
     def __init__(self, drawer, text, colour, font_family, font_size,
                  font_shadow, wrap=True, markup=False):
@@ -21,9 +154,11 @@ class TextLayout(object):
         layout.set_font_description(desc)
         self.font_shadow = font_shadow
         self.layout = layout
+        self.wrap = wrap
         self.markup = markup
-        self.text = text
+        self._font = (font_family, font_size)
         self._width = None
+        self.text = text
 
     @property
     def text(self):
@@ -31,17 +166,25 @@ class TextLayout(object):
 
     @text.setter
     def text(self, value):
+        self._text = value
         if self.markup:
             attrlist, value, accel_char = pango.parse_markup(value)
             self.layout.set_attributes(attrlist)
         return self.layout.set_text(utils.scrub_to_utf8(value))
 
+    def _key(self):
+        return (self._text,) + self._font + \
+            (self.markup, self._width, self.wrap)
+
+    def _pixel_size(self):
+        return extentCache.get(self._key(), self.layout.get_pixel_size)
+
     @property
     def width(self):
         if self._width is not None:
             return self._width
         else:
-            return self.layout.get_pixel_size()[0]
+            return self._pixel_size()[0]
 
     @width.setter
     def width(self, value):
@@ -55,7 +198,7 @@ class TextLayout(object):
 
     @property
     def height(self):
-        return self.layout.get_pixel_size()[1]
+        return self._pixel_size()[1]
 
     def fontdescription(self):
         return self.layout.get_font_description()
@@ -70,6 +213,7 @@ class TextLayout(object):
         d = self.fontdescription()
         d.set_family(font)
         self.layout.set_font_description(d)
+        self._font = (font, self._font[1])
 
     @property
     def font_size(self):
@@ -82,8 +226,23 @@ class TextLayout(object):
         d.set_size(size)
         d.set_absolute_size(size * pango.SCALE)
         self.layout.set_font_description(d)
+        self._font = (self._font[0], size)
 
     def draw(self, x, y):
+        # Gradients depend on where the text is drawn, they're not cached.
+        if surfaceCache.maxPixels and type(self.colour) != list and \
+                type(self.font_shadow) != list:
+            surface, sx, sy = surfaceCache.get(
+                self._key() + (self.colour, self.font_shadow),
+                self._render
+            )
+            self.drawer.ctx.set_source_surface(surface, x + sx, y + sy)
+            self.drawer.ctx.rectangle(
+                x + sx, y + sy, surface.get_width(), surface.get_height()
+            )
+            self.drawer.ctx.fill()
+            return
+
         if self.font_shadow is not None:
             self.drawer.set_source_rgb(self.font_shadow)
             self.drawer.ctx.move_to(x+1, y+1)
@@ -93,6 +252,32 @@ class TextLayout(object):
         self.drawer.ctx.move_to(x, y)
         self.drawer.ctx.show_layout(self.layout)
 
+    def _render(self):
+        """
+            Render the text, and its shadow, on a transparent surface
+            covering both its ink and logical extents.
+        """
+        ink, logical = self.layout.get_pixel_extents()
+        x = min(ink[0], logical[0])
+        y = min(ink[1], logical[1])
+        width = max(ink[0] + ink[2], logical[0] + logical[2]) - x
+        height = max(ink[1] + ink[3], logical[1] + logical[3]) - y
+        if self.font_shadow is not None:
+            width += 1
+            height += 1
+        surface = cairo.ImageSurface(
+            cairo.FORMAT_ARGB32, max(width, 1), max(height, 1)
+        )
+        ctx = pangocairo.CairoContext(cairo.Context(surface))
+        if self.font_shadow is not None:
+            ctx.set_source_rgba(*patternCache.rgba(self.font_shadow))
+            ctx.move_to(1 - x, 1 - y)
+            ctx.show_layout(self.layout)
+        ctx.set_source_rgba(*patternCache.rgba(self.colour))
+        ctx.move_to(-x, -y)
+        ctx.show_layout(self.layout)
+        return surface, x, y
+
     def framed(self, border_width, border_color, pad_x, pad_y):
         return TextFrame(self, border_width, border_color, pad_x, pad_y)
 
@@ -164,12 +349,18 @@ class Drawer:
     """
         A helper class for drawing and text layout.
 
-        We have a drawer object for each widget in the bar. The underlying
-        surface is a pixmap with the same size as the bar itself. We draw to
-        the pixmap starting at offset 0, 0, and when the time comes to display
+        The underlying surface is a pixmap of the given size. We draw to the
+        pixmap starting at offset 0, 0, and when the time comes to display
         to the window, we copy the appropriate portion of the pixmap onto the
         window.
+
+        Each bar has one drawer, and each of its widgets a SubDrawer drawing
+        into the bar's pixmap.
     """
+    # Set while the owner of the drawer is going to copy the pixmap itself,
+    # so that its SubDrawers don't copy their regions.
+    holdCopies = False
+
     def __init__(self, qtile, wid, width, height):
         self.qtile = qtile
         self.wid, self.width, self.height = wid, width, height
@@ -194,7 +385,7 @@ class Drawer:
             ]
         )
         self.surface = cairo.XCBSurface(
-            qtile.conn.conn,
+            qtile.conn.native,
             self.pixmap,
             self.find_root_visual(),
             self.width,
@@ -242,20 +433,48 @@ class Drawer:
         self.ctx.fill()
         self.ctx.stroke()
 
-    def draw(self, offset, width):
+    def draw(self, offset, width, y=0, height=None):
         """
             offset: the X offset to start drawing at.
             width: the portion of the canvas to draw at the starting point.
+            y, height: the rows of the canvas to draw, all of them by
+            default.
         """
+        if height is None:
+            height = self.height - y
         self.qtile.conn.conn.core.CopyArea(
             self.pixmap,
             self.wid,
             self.gc,
-            0, 0,  # srcx, srcy
-            offset, 0,  # dstx, dsty
-            width, self.height
+            0, y,  # srcx, srcy
+            offset, y,  # dstx, dsty
+            width, height
         )
 
+    def copy(self, offset, width, y=0, height=None):
+        """
+            Copy the region of the pixmap starting at offset to the same
+            place in the window.
+        """
+        if height is None:
+            height = self.height - y
+        self.qtile.conn.conn.core.CopyArea(
+            self.pixmap,
+            self.wid,
+            self.gc,
+            offset, y,  # srcx, srcy
+            offset, y,  # dstx, dsty
+            width, height
+        )
+
+    def free(self):
+        """
+            Free the pixmap and GC. The drawer can't be used afterwards.
+        """
+        self.surface.finish()
+        self.qtile.conn.conn.core.FreeGC(self.gc)
+        self.qtile.conn.conn.core.FreePixmap(self.pixmap)
+
     def find_root_visual(self):
         for i in self.qtile.conn.default_screen.allowed_depths:
             for v in i.visuals:
@@ -267,33 +486,12 @@ class Drawer:
 
     def set_source_rgb(self, colour):
         if type(colour) == list:
-            linear = cairo.LinearGradient(0.0, 0.0, 0.0, self.height)
-            c1 = utils.rgb(colour[0])
-            c2 = utils.rgb(colour[1])
-            if len(c1) < 4:
-                c1[3] = 1
-            if len(c2) < 4:
-                c2[3] = 1
-            linear.add_color_stop_rgba(0.0, c1[0], c1[1], c1[2], c1[3])
-            linear.add_color_stop_rgba(1.0, c2[0], c2[1], c2[2], c2[3])
-            self.ctx.set_source(linear)
+            self.ctx.set_source(patternCache.gradient(colour, self.height))
         else:
-            self.ctx.set_source_rgba(*utils.rgb(colour))
+            self.ctx.set_source_rgba(*patternCache.rgba(colour))
 
     def clear(self, colour):
-        if type(colour) == list:
-            linear = cairo.LinearGradient(0.0, 0.0, 0.0, self.height)
-            c1 = utils.rgb(colour[0])
-            c2 = utils.rgb(colour[1])
-            if len(c1) < 4:
-                c1[3] = 1
-            if len(c2) < 4:
-                c2[3] = 1
-            linear.add_color_stop_rgba(0.0, c1[0], c1[1], c1[2], c1[3])
-            linear.add_color_stop_rgba(1.0, c2[0], c2[1], c2[2], c2[3])
-            self.ctx.set_source(linear)
-        else:
-            self.set_source_rgb(colour)
+        self.set_source_rgb(colour)
         self.ctx.rectangle(0, 0, self.width, self.height)
         self.ctx.fill()
         self.ctx.stroke()
@@ -321,8 +519,11 @@ class Drawer:
             self._sizelayout = self.textlayout(
                 "", "ffffff", font_family, font_size, None)
         widths, heights = [], []
-        self._sizelayout.font_family = font_family
-        self._sizelayout.font_size = font_size
+        # The sizes are cached in extentCache, only tell pango about a
+        # different font.
+        if self._sizelayout._font != (font_family, font_size):
+            self._sizelayout.font_family = font_family
+            self._sizelayout.font_size = font_size
         for i in texts:
             self._sizelayout.text = i
             widths.append(self._sizelayout.width)
@@ -384,3 +585,45 @@ class Drawer:
         self.ctx.line_to(x2, y)
         self.ctx.set_line_width(linewidth)
         self.ctx.stroke()
+
+
+class SubDrawer(Drawer):
+    """
+        A drawer for one widget of a bar. It has no pixmap of its own: it
+        draws into the region of the parent drawer's pixmap given by
+        set_region, translated so that the region starts at 0, 0 and clipped
+        to it.
+    """
+    def __init__(self, parent):
+        self.qtile = parent.qtile
+        self.parent = parent
+        self.wid, self.width, self.height = \
+            parent.wid, parent.width, parent.height
+        self.pixmap, self.gc, self.surface = \
+            parent.pixmap, parent.gc, parent.surface
+        self.ctx = self.new_ctx()
+        self.set_region(0, 0)
+
+    def set_region(self, offset, width):
+        """
+            Draw to the width pixels of the parent starting at offset.
+        """
+        self.ctx.reset_clip()
+        self.ctx.identity_matrix()
+        self.ctx.translate(offset, 0)
+        self.ctx.rectangle(0, 0, width, self.height)
+        self.ctx.clip()
+
+    def draw(self, offset, width, y=0, height=None):
+        """
+            Copy the region of the parent at offset to the window, unless
+            the parent is going to copy it itself.
+        """
+        if self.parent.holdCopies:
+            return
+        self.copy(offset, width, y, height)
+
+    def free(self):
+        """
+            The pixmap and GC belong to the parent, there's nothing to free.
+        """
@@ -0,0 +1,229 @@
+# Copyright (c) 2008, Aldo Cortesi. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    Main loop backends. Qtile drives the X connection, the IPC socket,
+    widget timers and idle callbacks through the backend selected with the
+    ``main_loop`` config option: "glib" (the default) or "asyncio".
+
+    Callbacks follow the glib conventions: they are called with the
+    arguments given when they were added, and are removed unless they
+    return True. The module level functions operate on the backend set up
+    by init, which is the glib one if init has not been called.
+"""
+import itertools
+import gobject
+import utils
+
+try:
+    import asyncio
+except ImportError:
+    try:
+        # Python 2 port of asyncio
+        import trollius as asyncio
+    except ImportError:
+        asyncio = None
+
+
+class GlibLoop:
+    """
+        The glib main loop, as used by pygtk, dbus and friends.
+    """
+    def __init__(self):
+        self.context = gobject.main_context_default()
+
+    @staticmethod
+    def _io(source, cond, callback, args):
+        return callback(*args)
+
+    def add_reader(self, fd, callback, *args):
+        return gobject.io_add_watch(
+            fd, gobject.IO_IN, self._io, callback, args
+        )
+
+    def add_writer(self, fd, callback, *args):
+        return gobject.io_add_watch(
+            fd, gobject.IO_OUT, self._io, callback, args
+        )
+
+    def timeout_add(self, seconds, callback, *args):
+        # timeout_add_seconds is better for battery usage, but only works
+        # with integer timeouts.
+        if int(seconds) == seconds:
+            return gobject.timeout_add_seconds(int(seconds), callback, *args)
+        return gobject.timeout_add(int(seconds * 1000), callback, *args)
+
+    def idle_add(self, callback, *args):
+        return gobject.idle_add(callback, *args)
+
+    def source_remove(self, tag):
+        gobject.source_remove(tag)
+
+    def iteration(self):
+        """
+            Block until at least one callback has run. Returns True if
+            something was dispatched.
+        """
+        return self.context.iteration(True)
+
+
+class AsyncioLoop:
+    """
+        An asyncio event loop (or trollius, on Python 2). Coroutines can be
+        scheduled on the underlying loop, available as the loop attribute.
+        Sources added directly through glib, like the dbus notification
+        service, are not run by this backend.
+    """
+    def __init__(self):
+        if asyncio is None:
+            raise utils.QtileError(
+                "The asyncio main loop needs asyncio or trollius."
+            )
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._tags = itertools.count(1)
+        self._sources = {}
+
+    def _run(self, tag, callback, args):
+        try:
+            return callback(*args)
+        finally:
+            # Hand control back to iteration once this pass is over.
+            self.loop.stop()
+
+    def _io(self, tag, callback, args):
+        if not self._run(tag, callback, args):
+            self.source_remove(tag)
+
+    def _timeout(self, tag, seconds, callback, args):
+        if tag not in self._sources:
+            return
+        if self._run(tag, callback, args):
+            self._sources[tag] = self.loop.call_later(
+                seconds, self._timeout, tag, seconds, callback, args
+            )
+        else:
+            self._sources.pop(tag, None)
+
+    def _idle(self, tag, callback, args):
+        if tag not in self._sources:
+            return
+        if self._run(tag, callback, args):
+            self._sources[tag] = self.loop.call_soon(
+                self._idle, tag, callback, args
+            )
+        else:
+            self._sources.pop(tag, None)
+
+    def add_reader(self, fd, callback, *args):
+        if hasattr(fd, "fileno"):
+            fd = fd.fileno()
+        tag = next(self._tags)
+        self._sources[tag] = (self.loop.remove_reader, fd)
+        self.loop.add_reader(fd, self._io, tag, callback, args)
+        return tag
+
+    def add_writer(self, fd, callback, *args):
+        if hasattr(fd, "fileno"):
+            fd = fd.fileno()
+        tag = next(self._tags)
+        self._sources[tag] = (self.loop.remove_writer, fd)
+        self.loop.add_writer(fd, self._io, tag, callback, args)
+        return tag
+
+    def timeout_add(self, seconds, callback, *args):
+        tag = next(self._tags)
+        self._sources[tag] = self.loop.call_later(
+            seconds, self._timeout, tag, seconds, callback, args
+        )
+        return tag
+
+    def idle_add(self, callback, *args):
+        # Widgets add idle callbacks from their worker threads.
+        tag = next(self._tags)
+        self._sources[tag] = None
+        handle = self.loop.call_soon_threadsafe(
+            self._idle, tag, callback, args
+        )
+        if self._sources.get(tag, False) is None:
+            self._sources[tag] = handle
+        return tag
+
+    def source_remove(self, tag):
+        source = self._sources.pop(tag, None)
+        if isinstance(source, tuple):
+            remove, fd = source
+            remove(fd)
+        elif source is not None:
+            source.cancel()
+
+    def iteration(self):
+        """
+            Block until at least one callback has run. Returns True if
+            something was dispatched.
+        """
+        self.loop.run_forever()
+        return True
+
+
+BACKENDS = {
+    "glib": GlibLoop,
+    "asyncio": AsyncioLoop,
+}
+
+loop = None
+
+
+def init(name="glib"):
+    """
+        Set up the main loop backend called name, and make it the one used
+        by the module level functions.
+    """
+    global loop
+    if name not in BACKENDS:
+        raise utils.QtileError("Unknown main loop: %s" % name)
+    loop = BACKENDS[name]()
+    return loop
+
+
+def get():
+    if loop is None:
+        init()
+    return loop
+
+
+def add_reader(fd, callback, *args):
+    return get().add_reader(fd, callback, *args)
+
+
+def add_writer(fd, callback, *args):
+    return get().add_writer(fd, callback, *args)
+
+
+def timeout_add(seconds, callback, *args):
+    return get().timeout_add(seconds, callback, *args)
+
+
+def idle_add(callback, *args):
+    return get().idle_add(callback, *args)
+
+
+def source_remove(tag):
+    get().source_remove(tag)
@@ -74,6 +74,14 @@ class _Group(command.CommandObject):
         self.layout.show(screen)
 
     def layoutAll(self, warp=False):
+        """
+        Ask for the group to be laid out. Requests are coalesced: the
+        group is laid out once, before the X connection is next flushed,
+        or when Qtile.flushLayout is called.
+        """
+        self.qtile.requestLayout(self, warp)
+
+    def _layoutAll(self, warp=False):
         """
         Layout the floating layer, then the current layout.
 
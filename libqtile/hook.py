@@ -1,3 +1,4 @@
+import time
 import traceback
 import utils
 
@@ -148,6 +149,8 @@ class Subscribe:
     def client_name_updated(self, func):
         """
             Called when the client name changes.
+
+            - arguments: window.Window object whose name changed.
         """
         return self._subscribe("client_name_updated", func)
 
@@ -213,9 +216,13 @@ def fire(event, *args, **kwargs):
             "Internal event: %s(%s, %s)" %
             (event, args, kwargs)
         )
+    start = time.time()
     for i in subscriptions.get(event, []):
         try:
             i(*args, **kwargs)
         except Exception as e:
             qtile.log.error("Error in hook %s:\n%s" % (
                 event, traceback.format_exc()))
+    stats = getattr(qtile, "eventStats", None)
+    if stats is not None:
+        stats.add("hook", event, time.time() - start)
@@ -30,7 +30,7 @@ import logging
 import os.path
 import socket
 import struct
-import gobject
+import eventloop
 import errno
 import fcntl
 
@@ -117,16 +117,14 @@ class Server(_IPC):
 
     def close(self):
         self.log.info('Remove source on server close')
-        gobject.source_remove(self.gob_tag)
+        eventloop.source_remove(self.tag)
         self.sock.close()
 
     def start(self):
         self.log.info('Add io watch on server start')
-        self.gob_tag = gobject.io_add_watch(
-            self.sock, gobject.IO_IN, self._connection
-        )
+        self.tag = eventloop.add_reader(self.sock, self._connection)
 
-    def _connection(self, sock, cond):
+    def _connection(self):
         try:
             conn, _ = self.sock.accept()
         except socket.error as er:
@@ -139,10 +137,10 @@ class Server(_IPC):
             conn.setblocking(0)
             data = {'buffer': ''}  # object which holds connection state
             self.log.info('Add io watch on _connection')
-            gobject.io_add_watch(conn, gobject.IO_IN, self._receive, data)
+            eventloop.add_reader(conn, self._receive, conn, data)
             return True
 
-    def _receive(self, conn, cond, data):
+    def _receive(self, conn, data):
         try:
             recv = conn.recv(4096)
         except socket.error as er:
@@ -152,9 +150,8 @@ class Server(_IPC):
         else:
             if recv == '':
                 self.log.info('Remove source on receive')
-                gobject.source_remove(data['tag'])
                 conn.close()
-                return True
+                return False
 
             data['buffer'] += recv
             if 'header' not in data and len(data['buffer']) >= HDRLEN:
@@ -167,10 +164,10 @@ class Server(_IPC):
             req = self._unpack_body(data['buffer'])
             data['result'] = self._pack_reply(self.handler(req))
             self.log.info('Add io watch on receive')
-            gobject.io_add_watch(conn, gobject.IO_OUT, self._send, data)
+            eventloop.add_writer(conn, self._send, conn, data)
             return False
 
-    def _send(self, conn, cond, data):
+    def _send(self, conn, data):
         try:
             bytes = conn.send(data['result'])
         except socket.error as er:
@@ -50,8 +50,29 @@ class Layout(command.CommandObject, configurable.Configurable):
 
     def layout(self, windows, screen):
         assert windows, "let's eliminate unnecessary calls"
-        for i in windows:
-            self.configure(i, screen)
+        arrangement = self.arrange(windows, screen)
+        if arrangement is None:
+            for i in windows:
+                self.configure(i, screen)
+            return
+        for win, placement in arrangement:
+            if placement is None:
+                win.hide()
+            else:
+                win.place(*placement)
+                win.unhide()
+
+    def arrange(self, windows, screen):
+        """
+            Compute the placement of all of windows in one pass. Returns a
+            list of (window, placement) tuples, where placement is either
+            None to hide the window, or the (x, y, width, height,
+            borderwidth, bordercolor) arguments of its .place() method.
+
+            Layouts that don't implement this return None, and have
+            configure called for each window instead.
+        """
+        return None
 
     def clone(self, group):
         """
@@ -101,6 +122,8 @@ class Layout(command.CommandObject, configurable.Configurable):
                 - Configure the dimensions and borders of a window using the
                   .place() method.
                 - Call either .hide or .unhide on the window.
+
+            It is not needed by layouts that implement arrange.
         """
         raise NotImplementedError
 
@@ -0,0 +1,270 @@
+"""
+    Rectangle math shared by the tiling layouts.
+
+    Each function takes a list of jobs, one for each group being laid out,
+    and returns the rectangles of every job: a list with one list of
+    (x, y, width, height) tuples per job, in window order. The groups of
+    several screens can be computed in one call.
+
+    If NumPy is installed, calls covering at least numpy_threshold windows
+    are computed as arrays. The pure Python code gives identical results,
+    and is used otherwise.
+"""
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Below this many windows the array setup costs more than it saves.
+numpy_threshold = 64
+
+
+def _useNumpy(counts):
+    return numpy is not None and sum(counts) >= numpy_threshold
+
+
+def _indexes(counts):
+    """
+        The job of each window, and its index within that job.
+    """
+    counts = numpy.array(counts, dtype=int)
+    job = numpy.repeat(numpy.arange(len(counts)), counts)
+    starts = numpy.cumsum(counts) - counts
+    return job, numpy.arange(counts.sum()) - starts[job]
+
+
+def _columns(jobs, n):
+    """
+        The n first fields of jobs, as arrays.
+    """
+    return [numpy.array(i) for i in zip(*jobs)[:n]]
+
+
+def _rects(jobs):
+    """
+        The x, y, width and height of the rects of jobs, which are the
+        second to last field of each job, as arrays.
+    """
+    return [
+        numpy.array([getattr(j[-2], i) for j in jobs])
+        for i in ("x", "y", "width", "height")
+    ]
+
+
+def _split(x, y, width, height, counts):
+    rects = zip(x.tolist(), y.tolist(), width.tolist(), height.tolist())
+    result = []
+    start = 0
+    for n in counts:
+        result.append(rects[start:start + n])
+        start += n
+    return result
+
+
+def grid(jobs):
+    """
+        Cells of equal size, filled a row at a time. Jobs are (count,
+        columns, rect, border_width) tuples.
+    """
+    counts = [j[0] for j in jobs]
+    if _useNumpy(counts):
+        return _gridNumpy(jobs, counts)
+    return [_grid(*j) for j in jobs]
+
+
+def _grid(count, columns, rect, border):
+    if not count:
+        return []
+    column_size = int(math.ceil(float(count) / columns))
+    column_width = int(rect.width / float(columns))
+    row_height = int(rect.height / float(column_size))
+    return [
+        (
+            rect.x + (i % columns) * column_width,
+            rect.y + (i / columns) * row_height,
+            column_width - 2 * border,
+            row_height - 2 * border
+        )
+        for i in range(count)
+    ]
+
+
+def _gridNumpy(jobs, counts):
+    count, columns = _columns(jobs, 2)
+    border = numpy.array([j[-1] for j in jobs])
+    rx, ry, rwidth, rheight = _rects(jobs)
+    column_size = numpy.ceil(count / columns.astype(float)).astype(int)
+    column_width = (rwidth / columns.astype(float)).astype(int)
+    row_height = (
+        rheight / numpy.maximum(column_size, 1).astype(float)
+    ).astype(int)
+    job, i = _indexes(counts)
+    return _split(
+        rx[job] + (i % columns[job]) * column_width[job],
+        ry[job] + (i // columns[job]) * row_height[job],
+        (column_width - 2 * border)[job],
+        (row_height - 2 * border)[job],
+        counts
+    )
+
+
+def tile(jobs):
+    """
+        A column of master windows, and the rest stacked beside it. Jobs are
+        (count, master, ratio, expand, margin, rect, border_width) tuples;
+        if expand is set and there are only master windows, they take the
+        whole width of rect.
+    """
+    counts = [j[0] for j in jobs]
+    if _useNumpy(counts):
+        return _tileNumpy(jobs, counts)
+    return [_tile(*j) for j in jobs]
+
+
+def _tile(count, master, ratio, expand, margin, rect, border):
+    masterWidth = int(rect.width * ratio)
+    slaves = max(count - master, 0)
+    rects = []
+    for pos in range(count):
+        if pos < master:
+            w = masterWidth if slaves or not expand else rect.width
+            h = rect.height / master
+            x = rect.x
+            y = rect.y + pos * h
+        else:
+            w = rect.width - masterWidth
+            h = rect.height / slaves
+            x = rect.x + masterWidth
+            y = rect.y + (pos - master) * h
+        rects.append((
+            x + margin,
+            y + margin,
+            w - margin * 2 - border * 2,
+            h - margin * 2 - border * 2
+        ))
+    return rects
+
+
+def _tileNumpy(jobs, counts):
+    count, master, ratio, expand, margin = _columns(jobs, 5)
+    border = numpy.array([j[-1] for j in jobs])
+    rx, ry, rwidth, rheight = _rects(jobs)
+    masterWidth = (rwidth * ratio.astype(float)).astype(int)
+    slaves = numpy.maximum(count - master, 0)
+    masterW = numpy.where(
+        (slaves > 0) | ~expand.astype(bool), masterWidth, rwidth
+    )
+    masterH = rheight // numpy.maximum(master, 1)
+    slaveH = rheight // numpy.maximum(slaves, 1)
+    job, pos = _indexes(counts)
+    isMaster = pos < master[job]
+    w = numpy.where(isMaster, masterW[job], (rwidth - masterWidth)[job])
+    h = numpy.where(isMaster, masterH[job], slaveH[job])
+    x = numpy.where(isMaster, rx[job], (rx + masterWidth)[job])
+    y = ry[job] + numpy.where(isMaster, pos, pos - master[job]) * h
+    m = margin[job]
+    b = border[job]
+    return _split(
+        x + m,
+        y + m,
+        w - m * 2 - b * 2,
+        h - m * 2 - b * 2,
+        counts
+    )
+
+
+def rows(jobs):
+    """
+        Rows of equal height, filling rect. Jobs are (count, rect,
+        border_width) tuples.
+    """
+    counts = [j[0] for j in jobs]
+    if _useNumpy(counts):
+        return _rowsNumpy(jobs, counts)
+    return [_rows(*j) for j in jobs]
+
+
+def _rows(count, rect, border):
+    if not count:
+        return []
+    row_height = int(rect.height / float(count))
+    return [
+        (
+            rect.x,
+            rect.y + i * row_height,
+            rect.width - 2 * border,
+            row_height - 2 * border
+        )
+        for i in range(count)
+    ]
+
+
+def _rowsNumpy(jobs, counts):
+    count, = _columns(jobs, 1)
+    border = numpy.array([j[-1] for j in jobs])
+    rx, ry, rwidth, rheight = _rects(jobs)
+    row_height = (
+        rheight / numpy.maximum(count, 1).astype(float)
+    ).astype(int)
+    job, i = _indexes(counts)
+    return _split(
+        rx[job],
+        ry[job] + i * row_height[job],
+        (rwidth - 2 * border)[job],
+        (row_height - 2 * border)[job],
+        counts
+    )
+
+
+def stacked(jobs):
+    """
+        Rows stacked top to bottom, with heights given as fractions of the
+        height of rect. Jobs are (sizes, rect, border_width) tuples.
+    """
+    counts = [len(j[0]) for j in jobs]
+    if _useNumpy(counts):
+        return _stackedNumpy(jobs, counts)
+    return [_stacked(*j) for j in jobs]
+
+
+def _stacked(sizes, rect, border):
+    rects = []
+    offset = 0
+    for size in sizes:
+        rects.append((
+            rect.x,
+            rect.y + int(offset * rect.height),
+            rect.width - 2 * border,
+            int(size * rect.height) - 2 * border
+        ))
+        offset += size
+    return rects
+
+
+def _stackedNumpy(jobs, counts):
+    border = numpy.array([j[-1] for j in jobs])
+    rx, ry, rwidth, rheight = _rects(jobs)
+    sizes = numpy.array(
+        [s for j in jobs for s in j[0]], dtype=float
+    )
+    # Accumulate each job on its own, so the sums are those of the Python
+    # code.
+    offsets = numpy.zeros(len(sizes))
+    start = 0
+    for n in counts:
+        if n > 1:
+            numpy.cumsum(
+                sizes[start:start + n - 1],
+                out=offsets[start + 1:start + n]
+            )
+        start += n
+    job, i = _indexes(counts)
+    return _split(
+        rx[job],
+        ry[job] + (offsets * rheight[job]).astype(int),
+        (rwidth - 2 * border)[job],
+        (sizes * rheight[job]).astype(int) - 2 * border[job],
+        counts
+    )
@@ -1,6 +1,7 @@
 import math
 
 from base import Layout
+import geometry
 
 
 class Matrix(Layout):
@@ -73,31 +74,29 @@ class Matrix(Layout):
         else:
             return None
 
-    def configure(self, c, screen):
-        idx = self.windows.index(c)
-        column = idx % self.columns
-        row = idx / self.columns
-        column_size = int(math.ceil(float(len(self.windows)) / self.columns))
-        if (column, row) == self.current_window:
-            px = self.group.qtile.colorPixel(self.border_focus)
-        else:
-            px = self.group.qtile.colorPixel(self.border_normal)
-        column_width = int(screen.width / float(self.columns))
-        row_height = int(screen.height / float(column_size))
-        xoffset = screen.x + column * column_width
-        yoffset = screen.y + row * row_height
-        win_width = column_width - 2 * self.border_width
-        win_height = row_height - 2 * self.border_width
-
-        c.place(
-            xoffset,
-            yoffset,
-            win_width,
-            win_height,
-            self.border_width,
-            px
-        )
-        c.unhide()
+    def arrange(self, windows, screen):
+        rects = geometry.grid([(
+            len(self.windows),
+            self.columns,
+            screen,
+            self.border_width
+        )])[0]
+        focusPixel = self.group.qtile.colorPixel(self.border_focus)
+        normalPixel = self.group.qtile.colorPixel(self.border_normal)
+        positions = dict((c, i) for i, c in enumerate(self.windows))
+        arrangement = []
+        for c in windows:
+            idx = positions.get(c)
+            if idx is None:
+                arrangement.append((c, None))
+                continue
+            if (idx % self.columns, idx / self.columns) == \
+                    self.current_window:
+                px = focusPixel
+            else:
+                px = normalPixel
+            arrangement.append((c, rects[idx] + (self.border_width, px)))
+        return arrangement
 
     def cmd_next(self):
         """
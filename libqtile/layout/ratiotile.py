@@ -183,6 +183,24 @@ class GridInfo(object):
         return results
 
 
+class GridCache(object):
+    """
+    A bounded cache of the grid sizes computed by GridInfo, keyed by
+    (number of windows, width, height, ratio, fancy). The sizes are relative
+    to the top left corner of the screen.
+    """
+    @utils.LRUCache(64)
+    def get_sizes(self, num_windows, width, height, ratio, fancy):
+        gi = GridInfo(ratio, num_windows, width, height)
+        if fancy:
+            return tuple(gi.get_sizes_advanced(width, height))
+        return tuple(gi.get_sizes(width, height))
+
+
+# Shared by all RatioTile instances, across groups and screens.
+gridCache = GridCache()
+
+
 class RatioTile(Layout):
     """
     Tries to tile all windows in the width/height ratio passed in
@@ -202,10 +220,7 @@ class RatioTile(Layout):
         self.ratio_increment = ratio_increment
         self.ratio = ratio
         self.focused = None
-        self.dirty = True  # need to recalculate
         self.layout_info = []
-        self.last_size = None
-        self.last_screen = None
         self.fancy = fancy
 
     def clone(self, group):
@@ -220,11 +235,9 @@ class RatioTile(Layout):
         self.focused = None
 
     def add(self, w):
-        self.dirty = True
         self.windows.insert(0, w)
 
     def remove(self, w):
-        self.dirty = True
         if self.focused is w:
             self.focused = None
         self.windows.remove(w)
@@ -232,55 +245,40 @@ class RatioTile(Layout):
             self.focused = self.windows[0]
         return self.focused
 
-    def configure(self, win, screen):
-        # force recalc
-        if not self.last_screen or self.last_screen != screen:
-            self.last_screen = screen
-            self.dirty = True
-        if self.last_size and not self.dirty:
-            if screen.width != self.last_size[0] or \
-                    screen.height != self.last_size[1]:
-                self.dirty = True
-        if self.dirty:
-            gi = GridInfo(
-                self.ratio,
+    def arrange(self, windows, screen):
+        self.layout_info = [
+            (x + screen.x, y + screen.y, w, h)
+            for x, y, w, h in gridCache.get_sizes(
                 len(self.windows),
-                screen.width,
-                screen.height
-            )
-            self.last_size = (screen.width, screen.height)
-            if self.fancy:
-                method = gi.get_sizes_advanced
-            else:
-                method = gi.get_sizes
-
-            self.layout_info = method(
                 screen.width,
                 screen.height,
-                screen.x,
-                screen.y
+                round(self.ratio, 6),
+                self.fancy
             )
-
-            self.dirty = False
-        try:
-            idx = self.windows.index(win)
-        except ValueError:
-            win.hide()
-            return
-        x, y, w, h = self.layout_info[idx]
-        if win is self.focused:
-            bc = self.group.qtile.colorPixel(self.border_focus)
-        else:
-            bc = self.group.qtile.colorPixel(self.border_normal)
-        win.place(
-            x,
-            y,
-            w - self.border_width * 2,
-            h - self.border_width * 2,
-            self.border_width,
-            bc
-        )
-        win.unhide()
+        ]
+        focusPixel = self.group.qtile.colorPixel(self.border_focus)
+        normalPixel = self.group.qtile.colorPixel(self.border_normal)
+        positions = dict((w, i) for i, w in enumerate(self.windows))
+        arrangement = []
+        for win in windows:
+            idx = positions.get(win)
+            if idx is None:
+                arrangement.append((win, None))
+                continue
+            x, y, w, h = self.layout_info[idx]
+            if win is self.focused:
+                bc = focusPixel
+            else:
+                bc = normalPixel
+            arrangement.append((win, (
+                x,
+                y,
+                w - self.border_width * 2,
+                h - self.border_width * 2,
+                self.border_width,
+                bc
+            )))
+        return arrangement
 
     def info(self):
         return {
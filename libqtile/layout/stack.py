@@ -18,7 +18,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 from base import Layout
-from .. import utils, manager
+from .. import utils, manager, config
+import geometry
 
 
 class _WinStack(object):
@@ -265,48 +266,43 @@ class Stack(Layout):
             if n:
                 return n.cw
 
-    def configure(self, c, screen):
-        for i, s in enumerate(self.stacks):
-            if c in s:
-                break
-        else:
-            c.hide()
-
-        if c is self.group.currentWindow:
-            px = self.group.qtile.colorPixel(self.border_focus)
-        else:
-            px = self.group.qtile.colorPixel(self.border_normal)
-
+    def arrange(self, windows, screen):
         columnWidth = int(screen.width / float(len(self.stacks)))
-        xoffset = screen.x + i * columnWidth
-        winWidth = columnWidth - 2 * self.border_width
-
-        if s.split:
-            columnHeight = int(screen.height / float(len(s)))
-            winHeight = columnHeight - 2 * self.border_width
-            yoffset = screen.y + s.index(c) * columnHeight
-            c.place(
-                xoffset,
-                yoffset,
-                winWidth,
-                winHeight,
-                self.border_width,
-                px
+        # Split stacks are laid out as rows, the others only show their
+        # current window, over the whole column.
+        jobs = []
+        for i, s in enumerate(self.stacks):
+            column = config.ScreenRect(
+                screen.x + i * columnWidth,
+                screen.y,
+                columnWidth,
+                screen.height
             )
-            c.unhide()
-        else:
-            if c == s.cw:
-                c.place(
-                    xoffset,
-                    screen.y,
-                    winWidth,
-                    screen.height - 2 * self.border_width,
-                    self.border_width,
-                    px
-                )
-                c.unhide()
+            if s.split:
+                jobs.append((len(s), column, self.border_width))
+            else:
+                jobs.append((1 if s.cw else 0, column, self.border_width))
+        positions = {}
+        for s, rects in zip(self.stacks, geometry.rows(jobs)):
+            if s.split:
+                for c, rect in zip(s.lst, rects):
+                    positions[c] = rect
+            elif rects:
+                positions[s.cw] = rects[0]
+        focusPixel = self.group.qtile.colorPixel(self.border_focus)
+        normalPixel = self.group.qtile.colorPixel(self.border_normal)
+        arrangement = []
+        for c in windows:
+            rect = positions.get(c)
+            if rect is None:
+                arrangement.append((c, None))
+                continue
+            if c is self.group.currentWindow:
+                px = focusPixel
             else:
-                c.hide()
+                px = normalPixel
+            arrangement.append((c, rect + (self.border_width, px)))
+        return arrangement
 
     def info(self):
         d = Layout.info(self)
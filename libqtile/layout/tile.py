@@ -1,4 +1,5 @@
 from base import Layout
+import geometry
 from .. import utils, manager
 
 
@@ -154,44 +155,31 @@ class Tile(Layout):
             self.focused = self.clients[0]
         return self.focused
 
-    def configure(self, c, screen):
-        screenWidth = screen.width
-        screenHeight = screen.height
-        x = 0
-        y = 0
-        w = 0
-        h = 0
-        borderWidth = self.border_width
-        margin = self.margin
-        if self.clients and c in self.clients:
-            pos = self.clients.index(c)
-            if c in self.master_windows:
-                w = int(screenWidth * self.ratio) \
-                    if len(self.slave_windows) or not self.expand \
-                    else screenWidth
-                h = screenHeight / self.master
-                x = screen.x
-                y = screen.y + pos * h
-            else:
-                w = screenWidth - int(screenWidth * self.ratio)
-                h = screenHeight / (len(self.slave_windows))
-                x = screen.x + int(screenWidth * self.ratio)
-                y = screen.y + self.clients[self.master:].index(c) * h
+    def arrange(self, windows, screen):
+        rects = geometry.tile([(
+            len(self.clients),
+            self.master,
+            self.ratio,
+            self.expand,
+            self.margin,
+            screen,
+            self.border_width
+        )])[0]
+        focusPixel = self.group.qtile.colorPixel(self.border_focus)
+        normalPixel = self.group.qtile.colorPixel(self.border_normal)
+        positions = dict((c, i) for i, c in enumerate(self.clients))
+        arrangement = []
+        for c in windows:
+            pos = positions.get(c)
+            if pos is None:
+                arrangement.append((c, None))
+                continue
             if c is self.focused:
-                bc = self.group.qtile.colorPixel(self.border_focus)
+                bc = focusPixel
             else:
-                bc = self.group.qtile.colorPixel(self.border_normal)
-            c.place(
-                x + margin,
-                y + margin,
-                w - margin * 2 - borderWidth * 2,
-                h - margin * 2 - borderWidth * 2,
-                borderWidth,
-                bc,
-            )
-            c.unhide()
-        else:
-            c.hide()
+                bc = normalPixel
+            arrangement.append((c, rects[pos] + (self.border_width, bc)))
+        return arrangement
 
     def info(self):
         return dict(
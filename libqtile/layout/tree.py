@@ -150,6 +150,19 @@ class Section(TreeNode):
         self.title = title
 
     def draw(self, layout, top, level=0):
+        title = self.add_superscript(self.title)
+        layout._layout.font_size = layout.section_fontsize
+        layout._layout.text = title
+        del layout._layout.width  # no centering
+        layout._add_row(self, top, level, ("section", title))
+        top += layout._layout.height + \
+            layout.section_top + \
+            layout.section_padding
+        if self.expanded:
+            top = super(Section, self).draw(layout, top, level)
+        return top + layout.section_bottom
+
+    def paint(self, layout, top, level):
         layout._layout.font_size = layout.section_fontsize
         layout._layout.text = self.add_superscript(self.title)
         layout._layout.colour = layout.section_fg
@@ -158,16 +171,10 @@ class Section(TreeNode):
             layout.section_fg,
             0,
             layout.panel_width,
-            top,
+            top + 0.5,
             linewidth=1
         )
         layout._layout.draw(layout.section_left, top + layout.section_top)
-        top += layout._layout.height + \
-            layout.section_top + \
-            layout.section_padding
-        if self.expanded:
-            top = super(Section, self).draw(layout, top, level)
-        return top + layout.section_bottom
 
 
 class Window(TreeNode):
@@ -178,6 +185,27 @@ class Window(TreeNode):
 
     def draw(self, layout, top, level=0):
         self._title_start = 0
+        left = layout.padding_left + level * layout.level_shift
+        title = self.add_superscript(self.window.name)
+        layout._layout.font_size = layout.fontsize
+        layout._layout.text = title
+        layout._layout.width = layout.panel_width - left
+        layout._add_row(
+            self, top, level,
+            ("window", title, left, self.window is layout._focused)
+        )
+        framed = layout._layout.framed(
+            layout.border_width,
+            None,
+            layout.padding_x,
+            layout.padding_y
+        )
+        top += framed.height + layout.vspace + layout.border_width
+        if self.expanded:
+            return super(Window, self).draw(layout, top, level + 1)
+        return top
+
+    def paint(self, layout, top, level):
         left = layout.padding_left + level * layout.level_shift
         layout._layout.font_size = layout.fontsize
         layout._layout.text = self.add_superscript(self.window.name)
@@ -196,10 +224,6 @@ class Window(TreeNode):
             layout.padding_y
         )
         framed.draw_fill(left, top)
-        top += framed.height + layout.vspace + layout.border_width
-        if self.expanded:
-            return super(Window, self).draw(layout, top, level + 1)
-        return top
 
     def button_press(self, x, y):
         """Returns self if clicked on title else returns sibling"""
@@ -261,14 +285,21 @@ class TreeTab(SingleWindow):
         self.add_defaults(TreeTab.defaults)
         self._focused = None
         self._panel = None
+        self._drawer = None
         self._tree = Root(self.sections)
         self._nodes = {}
+        # The rows drawn on the panel, see draw_panel.
+        self._rows = None
+        self._rowsEnd = 0
 
     def clone(self, group):
         c = SingleWindow.clone(self, group)
         c._focused = None
         c._panel = None
+        c._drawer = None
         c._tree = Root(self.sections)
+        c._nodes = {}
+        c._rows = None
         return c
 
     def _get_window(self):
@@ -312,18 +343,74 @@ class TreeTab(SingleWindow):
         self._panel.handle_Expose = self._panel_Expose
         self._panel.handle_ButtonPress = self._panel_ButtonPress
         self.group.qtile.windowMap[self._panel.window.wid] = self._panel
-        hook.subscribe.window_name_change(self.draw_panel)
-        hook.subscribe.focus_change(self.draw_panel)
+        hook.subscribe.client_name_updated(self._client_name_updated)
+
+    def _client_name_updated(self, win):
+        if win in self._nodes:
+            self.draw_panel()
 
     def _panel_Expose(self, e):
         self.draw_panel()
+        self._drawer.draw(0, self.panel_width)
+
+    def _add_row(self, node, top, level, key):
+        self._newRows.append((node, top, level, key))
 
     def draw_panel(self):
+        """
+            Repaint the rows of the panel whose title, focus, nesting or
+            position changed since the last call, and copy them to the
+            panel window. Everything is repainted after the drawer is
+            recreated.
+        """
         if not self._panel:
             return
-        self._drawer.clear(self.bg_color)
-        self._tree.draw(self, 0)
-        self._drawer.draw(0, self.panel_width)
+        self._newRows = []
+        end = self._tree.draw(self, 0)
+        rows = []
+        for i, (node, top, level, key) in enumerate(self._newRows):
+            if i + 1 < len(self._newRows):
+                bottom = self._newRows[i + 1][1]
+            else:
+                bottom = end
+            rows.append((node, top, bottom, level, key + (top, bottom)))
+        del self._newRows
+
+        old = self._rows
+        if old is None:
+            self._drawer.clear(self.bg_color)
+            old = []
+            spans = [(0, self._drawer.height)]
+        else:
+            spans = []
+        for i, (node, top, bottom, level, key) in enumerate(rows):
+            if i < len(old) and old[i] == key:
+                continue
+            self._paint_row(node, top, bottom, level)
+            spans.append((top, bottom))
+        if end < self._rowsEnd:
+            self._paint_row(None, end, self._rowsEnd, 0)
+            spans.append((end, self._rowsEnd))
+        self._rows = [r[-1] for r in rows]
+        self._rowsEnd = end
+        if spans:
+            top = min(i[0] for i in spans)
+            bottom = max(i[1] for i in spans)
+            self._drawer.draw(0, self.panel_width, top, bottom - top)
+
+    def _paint_row(self, node, top, bottom, level):
+        """
+            Clear the panel from top to bottom, and paint node there.
+        """
+        ctx = self._drawer.ctx
+        ctx.save()
+        ctx.rectangle(0, top, self.panel_width, bottom - top)
+        ctx.clip()
+        self._drawer.set_source_rgb(self.bg_color)
+        ctx.paint()
+        if node is not None:
+            node.paint(self, top, level)
+        ctx.restore()
 
     def _panel_ButtonPress(self, event):
         node = self._tree.button_press(event.event_x, event.event_y)
@@ -513,6 +600,10 @@ class TreeTab(SingleWindow):
         self.group.layoutAll()
 
     def _create_drawer(self):
+        if self._drawer:
+            self._drawer.free()
+        self._rows = None
+        self._rowsEnd = 0
         self._drawer = drawer.Drawer(
             self.group.qtile,
             self._panel.window.wid,
@@ -542,5 +633,7 @@ class TreeTab(SingleWindow):
                 0,
                 None
             )
-            self._create_drawer()
+            size = (self.panel_width, self.group.screen.dheight)
+            if (self._drawer.width, self._drawer.height) != size:
+                self._create_drawer()
             self.draw_panel()
@@ -1,5 +1,6 @@
 from base import SingleWindow
-from .. import manager
+from .. import manager, config
+import geometry
 import math
 
 
@@ -239,93 +240,90 @@ class MonadTall(SingleWindow):
             self._maximize_secondary()
         self.group.layoutAll()
 
-    def configure(self, c, screen):
-        "Position client based on order and sizes"
+    def arrange(self, windows, screen):
+        "Position clients based on order and sizes"
         # if no sizes or normalize flag is set, normalize
         if not self.relative_sizes or self.do_normalize:
             self.cmd_normalize(False)
 
-        # if client not in this layout
-        if not self.clients or c not in self.clients:
-            c.hide()
-            return
+        positions = dict((c, i) for i, c in enumerate(self.clients))
+        focusPixel = self.group.qtile.colorPixel(self.border_focus)
+        gscreen = self.group.screen
 
         # single client - fullscreen
         if len(self.clients) == 1:
-            px = self.group.qtile.colorPixel(self.border_focus)
-            c.place(
-                self.group.screen.dx,
-                self.group.screen.dy,
-                self.group.screen.dwidth,
-                self.group.screen.dheight,
-                0,
-                px
-            )
-            c.unhide()
-            return
-
-        cidx = self.clients.index(c)
-
-        # determine focus border-color
-        if cidx == self.focused:
-            px = self.group.qtile.colorPixel(self.border_focus)
-        else:
-            px = self.group.qtile.colorPixel(self.border_normal)
+            arrangement = []
+            for c in windows:
+                if c in positions:
+                    arrangement.append((c, (
+                        gscreen.dx,
+                        gscreen.dy,
+                        gscreen.dwidth,
+                        gscreen.dheight,
+                        0,
+                        focusPixel
+                    )))
+                else:
+                    arrangement.append((c, None))
+            return arrangement
+
+        normalPixel = self.group.qtile.colorPixel(self.border_normal)
 
         # calculate main/secondary column widths
-        width_main = int(self.group.screen.dwidth * self.ratio)
-        width_shared = self.group.screen.dwidth - width_main
+        width_main = int(gscreen.dwidth * self.ratio)
+        width_shared = gscreen.dwidth - width_main
 
-        # calculate client's x offset
+        # calculate x offsets
         if self.align == self._left:  # left orientation
-            if cidx == 0:
-                # main client
-                xpos = self.group.screen.dx
-            else:
-                # secondary client
-                xpos = self.group.screen.dx + width_main
+            xpos_main = gscreen.dx
+            xpos_secondary = gscreen.dx + width_main
         else:  # right orientation
-            if cidx == 0:
-                # main client
-                xpos = self.group.screen.dx + width_shared
+            xpos_main = gscreen.dx + width_shared
+            xpos_secondary = gscreen.dx
+
+        # secondary clients are stacked by their relative sizes
+        secondary = geometry.stacked([(
+            self.relative_sizes[:len(self.clients) - 1],
+            config.ScreenRect(
+                xpos_secondary,
+                gscreen.dy,
+                width_shared,
+                gscreen.dheight
+            ),
+            self.border_width
+        )])[0]
+
+        arrangement = []
+        for c in windows:
+            # if client not in this layout
+            cidx = positions.get(c)
+            if cidx is None:
+                arrangement.append((c, None))
+                continue
+
+            # determine focus border-color
+            if cidx == self.focused:
+                px = focusPixel
             else:
+                px = normalPixel
+
+            if cidx > 0:
                 # secondary client
-                xpos = self.group.screen.dx
-
-        # calculate client height and place
-        if cidx > 0:
-            # secondary client
-            width = width_shared - 2 * self.border_width
-            # ypos is the sum of all clients above it
-            ypos = self.group.screen.dy + \
-                self._get_absolute_size_from_relative(
-                    sum(self.relative_sizes[:cidx - 1])
-                )
-            # get height from precalculated height list
-            height = self._get_absolute_size_from_relative(
-                self.relative_sizes[cidx - 1]
-            )
-            # place client based on calculated dimensions
-            c.place(
-                xpos,
-                ypos,
-                width,
-                height - 2 * self.border_width,
-                self.border_width,
-                px
-            )
-            c.unhide()
-        else:
-            # main client
-            width = width_main - 2 * self.border_width
-            c.place(
-                xpos, self.group.screen.dy,
-                width,
-                self.group.screen.dheight - 2 * self.border_width,
-                self.border_width,
-                px
-            )
-            c.unhide()
+                arrangement.append((
+                    c,
+                    secondary[cidx - 1] + (self.border_width, px)
+                ))
+            else:
+                # main client
+                arrangement.append((c, (
+                    xpos_main,
+                    gscreen.dy,
+                    width_main - 2 * self.border_width,
+                    gscreen.dheight - 2 * self.border_width,
+                    self.border_width,
+                    px
+                )))
+        return arrangement
 
     def get_shrink_margin(self, cidx):
         "Return how many remaining pixels a client can shrink"
@@ -49,39 +49,41 @@ class Zoomy(SingleWindow):
         if self.clients:
             return self.clients[0]
 
-    def configure(self, c, screen):
+    def arrange(self, windows, screen):
         left, right = screen.hsplit(screen.width - self.columnwidth)
-        if self.clients and c is self.clients[0]:
-            c.place(
-                left.x,
-                left.y,
-                left.width,
-                left.height,
-                0,
-                None
-            )
-        else:
+        # As configure did, only size the right column when it has windows.
+        h = step = 0
+        if len(self.clients) > 1:
             h = int(right.width * left.height / left.width)
             if h * (len(self.clients) - 1) < right.height:
-                c.place(
-                    right.x,
-                    right.y + h * (self.clients.index(c) - 1),
-                    right.width,
-                    h,
+                step = h
+            else:
+                step = int((right.height - h) / (len(self.clients) - 1))
+        positions = dict((c, i) for i, c in enumerate(self.clients))
+        arrangement = []
+        for c in windows:
+            idx = positions.get(c)
+            if idx is None:
+                arrangement.append((c, None))
+            elif idx == 0:
+                arrangement.append((c, (
+                    left.x,
+                    left.y,
+                    left.width,
+                    left.height,
                     0,
                     None
-                )
+                )))
             else:
-                hh = int((right.height - h) / (len(self.clients) - 1))
-                c.place(
+                arrangement.append((c, (
                     right.x,
-                    right.y + hh * (self.clients.index(c) - 1),
+                    right.y + step * (idx - 1),
                     right.width,
                     h,
                     0,
                     None
-                )
-        c.unhide()
+                )))
+        return arrangement
 
     def info(self):
         d = SingleWindow.info(self)
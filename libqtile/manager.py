@@ -29,13 +29,18 @@ from StringIO import StringIO
 from xcb.xproto import EventMask, BadWindow, BadAccess, BadDrawable
 import atexit
 import command
+import contextlib
+import drawer
+import eventloop
 import gobject
 import hook
 import logging
 import os
 import os.path
 import pickle
+import registry
 import sys
+import time
 import traceback
 import utils
 import window
@@ -43,9 +48,51 @@ import xcb
 import xcb.xinerama
 import xcb.xproto
 import xcbq
+import xrecord
 
 from widget.base import _Widget
 
+# Events that change the structure of a window. Superseded events are never
+# coalesced across one of these.
+_COALESCE_BARRIERS = set([
+    xcb.xproto.CreateNotifyEvent,
+    xcb.xproto.MapRequestEvent,
+    xcb.xproto.MapNotifyEvent,
+    xcb.xproto.UnmapNotifyEvent,
+    xcb.xproto.ReparentNotifyEvent,
+    xcb.xproto.DestroyNotifyEvent,
+])
+
+# Pointer motion on either side of one of these is never coalesced, so that
+# drags start and end at the right position.
+_MOTION_BARRIERS = set([
+    xcb.xproto.ButtonPressEvent,
+    xcb.xproto.ButtonReleaseEvent,
+    xcb.xproto.KeyPressEvent,
+    xcb.xproto.KeyReleaseEvent,
+])
+
+# Events that expose the affected window id as an "event" attribute.
+_EVENT_WINDOW_EVENTS = set([
+    "EnterNotify",
+    "ButtonPress",
+    "ButtonRelease",
+    "KeyPress",
+])
+
+
+def _target_kind(c):
+    """
+        Classify the target of an X event for the latency statistics.
+    """
+    if c is None:
+        return "root"
+    elif isinstance(c, window.Window):
+        return "managed"
+    elif isinstance(c, window.Internal):
+        return "internal"
+    return "static"
+
 
 class Qtile(command.CommandObject):
     """
@@ -56,12 +103,16 @@ class Qtile(command.CommandObject):
 
     def __init__(self, config,
                  displayName=None, fname=None, no_spawn=False, log=None,
-                 state=None):
+                 state=None, record=None, conn=None):
         gobject.threads_init()
         self.log = log or init_log()
         if hasattr(config, "log_level"):
             self.log.setLevel(config.log_level)
 
+        self.eventloop = eventloop.init(getattr(config, "main_loop", "glib"))
+        drawer.surfaceCache.maxPixels = getattr(config, "text_cache_pixels", 0)
+        drawer.surfaceCache.reset()
+
         self.no_spawn = no_spawn
 
         if not displayName:
@@ -77,13 +128,28 @@ class Qtile(command.CommandObject):
                 displayName = displayName + ".0"
             fname = command.find_sockfile(displayName)
 
-        self.conn = xcbq.Connection(displayName)
+        # When recording, replies are recorded from the very first request
+        # so that the session can be replayed from startup.
+        self.recorder = None
+        if conn is None:
+            xconn = None
+            if record:
+                self.recorder = xrecord.Recorder(record)
+                xconn = self.recorder.wrap(
+                    xcb.xcb.connect(display=displayName)
+                )
+            conn = xcbq.Connection(displayName, xconn)
+        self.conn = conn
         self.config = config
         self.fname = fname
         hook.init(self)
 
         self.keyMap = {}
-        self.windowMap = {}
+        self.windowMap = registry.WindowRegistry()
+        # See requestLayout and layoutSuspended.
+        self.layoutHold = 0
+        self.layoutPending = {}
+        self.layoutCounters = dict(requested=0, performed=0)
         self.widgetMap = {}
         self.groupMap = {}
         self.groups = []
@@ -148,6 +214,11 @@ class Qtile(command.CommandObject):
         self._process_screens()
         self.currentScreen = self.screens[0]
         self._drag = None
+        self._dragPos = None
+        self._dragTimer = None
+        self._dragTime = 0
+        rate = getattr(config, "drag_frame_rate", 60)
+        self.dragInterval = 1.0 / rate if rate else 0
 
         self.ignoreEvents = set([
             xcb.xproto.KeyReleaseEvent,
@@ -160,6 +231,11 @@ class Qtile(command.CommandObject):
             xcb.xproto.FocusInEvent,
             xcb.xproto.NoExposureEvent
         ])
+        self.coalesceEvents = getattr(config, "coalesce_events", True)
+        self._eventSpecs = {}
+        self._windowHandlers = {}
+        self.eventCounters = dict(polled=0, dispatched=0, collapsed={})
+        self.eventStats = utils.LatencyStats()
 
         self.conn.flush()
         self.conn.xsync()
@@ -377,10 +453,20 @@ class Qtile(command.CommandObject):
 
     def scan(self):
         _, _, children = self.root.query_tree()
-        for item in children:
+        with self.conn.batch() as batch:
+            pending = [
+                (
+                    item,
+                    batch.add(item.fetch_attributes()),
+                    batch.add(item.fetch_wm_state())
+                )
+                for item in children
+            ]
+        adopt = []
+        for item, attrs, state in pending:
             try:
-                attrs = item.get_attributes()
-                state = item.get_wm_state()
+                attrs = attrs.result()
+                state = state.result()
             except (xcb.xproto.BadWindow, xcb.xproto.BadAccess):
                 continue
 
@@ -388,7 +474,52 @@ class Qtile(command.CommandObject):
                 continue
             if state and state[0] == window.WithdrawnState:
                 continue
-            self.manage(item)
+            adopt.append(item)
+
+        # Read the properties of all the windows in one round trip, and lay
+        # out each group once, after all of them have been added.
+        with self.layoutSuspended():
+            with self.conn.batch() as batch:
+                for item in adopt:
+                    batch.snapshot(item)
+                for item in adopt:
+                    self.manage(item)
+
+    def requestLayout(self, group, warp=False):
+        """
+            Mark group as needing a relayout, done by the next flushLayout.
+        """
+        self.layoutCounters["requested"] += 1
+        pending = self.layoutPending
+        pending[group] = pending.get(group, False) or warp
+
+    def flushLayout(self):
+        """
+            Lay out each group that asked for it since the last flush, once.
+            This runs after X events have been handled and at the end of
+            each main loop iteration; call it before reading geometry that
+            depends on a relayout that was just asked for.
+        """
+        if self.layoutHold or not self.layoutPending:
+            return
+        pending, self.layoutPending = self.layoutPending, {}
+        for group in self.groups:
+            if group in pending:
+                self.layoutCounters["performed"] += 1
+                group._layoutAll(pending[group])
+
+    @contextlib.contextmanager
+    def layoutSuspended(self):
+        """
+            Hold back group relayouts, including explicit flushes, until the
+            end of the with block.
+        """
+        self.layoutHold += 1
+        try:
+            yield
+        finally:
+            self.layoutHold -= 1
+            self.flushLayout()
 
     def unmanage(self, win):
         c = self.windowMap.get(win)
@@ -432,6 +563,17 @@ class Qtile(command.CommandObject):
         self.currentScreen.resize()
 
     def manage(self, w):
+        if w.wid in self.windowMap:
+            return self.windowMap[w.wid]
+        if w.snapshot is not None:
+            # Snapshotted by scan along with other windows.
+            return self._manage(w)
+        # Everything read from the window while it is being managed,
+        # including by client_new hooks, comes from one batch of requests.
+        with xcbq.Snapshot(w):
+            return self._manage(w)
+
+    def _manage(self, w):
         try:
             attrs = w.get_attributes()
             internal = w.get_property("QTILE_INTERNAL")
@@ -440,37 +582,34 @@ class Qtile(command.CommandObject):
         if attrs and attrs.override_redirect:
             return
 
-        if not w.wid in self.windowMap:
-            if internal:
-                try:
-                    c = window.Internal(w, self)
-                except (xcb.xproto.BadWindow, xcb.xproto.BadAccess):
-                    return
-                self.windowMap[w.wid] = c
-            else:
-                try:
-                    c = window.Window(w, self)
-                except (xcb.xproto.BadWindow, xcb.xproto.BadAccess):
-                    return
+        if internal:
+            try:
+                c = window.Internal(w, self)
+            except (xcb.xproto.BadWindow, xcb.xproto.BadAccess):
+                return
+            self.windowMap[w.wid] = c
+        else:
+            try:
+                c = window.Window(w, self)
+            except (xcb.xproto.BadWindow, xcb.xproto.BadAccess):
+                return
 
-                if w.get_wm_type() == "dock" or c.strut:
-                    c.static(self.currentScreen.index)
-                else:
-                    hook.fire("client_new", c)
+            if w.get_wm_type() == "dock" or c.strut:
+                c.static(self.currentScreen.index)
+            else:
+                hook.fire("client_new", c)
 
-                # Window may be defunct because
-                # it's been declared static in hook.
-                if c.defunct:
-                    return
-                self.windowMap[w.wid] = c
-                # Window may have been bound to a group in the hook.
-                if not c.group:
-                    self.currentScreen.group.add(c)
-                self.update_client_list()
-                hook.fire("client_managed", c)
-            return c
-        else:
-            return self.windowMap[w.wid]
+            # Window may be defunct because
+            # it's been declared static in hook.
+            if c.defunct:
+                return
+            self.windowMap[w.wid] = c
+            # Window may have been bound to a group in the hook.
+            if not c.group:
+                self.currentScreen.group.add(c)
+            self.update_client_list()
+            hook.fire("client_managed", c)
+        return c
 
     def update_client_list(self):
         """
@@ -479,7 +618,7 @@ class Qtile(command.CommandObject):
         and drag and drop of tabs in chrome
         """
 
-        windows = [wid for wid, c in self.windowMap.iteritems() if c.group]
+        windows = self.windowMap.client_list()
         self.root.set_property("_NET_CLIENT_LIST", windows)
         # TODO: check stack order
         self.root.set_property("_NET_CLIENT_LIST_STACKING", windows)
@@ -527,38 +666,162 @@ class Qtile(command.CommandObject):
         for key in self.keyMap.values():
             self.mapKey(key)
 
-    def get_target_chain(self, ename, e):
+    def _event_spec(self, e):
         """
-            Returns a chain of targets that can handle this event. The event
-            will be passed to each target in turn for handling, until one of
-            the handlers returns False or the end of the chain is reached.
+            Build the dispatch entry for the class of event e: the event
+            name, the name of its handlers, the event attribute holding the
+            target window id, the bound Qtile handler, and whether the event
+            is ignored. Entries are built once per event class, so the
+            Qtile handler is bound once; window handlers are resolved per
+            window class in _window_handler.
         """
-        chain = []
-        handler = "handle_%s" % ename
-        # Certain events expose the affected window id as an "event" attribute.
-        eventEvents = [
-            "EnterNotify",
-            "ButtonPress",
-            "ButtonRelease",
-            "KeyPress",
-        ]
-        c = None
+        cls = e.__class__
+        ename = cls.__name__
+        if ename.endswith("Event"):
+            ename = ename[:-5]
+        handler = "handle_" + ename
         if hasattr(e, "window"):
-            c = self.windowMap.get(e.window)
+            widattr = "window"
         elif hasattr(e, "drawable"):
-            c = self.windowMap.get(e.drawable)
-        elif ename in eventEvents:
-            c = self.windowMap.get(e.event)
-
-        if c and hasattr(c, handler):
-            chain.append(getattr(c, handler))
-        if hasattr(self, handler):
-            chain.append(getattr(self, handler))
+            widattr = "drawable"
+        elif ename in _EVENT_WINDOW_EVENTS:
+            widattr = "event"
+        else:
+            widattr = None
+        spec = (
+            ename,
+            handler,
+            widattr,
+            getattr(self, handler, None),
+            cls in self.ignoreEvents
+        )
+        self._eventSpecs[cls] = spec
+        return spec
+
+    def _window_handler(self, c, handler):
+        """
+            Return the handler of window object c for an event, or None.
+            Handlers monkey-patched onto the instance (as Bar does with
+            handle_Expose) take precedence over the per-class table.
+        """
+        h = c.__dict__.get(handler)
+        if h is not None:
+            return h
+        key = (c.__class__, handler)
+        try:
+            f = self._windowHandlers[key]
+        except KeyError:
+            f = self._windowHandlers[key] = getattr(c.__class__, handler, None)
+        if f is not None:
+            return f.__get__(c, c.__class__)
+
+    def _target_chain(self, spec, c):
+        ename, handler, widattr, rootHandler, _ = spec
+        chain = []
+        if c is not None:
+            h = self._window_handler(c, handler)
+            if h is not None:
+                chain.append(h)
+        if rootHandler is not None:
+            chain.append(rootHandler)
         if not chain:
-            self.log.info("Unknown event: %r" % ename)
+            self.log.info("Unknown event: %r", ename)
         return chain
 
+    def get_target_chain(self, e):
+        """
+            Returns a chain of targets that can handle this event. The event
+            will be passed to each target in turn for handling, until one of
+            the handlers returns False or the end of the chain is reached.
+        """
+        spec = self._eventSpecs.get(e.__class__) or self._event_spec(e)
+        c = None
+        if spec[2] is not None:
+            c = self.windowMap.get(getattr(e, spec[2]))
+        return self._target_chain(spec, c)
+
+    def _coalesce(self, events):
+        """
+            Drop the events of a batch that are superseded by a later event
+            in the same batch:
+
+                - a ConfigureRequest whose fields are all set again by later
+                  requests for the same window
+                - all but the last PropertyNotify per window and atom
+                - all but the last MotionNotify per window between two
+                  button or key events
+
+            Structural events (create, map, unmap, reparent, destroy) on a
+            window act as a barrier, nothing is folded across them.
+        """
+        kept = []
+        pending = {}
+        motion = set()
+        collapsed = self.eventCounters["collapsed"]
+        for e in reversed(events):
+            cls = e.__class__
+            drop = False
+            if cls is xcb.xproto.PropertyNotifyEvent:
+                seen = pending.setdefault(e.window, {})
+                drop = e.atom in seen
+                seen[e.atom] = True
+            elif cls is xcb.xproto.ConfigureRequestEvent:
+                seen = pending.setdefault(e.window, {})
+                later = seen.get(None)
+                if later is not None and not e.value_mask & ~later:
+                    drop = True
+                else:
+                    seen[None] = (later or 0) | e.value_mask
+            elif cls is xcb.xproto.MotionNotifyEvent:
+                drop = e.event in motion
+                motion.add(e.event)
+            elif cls in _COALESCE_BARRIERS:
+                pending.pop(e.window, None)
+            elif cls in _MOTION_BARRIERS:
+                motion.clear()
+
+            if drop:
+                name = cls.__name__[:-5]
+                collapsed[name] = collapsed.get(name, 0) + 1
+            else:
+                kept.append(e)
+        kept.reverse()
+        return kept
+
+    def _dispatch(self, e):
+        spec = self._eventSpecs.get(e.__class__) or self._event_spec(e)
+        ename = spec[0]
+        self.log.debug(ename)
+        if not spec[4]:
+            c = None
+            if spec[2] is not None:
+                c = self.windowMap.get(getattr(e, spec[2]))
+            start = time.time()
+            for h in self._target_chain(spec, c):
+                self.log.info("Handling: %s", ename)
+                r = h(e)
+                if not r:
+                    break
+            self.eventStats.add(
+                _target_kind(c), ename, time.time() - start
+            )
+        self.eventCounters["dispatched"] += 1
+
     def _xpoll(self, conn=None, cond=None):
+        # Drain everything that is pending first, so that events superseded
+        # within the same batch can be dropped before any handler runs.
+        # Events xcb reads while handlers wait for replies don't make the
+        # connection readable again, so poll until nothing is left.
+        while True:
+            events = self._poll_events()
+            if not events:
+                break
+            self._handle_events(events)
+        self.flushLayout()
+        return True
+
+    def _poll_events(self):
+        events = []
         while True:
             try:
                 e = self.conn.conn.poll_for_event()
@@ -568,36 +831,40 @@ class Qtile(command.CommandObject):
                 # client mesages start at 128
                 if e.response_type >= 128:
                     e = xcb.xproto.ClientMessageEvent(e)
-
-                ename = e.__class__.__name__
-
-                if ename.endswith("Event"):
-                    ename = ename[:-5]
-                self.log.debug(ename)
-                if not e.__class__ in self.ignoreEvents:
-                    for h in self.get_target_chain(ename, e):
-                        self.log.info("Handling: %s" % ename)
-                        r = h(e)
-                        if not r:
-                            break
-            except Exception as e:
+                events.append(e)
+            except Exception:
+                s = 'Got an exception in poll loop:\n' + traceback.format_exc()
+                self.log.exception(s)
+        if self.recorder is not None and events:
+            for e in events:
+                self.recorder.event(e)
+            self.recorder.batch()
+        return events
+
+    def _handle_events(self, events):
+        self.eventCounters["polled"] += len(events)
+        if self.coalesceEvents and len(events) > 1:
+            events = self._coalesce(events)
+
+        for e in events:
+            try:
+                self._dispatch(e)
+            except Exception:
                 s = 'Got an exception in poll loop:\n' + traceback.format_exc()
                 self.log.exception(s)
-        return True
 
     def loop(self):
 
         self.server.start()
         self.log.info('Adding io watch')
-        display_tag = gobject.io_add_watch(
-            self.conn.conn.get_file_descriptor(),
-            gobject.IO_IN, self._xpoll
+        display_tag = self.eventloop.add_reader(
+            self.conn.conn.get_file_descriptor(), self._xpoll
         )
         try:
-            context = gobject.main_context_default()
             while True:
-                if context.iteration(True):
+                if self.eventloop.iteration():
                     try:
+                        self.flushLayout()
                         # this seems to be crucial part
                         self.conn.flush()
 
@@ -619,7 +886,9 @@ class Qtile(command.CommandObject):
                     sys.exit(2)
         finally:
             self.log.info('Removing source')
-            gobject.source_remove(display_tag)
+            self.eventloop.source_remove(display_tag)
+            if self.recorder is not None:
+                self.recorder.close()
 
     def find_screen(self, x, y):
         """
@@ -793,7 +1062,10 @@ class Qtile(command.CommandObject):
                     val = (0, 0)
                 if m.focus == "after":
                     self.cmd_focus_by_click(e)
-                self._drag = (x, y, val[0], val[1], m.commands)
+                self._drag = (
+                    x, y, val[0], val[1], self._drag_commands(m.commands)
+                )
+                self._dragPos = None
                 self.root.grab_pointer(
                     True,
                     xcbq.ButtonMotionMask |
@@ -816,29 +1088,86 @@ class Qtile(command.CommandObject):
                     "Ignoring unknown button release: %s" % button_code
                 )
                 continue
-            if isinstance(m, Drag):
+            if isinstance(m, Drag) and self._drag is not None:
+                # Apply the final position straight away, whether or not an
+                # update is pending.
+                if self._dragTimer is not None:
+                    self.eventloop.source_remove(self._dragTimer)
+                self._dragPos = (e.event_x, e.event_y)
+                self._drag_update()
                 self._drag = None
                 self.root.ungrab_pointer()
 
+    def _drag_commands(self, commands):
+        """
+            The commands of a Drag, as [command, resolved] pairs. Each
+            command is resolved by _drag_resolve when it's first run, so
+            that later motion events call it directly, without selector
+            resolution or command logging.
+        """
+        return [[i, None] for i in commands]
+
+    def _drag_resolve(self, i):
+        """
+            The method a drag command calls, or False if there is none.
+        """
+        try:
+            cmd = self.select(i.selectors).command(i.name)
+        except (command._SelectError, command.CommandError):
+            cmd = None
+        if cmd is None:
+            self.log.error(
+                "Mouse command error %s: No such command." % i.name
+            )
+            return False
+        return cmd
+
+    def _drag_update(self):
+        """
+            Run the drag commands for the latest pointer position. Motion
+            events in between are dropped. As with unpaced drags, the
+            conditions of each command are checked on every update.
+        """
+        self._dragTimer = None
+        if self._drag is None or self._dragPos is None:
+            return False
+        ox, oy, rx, ry, cmds = self._drag
+        x, y = self._dragPos
+        self._dragPos = None
+        self._dragTime = time.time()
+        dx = x - ox
+        dy = y - oy
+        if dx or dy:
+            for entry in cmds:
+                i, cmd = entry
+                if not i.check(self):
+                    continue
+                if cmd is None:
+                    cmd = entry[1] = self._drag_resolve(i)
+                if not cmd:
+                    continue
+                try:
+                    cmd(*(i.args + (rx + dx, ry + dy)), **i.kwargs)
+                except Exception:
+                    self.log.error(
+                        "Mouse command error %s: %s" %
+                        (i.name, traceback.format_exc())
+                    )
+        return False
+
     def handle_MotionNotify(self, e):
         if self._drag is None:
             return
-        ox, oy, rx, ry, cmd = self._drag
-        dx = e.event_x - ox
-        dy = e.event_y - oy
-        if dx or dy:
-            for i in cmd:
-                if i.check(self):
-                    status, val = self.server.call((
-                        i.selectors,
-                        i.name,
-                        i.args + (rx + dx, ry + dy),
-                        i.kwargs
-                    ))
-                    if status in (command.ERROR, command.EXCEPTION):
-                        self.log.error(
-                            "Mouse command error %s: %s" % (i.name, val)
-                        )
+        self._dragPos = (e.event_x, e.event_y)
+        if self._dragTimer is not None:
+            return
+        delay = self._dragTime + self.dragInterval - time.time()
+        if delay <= 0:
+            self._drag_update()
+        else:
+            self._dragTimer = self.eventloop.timeout_add(
+                delay, self._drag_update
+            )
 
     def handle_ConfigureNotify(self, e):
         """
@@ -947,13 +1276,10 @@ class Qtile(command.CommandObject):
                 return utils.lget(self.screens, sel)
 
     def listWID(self):
-        return [i.window.wid for i in self.windowMap.values()]
+        return self.windowMap.keys()
 
     def clientFromWID(self, wid):
-        for i in self.windowMap.values():
-            if i.window.wid == wid:
-                return i
-        return None
+        return self.windowMap.get(wid)
 
     def cmd_debug(self):
         """Set log level to DEBUG"""
@@ -1151,18 +1477,75 @@ class Qtile(command.CommandObject):
             Return info for each client window.
         """
         return [
-            i.info() for i in self.windowMap.values()
-            if not isinstance(i, window.Internal)
+            i.info()
+            for i in self.windowMap.of_kind("managed", "static", "other")
         ]
 
     def cmd_internal_windows(self):
         """
             Return info for each internal window (bars, for example).
         """
-        return [
-            i.info() for i in self.windowMap.values()
-            if isinstance(i, window.Internal)
-        ]
+        return [i.info() for i in self.windowMap.of_kind("internal")]
+
+    def cmd_event_counters(self, reset=False):
+        """
+            Return the number of X events polled and dispatched, and the
+            number of events dropped by coalescing, by event name.
+
+            :reset Zero the counters after reading them.
+        """
+        counters = dict(
+            polled=self.eventCounters["polled"],
+            dispatched=self.eventCounters["dispatched"],
+            collapsed=dict(self.eventCounters["collapsed"]),
+        )
+        if reset:
+            self.eventCounters = dict(polled=0, dispatched=0, collapsed={})
+        return counters
+
+    def cmd_property_cache_stats(self, reset=False):
+        """
+            Return the number of hits, misses and invalidations of the cache
+            of window properties (WM_CLASS, WM_WINDOW_ROLE, the window type
+            and WM_PROTOCOLS) kept for managed windows.
+
+            :reset Zero the counters after reading them.
+        """
+        stats = self.conn.propertyCacheStats
+        counters = dict(stats)
+        if reset:
+            for k in stats:
+                stats[k] = 0
+        return counters
+
+    def cmd_layout_counters(self, reset=False):
+        """
+            Return the number of group relayouts asked for, and the number
+            actually performed after coalescing.
+
+            :reset Zero the counters after reading them.
+        """
+        counters = dict(self.layoutCounters)
+        if reset:
+            self.layoutCounters = dict(requested=0, performed=0)
+        return counters
+
+    def cmd_event_stats(self, reset=False):
+        """
+            Return histograms of the time spent handling X events and
+            firing hooks. Histograms are keyed by target kind ("root",
+            "managed", "internal", "static" for X events, "hook" for hooks)
+            and then by event name. Each one holds the count, the total and
+            maximum time in milliseconds, and per-bucket counts; "bounds"
+            gives the upper limit of each bucket in milliseconds, the last
+            bucket is open-ended.
+
+            :reset Clear the histograms after reading them.
+        """
+        info = self.eventStats.info()
+        if reset:
+            self.eventStats.reset()
+        return info
 
     def cmd_qtile_info(self):
         """
@@ -1217,7 +1600,7 @@ class Qtile(command.CommandObject):
 
     def cmd_next_urgent(self):
         try:
-            nxt = filter(lambda w: w.urgent, self.windowMap.values())[0]
+            nxt = self.windowMap.urgent()[0]
             nxt.group.cmd_toscreen()
             nxt.group.focus(nxt, False)
         except IndexError:
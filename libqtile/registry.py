@@ -0,0 +1,181 @@
+# Copyright (c) 2008, Aldo Cortesi. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    The registry of the windows Qtile knows about, Qtile.windowMap.
+"""
+import window
+
+
+def kind(c):
+    """
+        "managed", "internal" or "static" for windows of those classes,
+        "other" for the rest, like systray icons.
+    """
+    if isinstance(c, window.Window):
+        return "managed"
+    elif isinstance(c, window.Internal):
+        return "internal"
+    elif isinstance(c, window.Static):
+        return "static"
+    return "other"
+
+
+class WindowRegistry(dict):
+    """
+        A dictionary of windows keyed by window id, with indexes by kind,
+        group, WM_CLASS and urgency. Adding and removing windows keeps the
+        indexes up to date; windows call regroup, reclass and
+        update_urgency when the indexed values change.
+    """
+    def __init__(self):
+        dict.__init__(self)
+        # kind: set of wids
+        self.kinds = {}
+        # group: set of wids
+        self.groups = {}
+        # WM_CLASS instance or class name: set of wids
+        self.classes = {}
+        self.urgentWids = set()
+        # Windows that have a group, in the order they got one.
+        self.clientList = []
+        # wid: the values indexed for it
+        self._kind = {}
+        self._group = {}
+        self._class = {}
+
+    def __setitem__(self, wid, c):
+        if wid in self:
+            self._unindex(wid)
+        dict.__setitem__(self, wid, c)
+        k = self._kind[wid] = kind(c)
+        self.kinds.setdefault(k, set()).add(wid)
+        self.regroup(c)
+        if k in ("managed", "static"):
+            self.reclass(c)
+        self.update_urgency(c)
+
+    def __delitem__(self, wid):
+        self._unindex(wid)
+        dict.__delitem__(self, wid)
+
+    def pop(self, wid, *default):
+        if wid in self:
+            self._unindex(wid)
+        return dict.pop(self, wid, *default)
+
+    def _unindex(self, wid):
+        self.kinds[self._kind.pop(wid)].discard(wid)
+        group = self._group.pop(wid, None)
+        if group is not None:
+            self.groups[group].discard(wid)
+            self.clientList.remove(wid)
+        for i in self._class.pop(wid, ()):
+            self.classes[i].discard(wid)
+        self.urgentWids.discard(wid)
+
+    def _registered(self, c):
+        wid = c.window.wid
+        if dict.get(self, wid) is c:
+            return wid
+
+    def regroup(self, c):
+        """
+            Update the group index for c, after its group has changed.
+        """
+        wid = self._registered(c)
+        if wid is None:
+            return
+        old = self._group.pop(wid, None)
+        new = getattr(c, "group", None)
+        if old is not None:
+            self.groups[old].discard(wid)
+        if new is not None:
+            self._group[wid] = new
+            self.groups.setdefault(new, set()).add(wid)
+        if old is None and new is not None:
+            self.clientList.append(wid)
+        elif old is not None and new is None:
+            self.clientList.remove(wid)
+
+    def reclass(self, c):
+        """
+            Update the WM_CLASS index for c, after its WM_CLASS has changed.
+        """
+        wid = self._registered(c)
+        if wid is None:
+            return
+        for i in self._class.pop(wid, ()):
+            self.classes[i].discard(wid)
+        names = set(c.window.get_wm_class() or ())
+        self._class[wid] = names
+        for i in names:
+            self.classes.setdefault(i, set()).add(wid)
+
+    def update_urgency(self, c):
+        """
+            Update the urgency index for c, after its urgency hint has
+            changed.
+        """
+        wid = self._registered(c)
+        if wid is None:
+            return
+        if getattr(c, "hints", {}).get("urgent"):
+            self.urgentWids.add(wid)
+        else:
+            self.urgentWids.discard(wid)
+
+    def _clients(self, wids):
+        return [self[i] for i in wids]
+
+    def of_kind(self, *kinds):
+        """
+            The windows of the given kinds.
+        """
+        wids = []
+        for k in kinds:
+            wids.extend(self.kinds.get(k, ()))
+        return self._clients(wids)
+
+    def in_group(self, group):
+        return self._clients(self.groups.get(group, ()))
+
+    def by_wm_class(self, name):
+        """
+            The managed and static windows with name as either part of their
+            WM_CLASS.
+        """
+        return self._clients(self.classes.get(name, ()))
+
+    def urgent(self, group=None):
+        """
+            The windows with the urgency hint set, in group if it is given.
+        """
+        wids = self.urgentWids
+        if group is not None:
+            wids = wids & self.groups.get(group, set())
+        return self._clients(wids)
+
+    def client_list(self):
+        """
+            The ids of the windows that have a group, in the order they got
+            one.
+        """
+        return list(self.clientList)
@@ -104,6 +104,10 @@ main = None
 follow_mouse_focus = True
 bring_front_click = False
 cursor_warp = False
+coalesce_events = True
+main_loop = "glib"
+drag_frame_rate = 60
+text_cache_pixels = 0
 floating_layout = layout.Floating()
 mouse = ()
 auto_fullscreen = True
@@ -18,6 +18,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import bisect
 import operator
 import functools
 import gobject
@@ -106,6 +107,50 @@ class LRUCache:
         return wrap
 
 
+class LatencyStats:
+    """
+        Fixed-bucket histograms of handler wall times, keyed by target kind
+        and event name. Bucket bounds are upper limits in milliseconds, the
+        last bucket counts everything slower than the last bound.
+    """
+    bounds = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.data = {}
+
+    def add(self, kind, name, seconds):
+        ms = seconds * 1000.0
+        try:
+            h = self.data[kind][name]
+        except KeyError:
+            h = self.data.setdefault(kind, {})[name] = dict(
+                count=0,
+                total=0.0,
+                max=0.0,
+                buckets=[0] * (len(self.bounds) + 1)
+            )
+        h["count"] += 1
+        h["total"] += ms
+        if ms > h["max"]:
+            h["max"] = ms
+        h["buckets"][bisect.bisect_left(self.bounds, ms)] += 1
+
+    def info(self):
+        """
+            Returns a copy of the histograms, safe to send over IPC.
+        """
+        events = {}
+        for kind, names in self.data.items():
+            events[kind] = dict(
+                (name, dict(h, buckets=list(h["buckets"])))
+                for name, h in names.items()
+            )
+        return dict(bounds=list(self.bounds), events=events)
+
+
 def isStringLike(anobj):
     try:
         # Avoid succeeding expensively if anobj is large.
@@ -70,5 +70,5 @@ class Backlight(base._TextBox):
             ntext = self._get_text()
             if ntext != self.text:
                 self.text = ntext
-                self.bar.draw()
+                self.bar.draw(self)
         return True
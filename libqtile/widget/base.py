@@ -1,5 +1,4 @@
-from .. import command, bar, configurable, drawer
-import gobject
+from .. import command, bar, configurable, drawer, eventloop
 import logging
 import threading
 
@@ -60,17 +59,12 @@ class _Widget(command.CommandObject, configurable.Configurable):
     def _configure(self, qtile, bar):
         self.qtile = qtile
         self.bar = bar
-        self.drawer = drawer.Drawer(
-            qtile,
-            self.win.wid,
-            self.bar.width,
-            self.bar.height
-        )
+        self.drawer = drawer.SubDrawer(self.bar.drawer)
         self.configured = True
 
     def clear(self):
         self.drawer.set_source_rgb(self.bar.background)
-        self.drawer.fillrect(self.offset, 0, self.width, self.bar.size)
+        self.drawer.fillrect(0, 0, self.width, self.bar.size)
 
     def info(self):
         return dict(
@@ -112,7 +106,8 @@ class _Widget(command.CommandObject, configurable.Configurable):
         """
             Method that draws the widget. You may call this explicitly to
             redraw the widget, but only if the width of the widget hasn't
-            changed. If it has, you must call bar.draw instead.
+            changed. If it has, you must call bar.draw(self) instead, which
+            also redraws the widgets it moved.
         """
         raise NotImplementedError
 
@@ -124,19 +119,13 @@ class _Widget(command.CommandObject, configurable.Configurable):
 
     def timeout_add(self, seconds, method, method_args=()):
         """
-            This method calls either ``gobject.timeout_add`` or
-            ``gobject.timeout_add_seconds`` with same arguments. Latter is
-            better for battery usage, but works only with integer timeouts.
+            Calls method with method_args every seconds, for as long as it
+            returns True, on the configured main loop. With the glib loop,
+            integer timeouts use ``gobject.timeout_add_seconds``, which is
+            better for battery usage.
         """
         self.log.debug('Adding timer for %r in %.2fs', method, seconds)
-        if int(seconds) == seconds:
-            return gobject.timeout_add_seconds(
-                int(seconds), method, *method_args
-            )
-        else:
-            return gobject.timeout_add(
-                int(seconds * 1000), method, *method_args
-            )
+        return eventloop.timeout_add(seconds, method, *method_args)
 
 
 UNSPECIFIED = bar.Obj("UNSPECIFIED")
@@ -181,8 +170,8 @@ class _TextBox(_Widget):
     @font.setter
     def font(self, value):
         self._font = value
-        if self.layout:
-            self.layout.font = value
+        if self.layout and value is not None:
+            self.layout.font_family = value
 
     @property
     def fontshadow(self):
@@ -240,9 +229,11 @@ class _TextBox(_Widget):
             self.font = font
         if fontsize is not UNSPECIFIED:
             self.fontsize = fontsize
+            if fontsize is not None:
+                self.layout.font_size = fontsize
         if fontshadow is not UNSPECIFIED:
             self.fontshadow = fontshadow
-        self.bar.draw()
+        self.bar.draw(self)
 
 
 # these two classes below look SUSPICIOUSLY similar
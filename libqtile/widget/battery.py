@@ -188,7 +188,7 @@ class Battery(_Battery):
             ntext = self._get_text()
             if ntext != self.text:
                 self.text = ntext
-                self.bar.draw()
+                self.bar.draw(self)
         return True
 
 
@@ -5,7 +5,7 @@ from .. import bar
 import base
 import urllib
 import urllib2
-import gobject
+from .. import eventloop
 import threading
 
 try:
@@ -50,7 +50,7 @@ class BitcoinTicker(base._TextBox):
 
         def worker():
             data = self.fetch_data()
-            gobject.idle_add(self.update, data)
+            eventloop.idle_add(self.update, data)
         threading.Thread(target=worker).start()
         return True
 
@@ -70,5 +70,5 @@ class BitcoinTicker(base._TextBox):
             self.text = self.format.format(**data)
         else:
             self.text = 'N/A'
-        self.bar.draw()
+        self.bar.draw(self)
         return False
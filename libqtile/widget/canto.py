@@ -42,5 +42,5 @@ class Canto(base._TextBox):
             ntext = self._get_info()
             if ntext != self.text:
                 self.text = ntext
-                self.bar.draw()
+                self.bar.draw(self)
         return True
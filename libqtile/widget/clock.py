@@ -4,7 +4,7 @@ from datetime import datetime
 from .. import bar
 import base
 
-import gobject
+from .. import eventloop
 
 
 class Clock(base._TextBox):
@@ -25,7 +25,7 @@ class Clock(base._TextBox):
     def _configure(self, qtile, bar):
         if not self.configured:
             self.configured = True
-            gobject.idle_add(self.update)
+            eventloop.idle_add(self.update)
         base._TextBox._configure(self, qtile, bar)
 
     def update(self):
@@ -42,7 +42,7 @@ class Clock(base._TextBox):
         self.text = datetime.fromtimestamp(int(ts + .5)).strftime(self.fmt)
 
         if self.layout.width != old_layout_width:
-            self.bar.draw()
+            self.bar.draw(self)
         else:
             self.draw()
 
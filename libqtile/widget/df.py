@@ -73,6 +73,6 @@ class DF(base._TextBox):
         if self.text != text:
             self.text = text
             if self.configured:
-                self.bar.draw()
+                self.bar.draw(self)
 
         return True
@@ -63,7 +63,7 @@ import datetime
 import re
 import dateutil.parser
 import threading
-import gobject
+from .. import eventloop
 
 from apiclient.discovery import build
 from oauth2client.client import AccessTokenRefreshError
@@ -164,7 +164,7 @@ class GoogleCalendar(base._TextBox):
 
         def cal_getter():  # get cal data in thread, write it in main loop
             data = self.fetch_calendar()
-            gobject.idle_add(self.update, data)
+            eventloop.idle_add(self.update, data)
         threading.Thread(target=cal_getter).start()
         return True
 
@@ -173,7 +173,7 @@ class GoogleCalendar(base._TextBox):
             self.text = self.format.format(**data)
         else:
             self.text = 'No calendar data available'
-        self.bar.draw()
+        self.bar.draw(self)
         return False
 
     def button_press(self, x, y, button):
@@ -41,7 +41,7 @@ class _GroupBase(base._TextBox, base.PaddingMixin, base.MarginMixin):
 
     def setup_hooks(self):
         def hook_response(*args, **kwargs):
-            self.bar.draw()
+            self.bar.draw(self)
         hook.subscribe.client_managed(hook_response)
         hook.subscribe.client_urgent_hint_changed(hook_response)
         hook.subscribe.client_killed(hook_response)
@@ -185,7 +185,7 @@ class GroupBox(_GroupBase):
         return width
 
     def group_has_urgent(self, group):
-        return len([w for w in group.windows if w.urgent]) > 0
+        return len(self.qtile.windowMap.urgent(group)) > 0
 
     def draw(self):
         self.drawer.clear(self.background or self.bar.background)
@@ -35,7 +35,7 @@ class KeyboardLayout(base._TextBox):
 
     def update(self):
         self.text = self._get_keyboard()
-        self.bar.draw()
+        self.bar.draw(self)
         return True
 
     def next_keyboard(self):
@@ -89,7 +89,7 @@ class Maildir(base._TextBox):
 
             if newText != self.text:
                 self.text = newText
-                self.bar.draw()
+                self.bar.draw(self)
         # Return True to keep the timeout active (see documentation of
         # gobject.timeout_add()).
         return True
@@ -263,7 +263,7 @@ class Mpd(base._TextBox):
 
         if self.text != playing:
             self.text = playing
-            self.bar.draw()
+            self.bar.draw(self)
 
         return True
 
@@ -114,7 +114,7 @@ class Mpris(base._TextBox):
 
         if playing != self.text:
             self.text = playing
-            self.bar.draw()
+            self.bar.draw(self)
 
     @ensure_connected
     def is_playing(self):
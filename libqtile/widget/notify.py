@@ -60,17 +60,17 @@ class Notify(base._TextBox):
             self.timeout_add(notif.timeout / 1000, self.clear)
         elif self.default_timeout:
             self.timeout_add(self.default_timeout, self.clear)
-        self.bar.draw()
+        self.bar.draw(self)
         return True
 
     def display(self):
         self.set_notif_text(notifier.notifications[self.current_id])
-        self.bar.draw()
+        self.bar.draw(self)
 
     def clear(self):
         self.text = ''
         self.current_id = len(notifier.notifications) - 1
-        self.bar.draw()
+        self.bar.draw(self)
 
     def prev(self):
         if self.current_id > 0:
@@ -52,7 +52,7 @@ class Pacman(base._TextBox):
             updates = str(self.updates())
             if self.text != updates:
                 self.text = updates
-                self.bar.draw()
+                self.bar.draw(self)
         return True
 
     def button_press(self, x, y, button):
@@ -182,8 +182,9 @@ class WindowCompleter:
         """
         if not self.lookup:
             self.lookup = []
-            for wid, window in self.qtile.windowMap.iteritems():
-                if window.group and window.name.lower().startswith(txt):
+            for wid in self.qtile.windowMap.client_list():
+                window = self.qtile.windowMap[wid]
+                if window.name.lower().startswith(txt):
                     self.lookup.append((window.name, wid))
 
             self.lookup.sort()
@@ -364,7 +365,7 @@ class Prompt(base._TextBox):
                 self.text = self.text
         else:
             self.text = ""
-        self.bar.draw()
+        self.bar.draw(self)
 
     def handle_KeyPress(self, e):
         """
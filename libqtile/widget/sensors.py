@@ -87,5 +87,5 @@ class ThermalSensor(base._TextBox):
                 self.layout.colour = self.foreground_alert
             else:
                 self.layout.colour = self.foreground_normal
-            self.bar.draw()
+            self.bar.draw(self)
         return True
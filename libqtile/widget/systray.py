@@ -1,4 +1,4 @@
-from .. import bar, xcbq, window
+from .. import bar, xcbq, window, drawer
 import base
 
 import xcb
@@ -38,7 +38,9 @@ class Icon(window._Window):
 
         self.width = width
         self.height = height
-        self.window.set_attribute(backpixmap=self.systray.drawer.pixmap)
+        self.window.set_attribute(
+            backpixmap=self.systray.iconBackground.pixmap
+        )
         self.systray.draw()
         return False
 
@@ -105,6 +107,7 @@ class Systray(base._Widget):
         base._Widget.__init__(self, bar.CALCULATED, **config)
         self.add_defaults(Systray.defaults)
         self.traywin = None
+        self.iconBackground = None
         self.icons = {}
 
     def button_press(self, x, y, button):
@@ -119,6 +122,15 @@ class Systray(base._Widget):
         base._Widget._configure(self, qtile, bar)
         self.qtile = qtile
         self.bar = bar
+        # The drawer draws into the bar's pixmap, so the icons get a pixmap
+        # of their own for their background.
+        self.iconBackground = drawer.Drawer(
+            qtile,
+            self.win.wid,
+            self.icon_size,
+            self.bar.height
+        )
+        self.iconBackground.clear(self.background or self.bar.background)
         atoms = qtile.conn.atoms
         win = qtile.conn.create_window(-1, -1, 1, 1)
         self.traywin = TrayWindow(win, self.qtile, self)
@@ -161,3 +173,4 @@ class Systray(base._Widget):
             xcb.CurrentTime,
         )
         self.traywin.hide()
+        self.iconBackground.free()
@@ -72,7 +72,7 @@ class TaskList(base._Widget, base.PaddingMixin, base.MarginMixin):
     def update(self, window=None):
         group = self.bar.screen.group
         if not window or window and window.group is group:
-            self.bar.draw()
+            self.bar.draw(self)
 
     def remove_icon_cache(self, window):
         wid = window.window.wid
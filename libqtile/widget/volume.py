@@ -82,7 +82,7 @@ class Volume(base._TextBox):
                 # Update the underlying canvas size before actually attempting
                 # to figure out how big it is and draw it.
                 self._update_drawer()
-                self.bar.draw()
+                self.bar.draw(self)
         return True
 
     def _update_drawer(self):
@@ -27,4 +27,4 @@ class WindowName(base._TextBox):
         elif w.floating:
             state = 'V '
         self.text = "%s%s" % (state,  w.name if w and w.name else " ")
-        self.bar.draw()
+        self.bar.draw(self)
@@ -30,5 +30,5 @@ class Wlan(base._TextBox):
             text = "{} {}/70".format(essid, quality)
             if self.text != text:
                 self.text = text
-                self.bar.draw()
+                self.bar.draw(self)
         return True
@@ -6,7 +6,7 @@ import base
 import urllib
 import urllib2
 from xml.dom import minidom
-import gobject
+from .. import eventloop
 import threading
 
 try:
@@ -71,7 +71,7 @@ class YahooWeather(base._TextBox):
 
         def worker():
             data = self.fetch_weather()
-            gobject.idle_add(self.update, data)
+            eventloop.idle_add(self.update, data)
         threading.Thread(target=worker).start()
         return True
 
@@ -80,7 +80,7 @@ class YahooWeather(base._TextBox):
             self.text = self.format.format(**data)
         else:
             self.text = 'N/A'
-        self.bar.draw()
+        self.bar.draw(self)
         return False
 
     def fetch_woeid(self, location):
@@ -27,6 +27,7 @@ import xcb.xproto
 import command
 import utils
 import hook
+import xcbq
 
 
 # ICCM Constants
@@ -106,11 +107,31 @@ _NET_WM_STATE_TOGGLE = 2
 
 
 class _Window(command.CommandObject):
+    # The values read from the window by cmd_inspect.
+    _inspectKeys = [
+        "attributes",
+        "properties",
+        "name",
+        "wm_hints",
+        "wm_normal_hints",
+        "wm_protocols",
+        "wm_state",
+        "wm_class",
+        "wm_window_role",
+        "wm_type",
+        "wm_transient_for",
+        "wm_icon_name",
+        "wm_client_machine",
+    ]
+
     def __init__(self, window, qtile):
         self.window, self.qtile = window, qtile
         self.hidden = True
         self.group = None
         self.icons = {}
+        # The geometry and border color last sent to the server, see place.
+        self._committed = {}
+        self._committedColor = None
         window.set_attribute(eventmask=self._windowMask)
         try:
             g = self.window.get_geometry()
@@ -201,6 +222,7 @@ class _Window(command.CommandObject):
         except (xcb.xproto.BadWindow, xcb.xproto.BadAccess):
             return
         hook.fire("window_name_change")
+        hook.fire("client_name_updated", self)
 
     def updateHints(self):
         """
@@ -253,9 +275,11 @@ class _Window(command.CommandObject):
         if h and 'UrgencyHint' in h['flags']:
             if self.qtile.currentWindow != self:
                 self.hints['urgent'] = True
+                self.qtile.windowMap.update_urgency(self)
                 hook.fire('client_urgent_hint_changed', self)
         elif self.urgent:
             self.hints['urgent'] = False
+            self.qtile.windowMap.update_urgency(self)
             hook.fire('client_urgent_hint_changed', self)
 
         if getattr(self, 'group', None):
@@ -399,6 +423,10 @@ class _Window(command.CommandObject):
             if force is false, than it tries to obey hints
             if twice is true, that it does positioning twice (useful for some
                 gtk apps)
+
+            Only the values that differ from the ones last sent are sent to
+            the server, unless twice is true, in which case all of them are.
+            Returns whether a ConfigureWindow request was sent.
         """
         # TODO(tailhook) uncomment resize increments when we'll decide
         #                to obey all those hints
@@ -425,13 +453,20 @@ class _Window(command.CommandObject):
             self._float_info['x'] = x - self.group.screen.x
             self._float_info['y'] = y - self.group.screen.y
 
-        kwarg = dict(
+        geometry = dict(
             x=x,
             y=y,
             width=width,
             height=height,
             borderwidth=borderwidth,
         )
+        if twice:
+            kwarg = dict(geometry)
+        else:
+            kwarg = dict(
+                (k, v) for k, v in geometry.items()
+                if self._committed.get(k) != v
+            )
         if above:
             kwarg['stackmode'] = StackMode.Above
 
@@ -454,10 +489,37 @@ class _Window(command.CommandObject):
             kwarg['y'] -= 1
             self.window.configure(**kwarg)
             kwarg['y'] += 1
-        self.window.configure(**kwarg)
+        if kwarg:
+            self.window.configure(**kwarg)
+        self._committed = geometry
 
-        if bordercolor is not None:
+        if bordercolor is not None and \
+                (twice or bordercolor != self._committedColor):
             self.window.set_attribute(borderpixel=bordercolor)
+            self._committedColor = bordercolor
+        return bool(kwarg)
+
+    def send_configure_notify(self):
+        """
+            Send the window a synthetic ConfigureNotify with its current
+            geometry, as ICCCM 4.1.5 asks for when a ConfigureRequest
+            results in no change.
+        """
+        vals = [
+            22,  # ConfigureNotifyEvent
+            0,
+            self.window.wid,  # event
+            self.window.wid,  # window
+            0,  # above_sibling
+            self.x,
+            self.y,
+            self.width,
+            self.height,
+            self.borderwidth,
+            0,  # override_redirect
+        ]
+        e = struct.pack('=BxHIIIhhHHHB5x', *vals)
+        self.window.send_event(e, EventMask.StructureNotify)
 
     def focus(self, warp):
 
@@ -523,6 +585,11 @@ class _Window(command.CommandObject):
         """
             Tells you more than you ever wanted to know about a window.
         """
+        with self.qtile.conn.batch() as batch:
+            batch.snapshot(self.window, self._inspectKeys)
+            return self._inspect()
+
+    def _inspect(self):
         a = self.window.get_attributes()
         attrs = {
             "backing_store": a.backing_store,
@@ -638,7 +705,7 @@ class Static(_Window):
         if self.conf_height is None and e.value_mask & cw.Height:
             self.height = e.height
 
-        self.place(
+        changed = self.place(
             self.screen.x + self.x,
             self.screen.y + self.y,
             self.width,
@@ -646,6 +713,9 @@ class Static(_Window):
             self.borderwidth,
             self.bordercolor
         )
+        if not changed:
+            # The server only notifies the client of actual changes.
+            self.send_configure_notify()
         return False
 
     def update_strut(self):
@@ -663,8 +733,11 @@ class Static(_Window):
 
     def handle_PropertyNotify(self, e):
         name = self.qtile.conn.atoms.get_name(e.atom)
+        self.window.cache.invalidate(name)
         if name in ("_NET_WM_STRUT_PARTIAL", "_NET_WM_STRUT"):
             self.update_strut()
+        elif name == "WM_CLASS":
+            self.qtile.windowMap.reclass(self)
 
     def __repr__(self):
         return "Static(%s)" % self.name
@@ -680,6 +753,8 @@ class Window(_Window):
     _group = None
 
     def __init__(self, window, qtile):
+        # Static windows made from this one keep the cache.
+        window.cache = xcbq.PropertyCache(qtile.conn.propertyCacheStats)
         _Window.__init__(self, window, qtile)
         self.updateName()
         # add to group by position according to _NET_WM_DESKTOP property
@@ -707,6 +782,7 @@ class Window(_Window):
                 self.qtile.groups.index(group)
             )
         self._group = group
+        self.qtile.windowMap.regroup(self)
 
     @property
     def floating(self):
@@ -1073,8 +1149,6 @@ class Window(_Window):
                     # skip 0
                     continue
 
-                prop_name = atoms.get_name(prop)
-
                 if action == _NET_WM_STATE_REMOVE:
                     current_state.discard(prop)
                 elif action == _NET_WM_STATE_ADD:
@@ -1090,6 +1164,7 @@ class Window(_Window):
     def handle_PropertyNotify(self, e):
         name = self.qtile.conn.atoms.get_name(e.atom)
         self.qtile.log.debug("PropertyNotifyEvent: %s" % name)
+        self.window.cache.invalidate(name)
         if name == "WM_TRANSIENT_FOR":
             pass
         elif name == "WM_HINTS":
@@ -1118,6 +1193,8 @@ class Window(_Window):
             self.updateState()
         elif name == "WM_PROTOCOLS":
             pass
+        elif name == "WM_CLASS":
+            self.qtile.windowMap.reclass(self)
         elif name == "_NET_WM_DESKTOP":
             # Some windows set the state(fullscreen) when starts,
             # updateState is here because the group and the screen
@@ -150,6 +150,24 @@ SUPPORTED_ATOMS = [
     '_NET_WM_NAME'
 ]
 
+# Other atoms used by Qtile and its widgets, interned along with the ones
+# above when the connection is set up.
+OtherAtoms = [
+    "UTF8_STRING",
+    "WM_PROTOCOLS",
+    "WM_DELETE_WINDOW",
+    "WM_TAKE_FOCUS",
+    "WM_WINDOW_ROLE",
+    "_NET_WM_VISIBLE_NAME",
+    "_NET_WM_ICON",
+    "_NET_WM_ICON_NAME",
+    "_NET_WM_USER_TIME",
+    # Systray
+    "MANAGER",
+    "_NET_SYSTEM_TRAY_OPCODE",
+    "_NET_SYSTEM_TRAY_S0",
+]
+
 
 def toStr(s):
     return "".join([chr(i) for i in s.name])
@@ -199,14 +217,19 @@ class AtomCache:
         self.atoms = {}
         self.reverse = {}
 
-        # We can change the pre-loads not to wait for a return
-        for name in WindowTypes.keys():
-            self.insert(name=name)
-
         for i in dir(xcb.xproto.Atom):
             if not i.startswith("_"):
                 self.insert(name=i, atom=getattr(xcb.xproto.Atom, i))
 
+        # Intern everything we know we will need in one round trip.
+        names = set(WindowTypes.keys())
+        names.update(i for i in WindowStates.keys() if i)
+        names.update(PropertyMap.keys())
+        names.update(t for t, _ in PropertyMap.values())
+        names.update(SUPPORTED_ATOMS)
+        names.update(OtherAtoms)
+        self.insert_names(names)
+
     def insert(self, name=None, atom=None):
         assert name or atom
         if atom is None:
@@ -218,11 +241,34 @@ class AtomCache:
         self.atoms[name] = atom
         self.reverse[atom] = name
 
+    def insert_names(self, names):
+        """
+            Intern the names that are not known yet, sending all the
+            requests before reading the replies.
+        """
+        names = sorted(i for i in set(names) if i not in self.atoms)
+        cookies = [
+            self.conn.conn.core.InternAtom(False, len(i), i) for i in names
+        ]
+        for name, c in zip(names, cookies):
+            self.insert(name=name, atom=c.reply().atom)
+
     def get_name(self, atom):
         if atom not in self.reverse:
             self.insert(atom=atom)
         return self.reverse[atom]
 
+    def get_names(self, atoms):
+        """
+            Returns the names of a list of atoms, looking up all the unknown
+            ones in one round trip.
+        """
+        unknown = sorted(set(i for i in atoms if i not in self.reverse))
+        cookies = [self.conn.conn.core.GetAtomName(i) for i in unknown]
+        for atom, c in zip(unknown, cookies):
+            self.insert(name=str(c.reply().name.buf()), atom=atom)
+        return [self.reverse[i] for i in atoms]
+
     def __getitem__(self, key):
         if key not in self.atoms:
             self.insert(name=key)
@@ -328,7 +374,66 @@ class GC:
         self.conn.conn.core.ChangeGC(self.gid, mask, values)
 
 
+class Future:
+    """
+        The reply to a request that has already been sent. The reply is
+        only waited for when result is first called, so that the requests
+        for several futures can be sent before any of their replies is
+        needed. parse, if given, is applied to the reply, and the
+        exceptions in errors produce a None result, without calling parse,
+        instead of being raised.
+    """
+    def __init__(self, cookie, parse=None, errors=()):
+        self.cookie = cookie
+        self.parse = parse
+        self.errors = errors
+        self.done = False
+        self.value = None
+        self.error = None
+
+    def result(self):
+        if not self.done:
+            self.done = True
+            try:
+                r = self.cookie.reply() if self.cookie is not None else None
+            except self.errors:
+                # There's no reply to parse, the result is None.
+                return None
+            except Exception, v:
+                self.error = v
+                raise
+            if self.parse is not None:
+                try:
+                    r = self.parse(r)
+                except Exception, v:
+                    self.error = v
+                    raise
+            self.value = r
+        elif self.error is not None:
+            raise self.error
+        return self.value
+
+    # A Future can stand in for a cookie, to chain parsing steps.
+    reply = result
+
+
+class Gather:
+    """
+        A cookie whose reply is the list of the results of some futures.
+    """
+    def __init__(self, futures):
+        self.futures = futures
+
+    def reply(self):
+        return [f.result() for f in self.futures]
+
+
 class Window:
+    # The Snapshot being taken of this window, if any.
+    snapshot = None
+    # The PropertyCache of this window, if its properties are cached.
+    cache = None
+
     def __init__(self, conn, wid):
         self.conn = conn
         self.wid = wid
@@ -364,32 +469,55 @@ class Window:
             y
         )
 
+    def _prefetched(self, key):
+        """
+            Returns the future for key in the snapshot taken of this window,
+            or None.
+        """
+        if self.snapshot is not None:
+            return self.snapshot.futures.get(key)
+
+    def _get(self, key, fetch, *args):
+        if self.cache is not None and key in self.cache.properties:
+            return self.cache.get(key, self._fetch, key, fetch, *args)
+        return self._fetch(key, fetch, *args)
+
+    def _fetch(self, key, fetch, *args):
+        f = self._prefetched(key)
+        if f is None:
+            f = fetch(*args)
+        return f.result()
+
+    def _firstString(self, replies):
+        for r in replies:
+            if r:
+                return self._propertyString(r)
+
+    def fetch_name(self):
+        return Future(Gather([
+            self.fetch_property(
+                "_NET_WM_VISIBLE_NAME",
+                xcb.xproto.GetPropertyType.Any
+            ),
+            self.fetch_property(
+                "_NET_WM_NAME",
+                xcb.xproto.GetPropertyType.Any
+            ),
+            self.fetch_property(
+                xcb.xproto.Atom.WM_NAME,
+                xcb.xproto.GetPropertyType.Any
+            ),
+        ]), self._firstString)
+
     def get_name(self):
         """
             Tries to retrieve a canonical window name. We test the following
             properties in order of preference: _NET_WM_VISIBLE_NAME,
             _NET_WM_NAME, WM_NAME.
         """
-        r = self.get_property(
-            "_NET_WM_VISIBLE_NAME",
-            xcb.xproto.GetPropertyType.Any
-        )
-        if r:
-            return self._propertyString(r)
-
-        r = self.get_property("_NET_WM_NAME", xcb.xproto.GetPropertyType.Any)
-        if r:
-            return self._propertyString(r)
+        return self._get("name", self.fetch_name)
 
-        r = self.get_property(
-            xcb.xproto.Atom.WM_NAME,
-            xcb.xproto.GetPropertyType.Any
-        )
-        if r:
-            return self._propertyString(r)
-
-    def get_wm_hints(self):
-        r = self.get_property("WM_HINTS", xcb.xproto.GetPropertyType.Any)
+    def _parseWMHints(self, r):
         if r:
             data = struct.pack("B" * len(r.value), *(list(r.value)))
             l = struct.unpack_from("=IIIIIIIII", data)
@@ -409,11 +537,16 @@ class Window:
                 window_group=l[8]
             )
 
-    def get_wm_normal_hints(self):
-        r = self.get_property(
-            "WM_NORMAL_HINTS",
-            xcb.xproto.GetPropertyType.Any
+    def fetch_wm_hints(self):
+        return Future(
+            self.fetch_property("WM_HINTS", xcb.xproto.GetPropertyType.Any),
+            self._parseWMHints
         )
+
+    def get_wm_hints(self):
+        return self._get("wm_hints", self.fetch_wm_hints)
+
+    def _parseWMNormalHints(self, r):
         if r:
             data = struct.pack("B" * len(r.value), *(list(r.value)))
             l = struct.unpack_from("=IIIIIIIIIIIIII", data)
@@ -436,76 +569,165 @@ class Window:
                 win_gravity=l[9 + 4],
             )
 
-    def get_wm_protocols(self):
-        r = self.get_property("WM_PROTOCOLS", xcb.xproto.GetPropertyType.Any)
+    def fetch_wm_normal_hints(self):
+        return Future(
+            self.fetch_property(
+                "WM_NORMAL_HINTS",
+                xcb.xproto.GetPropertyType.Any
+            ),
+            self._parseWMNormalHints
+        )
+
+    def get_wm_normal_hints(self):
+        return self._get("wm_normal_hints", self.fetch_wm_normal_hints)
+
+    def _parseWMProtocols(self, r):
         if r:
             data = struct.pack("B" * len(r.value), *(list(r.value)))
             l = struct.unpack_from("=" + "L" * r.value_len, data)
-            return set([self.conn.atoms.get_name(i) for i in l])
+            return set(self.conn.atoms.get_names(l))
         else:
             return set()
 
-    def get_wm_state(self):
-        r = self.get_property("WM_STATE", xcb.xproto.GetPropertyType.Any)
+    def fetch_wm_protocols(self):
+        return Future(
+            self.fetch_property(
+                "WM_PROTOCOLS",
+                xcb.xproto.GetPropertyType.Any
+            ),
+            self._parseWMProtocols
+        )
+
+    def get_wm_protocols(self):
+        return self._get("wm_protocols", self.fetch_wm_protocols)
+
+    def _parseWMState(self, r):
         if r:
             return struct.unpack('=LL', r.value.buf())
 
+    def fetch_wm_state(self):
+        return Future(
+            self.fetch_property("WM_STATE", xcb.xproto.GetPropertyType.Any),
+            self._parseWMState
+        )
+
+    def get_wm_state(self):
+        return self._get("wm_state", self.fetch_wm_state)
+
+    def _parseWMClass(self, r):
+        if r:
+            s = self._propertyString(r)
+            return tuple(s.strip("\0").split("\0"))
+
+    def fetch_wm_class(self):
+        return Future(
+            self.fetch_property("WM_CLASS", "STRING"),
+            self._parseWMClass
+        )
+
     def get_wm_class(self):
         """
             Return an (instance, class) tuple if WM_CLASS exists, or None.
         """
-        r = self.get_property("WM_CLASS", "STRING")
-        if r:
-            s = self._propertyString(r)
-            return tuple(s.strip("\0").split("\0"))
+        return self._get("wm_class", self.fetch_wm_class)
 
-    def get_wm_window_role(self):
-        r = self.get_property("WM_WINDOW_ROLE", "STRING")
+    def _parseString(self, r):
         if r:
             return self._propertyString(r)
 
-    def get_wm_transient_for(self):
-        r = self.get_property("WM_TRANSIENT_FOR", "ATOM")
+    def fetch_wm_window_role(self):
+        return Future(
+            self.fetch_property("WM_WINDOW_ROLE", "STRING"),
+            self._parseString
+        )
+
+    def get_wm_window_role(self):
+        return self._get("wm_window_role", self.fetch_wm_window_role)
+
+    def _parseWMTransientFor(self, r):
         if r:
             return list(r.value)
 
+    def fetch_wm_transient_for(self):
+        return Future(
+            self.fetch_property("WM_TRANSIENT_FOR", "ATOM"),
+            self._parseWMTransientFor
+        )
+
+    def get_wm_transient_for(self):
+        return self._get("wm_transient_for", self.fetch_wm_transient_for)
+
+    def fetch_wm_icon_name(self):
+        return Future(
+            self.fetch_property("WM_ICON_NAME", "UTF8_STRING"),
+            self._parseString
+        )
+
     def get_wm_icon_name(self):
-        r = self.get_property("WM_ICON_NAME", "UTF8_STRING")
-        if r:
-            return self._propertyString(r)
+        return self._get("wm_icon_name", self.fetch_wm_icon_name)
+
+    def fetch_wm_client_machine(self):
+        return Future(
+            self.fetch_property("WM_CLIENT_MACHINE", "UTF8_STRING"),
+            self._parseString
+        )
 
     def get_wm_client_machine(self):
-        r = self.get_property("WM_CLIENT_MACHINE", "UTF8_STRING")
-        if r:
-            return self._propertyString(r)
+        return self._get("wm_client_machine", self.fetch_wm_client_machine)
+
+    def fetch_geometry(self):
+        return Future(self.conn.conn.core.GetGeometry(self.wid))
 
     def get_geometry(self):
-        q = self.conn.conn.core.GetGeometry(self.wid)
-        return q.reply()
+        return self._get("geometry", self.fetch_geometry)
 
-    def get_wm_desktop(self):
-        r = self.get_property("_NET_WM_DESKTOP", "CARDINAL")
+    def _parseWMDesktop(self, r):
         if r:
             return r.value[0]
 
+    def fetch_wm_desktop(self):
+        return Future(
+            self.fetch_property("_NET_WM_DESKTOP", "CARDINAL"),
+            self._parseWMDesktop
+        )
+
+    def get_wm_desktop(self):
+        return self._get("wm_desktop", self.fetch_wm_desktop)
+
+    def _parseWMType(self, r):
+        if r:
+            name = self.conn.atoms.get_name(r[0])
+            return WindowTypes.get(name, name)
+
+    def fetch_wm_type(self):
+        return Future(
+            self.fetch_property('_NET_WM_WINDOW_TYPE', "ATOM", unpack='I'),
+            self._parseWMType
+        )
+
     def get_wm_type(self):
         """
         http://standards.freedesktop.org/wm-spec/wm-spec-latest.html#id2551529
         """
-        r = self.get_property('_NET_WM_WINDOW_TYPE', "ATOM", unpack='I')
+        return self._get("wm_type", self.fetch_wm_type)
+
+    def _parseNetWMState(self, r):
         if r:
             name = self.conn.atoms.get_name(r[0])
-            return WindowTypes.get(name, name)
+            return WindowStates.get(name, name)
+
+    def fetch_net_wm_state(self):
+        return Future(
+            self.fetch_property('_NET_WM_STATE', "ATOM", unpack='I'),
+            self._parseNetWMState
+        )
 
     def get_net_wm_state(self):
         # TODO: _NET_WM_STATE is a *list* of atoms
         # We're returning only the first one, but we don't need anything
         # other than _NET_WM_STATE_FULLSCREEN (at least for now)
         # Fixing this requires refactoring each call to use a list instead
-        r = self.get_property('_NET_WM_STATE', "ATOM", unpack='I')
-        if r:
-            name = self.conn.atoms.get_name(r[0])
-            return WindowStates.get(name, name)
+        return self._get("net_wm_state", self.fetch_net_wm_state)
 
     def configure(self, **kwargs):
         """
@@ -533,6 +755,10 @@ class Window:
             type: String Atom name
             format: 8, 16, 32
         """
+        if self.snapshot is not None:
+            self.snapshot.discard(name)
+        if self.cache is not None:
+            self.cache.invalidate(name)
         if name in PropertyMap:
             if type or format:
                 raise ValueError(
@@ -579,11 +805,10 @@ class Window:
             buf
         )
 
-    def get_property(self, prop, type=None, unpack=None):
+    def fetch_property(self, prop, type=None, unpack=None):
         """
-            Return the contents of a property as a GetPropertyReply, or
-            a tuple of values if unpack is specified, which is a format
-            string to be used with the struct module.
+            Send a GetProperty request, and return a Future for what
+            get_property would return.
         """
         if type is None:
             if not prop in PropertyMap:
@@ -592,8 +817,16 @@ class Window:
                 )
             else:
                 type, _ = PropertyMap[prop]
+
+        def parse(r):
+            if not r.value_len:
+                return None
+            elif unpack is not None:
+                return struct.unpack_from(unpack, r.value.buf())
+            else:
+                return r
         try:
-            r = self.conn.conn.core.GetProperty(
+            cookie = self.conn.conn.core.GetProperty(
                 False, self.wid,
                 self.conn.atoms[prop]
                 if isinstance(prop, basestring)
@@ -602,20 +835,32 @@ class Window:
                 if isinstance(type, basestring)
                 else type,
                 0, (2 ** 32) - 1
-            ).reply()
-
-            if not r.value_len:
-                return None
-            elif unpack is not None:
-                return struct.unpack_from(unpack, r.value.buf())
-            else:
-                return r
+            )
         except xcb.xproto.BadWindow:
-            return None
+            return Future(None)
+        return Future(cookie, parse, (xcb.xproto.BadWindow,))
+
+    def get_property(self, prop, type=None, unpack=None):
+        """
+            Return the contents of a property as a GetPropertyReply, or
+            a tuple of values if unpack is specified, which is a format
+            string to be used with the struct module.
+        """
+        return self._get(
+            (prop, type, unpack), self.fetch_property, prop, type, unpack
+        )
+
+    def _parseProperties(self, r):
+        return self.conn.atoms.get_names(r.atoms)
+
+    def fetch_properties(self):
+        return Future(
+            self.conn.conn.core.ListProperties(self.wid),
+            self._parseProperties
+        )
 
     def list_properties(self):
-        r = self.conn.conn.core.ListProperties(self.wid).reply()
-        return [self.conn.atoms.get_name(i) for i in r.atoms]
+        return self._get("properties", self.fetch_properties)
 
     def map(self):
         self.conn.conn.core.MapWindow(self.wid)
@@ -623,8 +868,11 @@ class Window:
     def unmap(self):
         self.conn.conn.core.UnmapWindow(self.wid)
 
+    def fetch_attributes(self):
+        return Future(self.conn.conn.core.GetWindowAttributes(self.wid))
+
     def get_attributes(self):
-        return self.conn.conn.core.GetWindowAttributes(self.wid).reply()
+        return self._get("attributes", self.fetch_attributes)
 
     def create_gc(self, **kwargs):
         gid = self.conn.conn.generate_id()
@@ -693,8 +941,7 @@ class Window:
     def ungrab_pointer(self):
         self.conn.conn.core.UngrabPointer(xcb.xproto.Atom._None)
 
-    def query_tree(self):
-        q = self.conn.conn.core.QueryTree(self.wid).reply()
+    def _parseTree(self, q):
         root = None
         parent = None
         if q.root:
@@ -703,6 +950,188 @@ class Window:
             parent = Window(self.conn, q.root)
         return root, parent, [Window(self.conn, i) for i in q.children]
 
+    def fetch_tree(self):
+        return Future(
+            self.conn.conn.core.QueryTree(self.wid),
+            self._parseTree
+        )
+
+    def query_tree(self):
+        return self._get("tree", self.fetch_tree)
+
+
+class Snapshot:
+    """
+        A set of values read from a window, given as a list of keys: the
+        name of a fetch_ method of Window without its prefix, or a
+        (property, type, unpack) tuple for fetch_property. The requests
+        for all of them are sent when the snapshot is taken, so the replies
+        arrive in one round trip instead of one each. While the snapshot is
+        attached to the window, the getters return the snapshotted values.
+
+        By default, the values read when a window is managed are taken.
+    """
+    manageKeys = [
+        "attributes",
+        "geometry",
+        "name",
+        "wm_hints",
+        "wm_normal_hints",
+        "wm_type",
+        "net_wm_state",
+        "wm_class",
+        "wm_window_role",
+        "wm_protocols",
+        "wm_desktop",
+        ("QTILE_INTERNAL", None, None),
+        ("_NET_WM_ICON", "CARDINAL", None),
+        ("_NET_WM_STRUT_PARTIAL", None, "I" * 12),
+        ("_NET_WM_STRUT", None, "I" * 4),
+    ]
+    # The snapshotted values read from each property.
+    sources = {
+        "_NET_WM_VISIBLE_NAME": ["name"],
+        "_NET_WM_NAME": ["name"],
+        "WM_NAME": ["name"],
+        "WM_HINTS": ["wm_hints"],
+        "WM_NORMAL_HINTS": ["wm_normal_hints"],
+        "_NET_WM_WINDOW_TYPE": ["wm_type"],
+        "_NET_WM_STATE": ["net_wm_state"],
+        "WM_CLASS": ["wm_class"],
+        "WM_WINDOW_ROLE": ["wm_window_role"],
+        "WM_PROTOCOLS": ["wm_protocols"],
+        "WM_STATE": ["wm_state"],
+        "WM_TRANSIENT_FOR": ["wm_transient_for"],
+        "WM_ICON_NAME": ["wm_icon_name"],
+        "WM_CLIENT_MACHINE": ["wm_client_machine"],
+        "_NET_WM_DESKTOP": ["wm_desktop"],
+    }
+
+    def __init__(self, window, keys=None):
+        self.window = window
+        self.futures = {}
+        for key in keys or self.manageKeys:
+            if window.cache is not None and key in window.cache.values:
+                continue
+            if isinstance(key, tuple):
+                self.futures[key] = window.fetch_property(*key)
+            else:
+                self.futures[key] = getattr(window, "fetch_" + key)()
+
+    def __getattr__(self, name):
+        try:
+            return self.futures[name].result()
+        except KeyError:
+            raise AttributeError(name)
+
+    def discard(self, prop):
+        """
+            Forget the values read from prop, after it has been changed.
+        """
+        keys = self.sources.get(prop, []) + ["properties"]
+        for key in self.futures.keys():
+            if key in keys or (isinstance(key, tuple) and key[0] == prop):
+                del self.futures[key]
+
+    def __enter__(self):
+        self.window.snapshot = self
+        return self
+
+    def __exit__(self, *args):
+        self.window.snapshot = None
+
+
+class PropertyCache:
+    """
+        The values read from the properties of a window that are looked at
+        often but rarely change. A value is kept from when it is first read
+        until its property is invalidated, which the owner of the window
+        does on PropertyNotify. Hits, misses and invalidations are counted
+        in stats, which is shared by the windows of a connection.
+    """
+    # The property each cached value is read from.
+    properties = {
+        "wm_class": "WM_CLASS",
+        "wm_window_role": "WM_WINDOW_ROLE",
+        "wm_type": "_NET_WM_WINDOW_TYPE",
+        "wm_protocols": "WM_PROTOCOLS",
+    }
+    keys = dict((v, k) for k, v in properties.items())
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.values = {}
+
+    def get(self, key, fetch, *args):
+        try:
+            value = self.values[key]
+        except KeyError:
+            self.stats["misses"] += 1
+            value = self.values[key] = fetch(*args)
+        else:
+            self.stats["hits"] += 1
+        return value
+
+    def invalidate(self, prop):
+        key = self.keys.get(prop)
+        if key in self.values:
+            del self.values[key]
+            self.stats["invalidations"] += 1
+
+
+class Batch:
+    """
+        Sends requests, possibly for many windows, before waiting for any
+        of their replies:
+
+            with conn.batch() as batch:
+                classes = [batch.add(w.fetch_wm_class()) for w in windows]
+            print [c.result() for c in classes]
+
+        All replies have arrived when the with block ends. Errors are
+        raised when the result of the failed request is read. Windows given
+        to snapshot answer their getters from a Snapshot until then.
+    """
+    def __init__(self, conn):
+        self.conn = conn
+        self.futures = []
+        self.snapshots = []
+
+    def add(self, future):
+        self.futures.append(future)
+        return future
+
+    def snapshot(self, window, keys=None):
+        """
+            Attach a Snapshot of keys to window, unless it already has one.
+        """
+        if window.snapshot is None:
+            s = Snapshot(window, keys)
+            s.__enter__()
+            self.snapshots.append(s)
+        return window.snapshot
+
+    def resolve(self):
+        self.conn.flush()
+        for f in self.futures:
+            try:
+                f.result()
+            except Exception:
+                pass
+        self.futures = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        try:
+            if exc_type is None:
+                self.resolve()
+        finally:
+            for s in self.snapshots:
+                s.__exit__()
+            self.snapshots = []
+
 
 class Font:
     def __init__(self, conn, fid):
@@ -727,8 +1156,17 @@ class Connection:
         "randr": RandR,
     }
 
-    def __init__(self, display):
-        self.conn = xcb.xcb.connect(display=display)
+    def __init__(self, display, conn=None):
+        """
+            conn is an xpyb connection, or a stand-in for one. A new
+            connection to display is opened if it is not given.
+        """
+        if conn is None:
+            conn = xcb.xcb.connect(display=display)
+        self.conn = conn
+        self.propertyCacheStats = dict(hits=0, misses=0, invalidations=0)
+        # Cairo needs the xpyb connection itself, not a wrapper around it.
+        self.native = getattr(conn, "wrapped", conn)
         self.cursors = Cursors(self)
         self.setup = self.conn.get_setup()
         extensions = self.extensions()
@@ -842,6 +1280,12 @@ class Connection:
     def flush(self):
         return self.conn.flush()
 
+    def batch(self):
+        """
+            Returns a Batch of requests on this connection.
+        """
+        return Batch(self)
+
     def xsync(self):
         # The idea here is that pushing an innocuous request through
         # the queue and waiting for a response "syncs" the connection, since
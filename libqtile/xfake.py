@@ -0,0 +1,797 @@
+# Copyright (c) 2008, Aldo Cortesi. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    An in-process fake X server, for driving Qtile without Xephyr.
+
+    FakeConnection stands in for the xpyb connection under xcbq: it answers
+    the core requests Qtile makes from an in-memory window tree with
+    properties and stacking order, and queues the events a real server
+    would send for them. The client side of the protocol is simulated with
+    the create_client, map_client, configure_client, set_client_property,
+    unmap_client and destroy_client methods, and arbitrary events can be
+    queued with inject.
+
+    Qtile can then be started with:
+
+        Qtile(config, displayName=":fake", fname=sockfile,
+              conn=xfake.connect())
+
+    Bars are not supported, as cairo needs a real X connection.
+"""
+import collections
+import errno
+import fcntl
+import os
+import struct
+import xcb
+import xcb.xinerama
+import xcb.xproto
+from xcb.xproto import CW, ConfigWindow, EventMask, StackMode
+
+import xcbq
+
+# Wire formats of the events the fake server sends: code, struct format
+# and fields, in the order of the X protocol specification.
+_INPUT = (
+    "=BBHIIIIhhhhHBx",
+    ("detail", "sequence", "time", "root", "event", "child", "root_x",
+     "root_y", "event_x", "event_y", "state", "same_screen")
+)
+_CROSSING = (
+    "=BBHIIIIhhhhHBB",
+    ("detail", "sequence", "time", "root", "event", "child", "root_x",
+     "root_y", "event_x", "event_y", "state", "mode", "same_screen_focus")
+)
+_FOCUS = ("=BBHIB23x", ("detail", "sequence", "event", "mode"))
+_UNMAP = ("=BxHIIB19x", ("sequence", "event", "window", "from_configure"))
+
+EVENTS = {
+    "KeyPress": (2,) + _INPUT,
+    "KeyRelease": (3,) + _INPUT,
+    "ButtonPress": (4,) + _INPUT,
+    "ButtonRelease": (5,) + _INPUT,
+    "MotionNotify": (6,) + _INPUT,
+    "EnterNotify": (7,) + _CROSSING,
+    "LeaveNotify": (8,) + _CROSSING,
+    "FocusIn": (9,) + _FOCUS,
+    "FocusOut": (10,) + _FOCUS,
+    "Expose": (
+        12, "=BxHIHHHHH14x",
+        ("sequence", "window", "x", "y", "width", "height", "count")
+    ),
+    "CreateNotify": (
+        16, "=BxHIIhhHHHB9x",
+        ("sequence", "parent", "window", "x", "y", "width", "height",
+         "border_width", "override_redirect")
+    ),
+    "DestroyNotify": (17, "=BxHII20x", ("sequence", "event", "window")),
+    "UnmapNotify": (18,) + _UNMAP,
+    "MapNotify": (
+        19, "=BxHIIB19x",
+        ("sequence", "event", "window", "override_redirect")
+    ),
+    "MapRequest": (20, "=BxHII20x", ("sequence", "parent", "window")),
+    "ReparentNotify": (
+        21, "=BxHIIIhhB11x",
+        ("sequence", "event", "window", "parent", "x", "y",
+         "override_redirect")
+    ),
+    "ConfigureNotify": (
+        22, "=BxHIIIhhHHHB5x",
+        ("sequence", "event", "window", "above_sibling", "x", "y", "width",
+         "height", "border_width", "override_redirect")
+    ),
+    "ConfigureRequest": (
+        23, "=BBHIIIhhHHHH4x",
+        ("stack_mode", "sequence", "parent", "window", "sibling", "x", "y",
+         "width", "height", "border_width", "value_mask")
+    ),
+    "PropertyNotify": (
+        28, "=BxHIIIB15x",
+        ("sequence", "window", "atom", "time", "state")
+    ),
+    "ClientMessage": (
+        33, "=BBHII20s",
+        ("format", "sequence", "window", "type", "data")
+    ),
+}
+
+_DEFAULTS = {
+    "data": "\0" * 20,
+}
+
+# Keys that get a keycode first; the rest of the keysyms fill the remaining
+# keycodes in name order.
+_PREFERRED_KEYS = [
+    "Num_Lock", "Return", "space", "Tab", "BackSpace", "Escape", "Delete",
+    "Left", "Right", "Up", "Down", "Home", "End", "Page_Up", "Page_Down",
+] + ["F%d" % i for i in range(1, 13)]
+
+MIN_KEYCODE = 8
+MAX_KEYCODE = 255
+ROOT_VISUAL = 0x21
+COLORMAP = 0x20
+
+
+def make_event(name, **fields):
+    """
+        Build the xpyb event name (e.g. "MapRequest") from its wire format.
+        Fields that are not given are zero.
+    """
+    code, fmt, names = EVENTS[name]
+    values = [fields.pop(i, _DEFAULTS.get(i, 0)) for i in names]
+    if fields:
+        raise ValueError("Unknown %s fields: %s" % (name, fields.keys()))
+    data = struct.pack(fmt, code, *values)
+    return getattr(xcb.xproto, name + "Event")(data)
+
+
+class _Reply:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class _List(list):
+    """
+        A list of bytes that, like xpyb lists, can return its raw buffer.
+    """
+    def buf(self):
+        return "".join(chr(i) for i in self)
+
+
+def _bytes(s):
+    return _List(ord(c) for c in s)
+
+
+class _Cookie:
+    def __init__(self, reply=None, error=None):
+        self._reply = reply
+        self.error = error
+
+    def reply(self):
+        if self.error is not None:
+            raise self.error
+        return self._reply
+
+    def check(self):
+        if self.error is not None:
+            raise self.error
+
+
+def _masked(mask, values):
+    """
+        Map the bits set in a value mask to their values.
+    """
+    d = {}
+    values = iter(values)
+    bit = 1
+    while bit <= mask:
+        if mask & bit:
+            d[bit] = next(values)
+        bit <<= 1
+    return d
+
+
+class FakeWindow:
+    def __init__(self, wid, parent, x, y, width, height, border_width=0):
+        self.wid = wid
+        self.parent = parent
+        self.children = []
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.border_width = border_width
+        self.mapped = False
+        self.override_redirect = False
+        self.event_mask = 0
+        # atom: (type, format, data)
+        self.properties = {}
+
+    def __repr__(self):
+        return "FakeWindow(%#x)" % self.wid
+
+
+class _Core:
+    """
+        The core protocol requests. Requests that are not implemented are
+        accepted and ignored.
+    """
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._ignore
+
+    def _ignore(self, *args):
+        return _Cookie()
+
+    def _window(self, wid):
+        w = self.conn.windows.get(wid)
+        if w is None:
+            raise xcb.xproto.BadWindow(wid)
+        return w
+
+    def CreateWindow(self, depth, wid, parent, x, y, width, height,
+                     border_width, _class, visual, value_mask, value_list):
+        c = self.conn
+        values = _masked(value_mask, value_list)
+        w = FakeWindow(wid, parent, x, y, width, height, border_width)
+        w.override_redirect = bool(values.get(CW.OverrideRedirect))
+        w.event_mask = values.get(CW.EventMask, 0)
+        c.windows[wid] = w
+        c.windows[parent].children.append(wid)
+        p = c.windows[parent]
+        if p.event_mask & EventMask.SubstructureNotify:
+            c.queue(
+                "CreateNotify", parent=parent, window=wid, x=x, y=y,
+                width=width, height=height, border_width=border_width,
+                override_redirect=w.override_redirect
+            )
+        return _Cookie()
+
+    def DestroyWindow(self, wid):
+        if wid in self.conn.windows:
+            self.conn.destroy(self.conn.windows[wid])
+        return _Cookie()
+
+    def KillClient(self, wid):
+        return self.DestroyWindow(wid)
+
+    def MapWindow(self, wid):
+        w = self.conn.windows.get(wid)
+        if w is not None and not w.mapped:
+            w.mapped = True
+            self.conn.notify(
+                "MapNotify", w, override_redirect=w.override_redirect
+            )
+        return _Cookie()
+
+    def UnmapWindow(self, wid):
+        w = self.conn.windows.get(wid)
+        if w is not None and w.mapped:
+            w.mapped = False
+            self.conn.notify("UnmapNotify", w)
+        return _Cookie()
+
+    def ConfigureWindow(self, wid, value_mask, value_list):
+        w = self.conn.windows.get(wid)
+        if w is not None:
+            self.conn.configure(w, _masked(value_mask, value_list))
+        return _Cookie()
+
+    def ChangeWindowAttributes(self, wid, value_mask, value_list):
+        w = self.conn.windows.get(wid)
+        if w is not None:
+            values = _masked(value_mask, value_list)
+            if CW.EventMask in values:
+                w.event_mask = values[CW.EventMask]
+            if CW.OverrideRedirect in values:
+                w.override_redirect = bool(values[CW.OverrideRedirect])
+        return _Cookie()
+
+    ChangeWindowAttributesChecked = ChangeWindowAttributes
+
+    def ReparentWindow(self, wid, parent, x, y):
+        w = self.conn.windows.get(wid)
+        if w is not None:
+            c = self.conn
+            c.windows[w.parent].children.remove(wid)
+            w.parent = parent
+            w.x = x
+            w.y = y
+            c.windows[parent].children.append(wid)
+            c.notify(
+                "ReparentNotify", w, parent=parent, x=x, y=y,
+                override_redirect=w.override_redirect
+            )
+        return _Cookie()
+
+    def ChangeProperty(self, mode, wid, prop, type, format, length, data):
+        w = self.conn.windows.get(wid)
+        if w is not None:
+            data = str(data)
+            old = w.properties.get(prop)
+            if old is not None and mode != xcb.xproto.PropMode.Replace:
+                if mode == xcb.xproto.PropMode.Append:
+                    data = old[2] + data
+                else:
+                    data = data + old[2]
+            self.conn.change_property(w, prop, type, format, data)
+        return _Cookie()
+
+    def DeleteProperty(self, wid, prop):
+        w = self.conn.windows.get(wid)
+        if w is not None and prop in w.properties:
+            del w.properties[prop]
+            self.conn.property_notify(
+                w, prop, xcb.xproto.Property.Delete
+            )
+        return _Cookie()
+
+    def GetProperty(self, delete, wid, prop, type, long_offset, long_length):
+        try:
+            w = self._window(wid)
+        except xcb.xproto.BadWindow, v:
+            return _Cookie(error=v)
+        p = w.properties.get(prop)
+        if p is None:
+            return _Cookie(_Reply(
+                format=0, type=0, bytes_after=0, value_len=0,
+                value=_List()
+            ))
+        ptype, format, data = p
+        if type != xcb.xproto.GetPropertyType.Any and type != ptype:
+            return _Cookie(_Reply(
+                format=format, type=ptype, bytes_after=len(data),
+                value_len=0, value=_List()
+            ))
+        return _Cookie(_Reply(
+            format=format, type=ptype, bytes_after=0,
+            value_len=len(data) / (format / 8), value=_bytes(data)
+        ))
+
+    def ListProperties(self, wid):
+        try:
+            w = self._window(wid)
+        except xcb.xproto.BadWindow, v:
+            return _Cookie(error=v)
+        return _Cookie(_Reply(atoms=list(w.properties.keys())))
+
+    def GetGeometry(self, wid):
+        w = self.conn.windows.get(wid)
+        if w is None:
+            return _Cookie(error=xcb.xproto.BadDrawable(wid))
+        return _Cookie(_Reply(
+            depth=24, root=self.conn.root, x=w.x, y=w.y, width=w.width,
+            height=w.height, border_width=w.border_width
+        ))
+
+    def GetWindowAttributes(self, wid):
+        try:
+            w = self._window(wid)
+        except xcb.xproto.BadWindow, v:
+            return _Cookie(error=v)
+        if not w.mapped:
+            state = xcb.xproto.MapState.Unmapped
+        elif self.conn.viewable(w):
+            state = xcb.xproto.MapState.Viewable
+        else:
+            state = xcb.xproto.MapState.Unviewable
+        return _Cookie(_Reply(
+            backing_store=0, visual=ROOT_VISUAL,
+            _class=xcb.xproto.WindowClass.InputOutput, bit_gravity=0,
+            win_gravity=1, backing_planes=0, backing_pixel=0, save_under=0,
+            map_is_installed=1, map_state=state,
+            override_redirect=w.override_redirect, colormap=COLORMAP,
+            all_event_masks=w.event_mask, your_event_mask=w.event_mask,
+            do_not_propagate_mask=0
+        ))
+
+    def QueryTree(self, wid):
+        try:
+            w = self._window(wid)
+        except xcb.xproto.BadWindow, v:
+            return _Cookie(error=v)
+        return _Cookie(_Reply(
+            root=self.conn.root, parent=w.parent or 0,
+            children_len=len(w.children), children=list(w.children)
+        ))
+
+    def InternAtom(self, only_if_exists, name_len, name):
+        return _Cookie(_Reply(atom=self.conn.intern(name, only_if_exists)))
+
+    def GetAtomName(self, atom):
+        name = self.conn.atomNames.get(atom)
+        if name is None:
+            return _Cookie(error=xcb.xproto.BadAtom(atom))
+        return _Cookie(_Reply(name_len=len(name), name=_bytes(name)))
+
+    def SetInputFocus(self, revert_to, focus, time):
+        self.conn.focus = focus
+        return _Cookie()
+
+    def GetInputFocus(self):
+        return _Cookie(_Reply(revert_to=0, focus=self.conn.focus))
+
+    def SendEvent(self, propagate, destination, event_mask, event):
+        self.conn.sent.append((destination, str(event)))
+        return _Cookie()
+
+    def SetSelectionOwner(self, owner, selection, time):
+        self.conn.selections[selection] = owner
+        return _Cookie()
+
+    def GetSelectionOwner(self, selection):
+        return _Cookie(_Reply(owner=self.conn.selections.get(selection, 0)))
+
+    def AllocColor(self, cmap, red, green, blue):
+        pixel = (red >> 8) << 16 | (green >> 8) << 8 | blue >> 8
+        return _Cookie(_Reply(
+            red=red, green=green, blue=blue, pixel=pixel
+        ))
+
+    def AllocNamedColor(self, cmap, name_len, name):
+        return _Cookie(_Reply(
+            pixel=0, exact_red=0, exact_green=0, exact_blue=0,
+            visual_red=0, visual_green=0, visual_blue=0
+        ))
+
+    def ListExtensions(self):
+        names = []
+        if len(self.conn.screens) > 1:
+            names.append(_Reply(name_len=8, name=_bytes("XINERAMA")))
+        return _Cookie(_Reply(names_len=len(names), names=names))
+
+    def GetKeyboardMapping(self, first_keycode, count):
+        keysyms = [
+            self.conn.keymap.get(i, 0)
+            for i in range(first_keycode, first_keycode + count)
+        ]
+        return _Cookie(_Reply(keysyms_per_keycode=1, keysyms=keysyms))
+
+    def GetModifierMapping(self):
+        keycodes = [0] * len(xcbq.ModMapOrder)
+        keycodes[xcbq.ModMapOrder.index("mod2")] = self.conn.numlock
+        return _Cookie(_Reply(keycodes_per_modifier=1, keycodes=keycodes))
+
+    def QueryTextExtents(self, font, string_len, string):
+        return _Cookie(_Reply(
+            draw_direction=0, font_ascent=0, font_descent=0,
+            overall_ascent=0, overall_descent=0, overall_width=0,
+            overall_left=0, overall_right=0
+        ))
+
+
+class _CountingCore:
+    """
+        The core requests as seen by Qtile, counted by name.
+    """
+    def __init__(self, core, requests):
+        self.core = core
+        self.requests = requests
+
+    def __getattr__(self, name):
+        self.requests[name] += 1
+        return getattr(self.core, name)
+
+
+class _Xinerama:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def QueryScreens(self):
+        return _Cookie(_Reply(screen_info=[
+            _Reply(x_org=x, y_org=y, width=w, height=h)
+            for x, y, w, h in self.conn.screens
+        ]))
+
+
+class FakeConnection:
+    """
+        A stand-in for an xpyb connection backed by an in-memory window
+        tree. screens is a list of (x, y, width, height) tuples; with more
+        than one, they are reported through Xinerama. The requests made
+        through core are counted by name in requests.
+    """
+    pref_screen = 0
+
+    def __init__(self, screens=((0, 0, 800, 600),)):
+        self.screens = list(screens)
+        self.requests = collections.defaultdict(int)
+        self.server = _Core(self)
+        self.core = _CountingCore(self.server, self.requests)
+        self.nextId = 0x200000
+        self.events = collections.deque()
+        self.sent = []
+        self.selections = {}
+
+        # Becomes readable when events are queued, so that the fake can be
+        # watched by the main loop like a real connection.
+        self.rfd, self.wfd = os.pipe()
+        for fd in (self.rfd, self.wfd):
+            fcntl.fcntl(fd, fcntl.F_SETFL, os.O_NONBLOCK)
+
+        self.atoms = {}
+        self.atomNames = {}
+        for name in dir(xcb.xproto.Atom):
+            if not name.startswith("_"):
+                atom = getattr(xcb.xproto.Atom, name)
+                self.atoms[name] = atom
+                self.atomNames[atom] = name
+        self.nextAtom = max(self.atomNames) + 1
+
+        self.keymap = {}
+        names = _PREFERRED_KEYS + sorted(
+            k for k in xcbq.keysyms if k not in _PREFERRED_KEYS
+        )
+        for code, name in zip(range(MIN_KEYCODE, MAX_KEYCODE + 1), names):
+            self.keymap[code] = xcbq.keysyms[name]
+        self.numlock = MIN_KEYCODE
+
+        width = max(x + w for x, y, w, h in self.screens)
+        height = max(y + h for x, y, w, h in self.screens)
+        self.root = self.generate_id()
+        self.windows = {
+            self.root: FakeWindow(self.root, None, 0, 0, width, height)
+        }
+        self.windows[self.root].mapped = True
+        self.focus = self.root
+        self.setup = _Reply(
+            min_keycode=MIN_KEYCODE,
+            max_keycode=MAX_KEYCODE,
+            roots=[_Reply(
+                root=self.root,
+                default_colormap=COLORMAP,
+                white_pixel=0xffffff,
+                black_pixel=0,
+                width_in_pixels=width,
+                height_in_pixels=height,
+                root_visual=ROOT_VISUAL,
+                root_depth=24,
+                allowed_depths=[_Reply(depth=24, visuals=[
+                    _Reply(
+                        visual_id=ROOT_VISUAL, _class=4,
+                        bits_per_rgb_value=8, colormap_entries=256,
+                        red_mask=0xff0000, green_mask=0xff00, blue_mask=0xff
+                    )
+                ])],
+            )],
+        )
+
+    def __call__(self, key):
+        if key is xcb.xinerama.key:
+            return _Xinerama(self)
+        raise ValueError("Unsupported extension: %r" % key)
+
+    def get_setup(self):
+        return self.setup
+
+    def generate_id(self):
+        self.nextId += 1
+        return self.nextId
+
+    def get_file_descriptor(self):
+        return self.rfd
+
+    def flush(self):
+        pass
+
+    def poll_for_event(self):
+        if self.events:
+            return self.events.popleft()
+        try:
+            while os.read(self.rfd, 4096):
+                pass
+        except OSError, v:
+            if v.errno != errno.EAGAIN:
+                raise
+
+    # Server side
+
+    def intern(self, name, only_if_exists=False):
+        if name not in self.atoms:
+            if only_if_exists:
+                return 0
+            self.atoms[name] = self.nextAtom
+            self.atomNames[self.nextAtom] = name
+            self.nextAtom += 1
+        return self.atoms[name]
+
+    def queue(self, name, **fields):
+        if not self.events:
+            os.write(self.wfd, "x")
+        self.events.append(make_event(name, **fields))
+
+    def inject(self, event):
+        """
+            Queue an event, as built by make_event.
+        """
+        if not self.events:
+            os.write(self.wfd, "x")
+        self.events.append(event)
+
+    def notify(self, name, w, **fields):
+        """
+            Send a structure event about window w to w itself and to its
+            parent, if they selected it.
+        """
+        if w.event_mask & EventMask.StructureNotify:
+            self.queue(name, event=w.wid, window=w.wid, **fields)
+        p = self.windows.get(w.parent)
+        if p is not None and p.event_mask & EventMask.SubstructureNotify:
+            self.queue(name, event=p.wid, window=w.wid, **fields)
+
+    def redirected(self, w):
+        """
+            Is a request of a client on window w redirected to the window
+            manager?
+        """
+        p = self.windows.get(w.parent)
+        return not w.override_redirect and p is not None and \
+            p.event_mask & EventMask.SubstructureRedirect
+
+    def viewable(self, w):
+        while w is not None:
+            if not w.mapped:
+                return False
+            w = self.windows.get(w.parent)
+        return True
+
+    def destroy(self, w):
+        for i in list(w.children):
+            self.destroy(self.windows[i])
+        self.notify("DestroyNotify", w)
+        del self.windows[w.wid]
+        self.windows[w.parent].children.remove(w.wid)
+        if self.focus == w.wid:
+            self.focus = self.root
+
+    def configure(self, w, values):
+        if ConfigWindow.X in values:
+            w.x = values[ConfigWindow.X]
+        if ConfigWindow.Y in values:
+            w.y = values[ConfigWindow.Y]
+        if ConfigWindow.Width in values:
+            w.width = values[ConfigWindow.Width]
+        if ConfigWindow.Height in values:
+            w.height = values[ConfigWindow.Height]
+        if ConfigWindow.BorderWidth in values:
+            w.border_width = values[ConfigWindow.BorderWidth]
+        if ConfigWindow.StackMode in values:
+            self.restack(
+                w, values[ConfigWindow.StackMode],
+                values.get(ConfigWindow.Sibling)
+            )
+        siblings = self.windows[w.parent].children
+        i = siblings.index(w.wid)
+        self.notify(
+            "ConfigureNotify", w,
+            above_sibling=siblings[i - 1] if i else 0,
+            x=w.x, y=w.y, width=w.width, height=w.height,
+            border_width=w.border_width,
+            override_redirect=w.override_redirect
+        )
+
+    def restack(self, w, mode, sibling=None):
+        siblings = self.windows[w.parent].children
+        siblings.remove(w.wid)
+        if mode == StackMode.Above:
+            if sibling in siblings:
+                siblings.insert(siblings.index(sibling) + 1, w.wid)
+            else:
+                siblings.append(w.wid)
+        elif mode == StackMode.Below:
+            if sibling in siblings:
+                siblings.insert(siblings.index(sibling), w.wid)
+            else:
+                siblings.insert(0, w.wid)
+        else:
+            siblings.append(w.wid)
+
+    def change_property(self, w, prop, type, format, data):
+        w.properties[prop] = (type, format, data)
+        self.property_notify(w, prop, xcb.xproto.Property.NewValue)
+
+    def property_notify(self, w, prop, state):
+        if w.event_mask & EventMask.PropertyChange:
+            self.queue("PropertyNotify", window=w.wid, atom=prop, state=state)
+
+    # Client side
+
+    def create_client(self, x=0, y=0, width=100, height=100,
+                      name=None, wm_class=None, wm_type=None,
+                      override_redirect=False):
+        """
+            Create a top-level window as an application would, without
+            mapping it. Returns its id.
+        """
+        wid = self.generate_id()
+        mask = CW.OverrideRedirect if override_redirect else 0
+        values = [1] if override_redirect else []
+        self.server.CreateWindow(
+            24, wid, self.root, x, y, width, height, 0,
+            xcb.xproto.WindowClass.InputOutput, ROOT_VISUAL, mask, values
+        )
+        if name is not None:
+            self.set_client_property(wid, "WM_NAME", name)
+            self.set_client_property(wid, "_NET_WM_NAME", name)
+        if wm_class is not None:
+            self.set_client_property(
+                wid, "WM_CLASS", "\0".join(wm_class) + "\0"
+            )
+        if wm_type is not None:
+            self.set_client_property(
+                wid, "_NET_WM_WINDOW_TYPE",
+                [self.intern("_NET_WM_WINDOW_TYPE_" + wm_type.upper())]
+            )
+        return wid
+
+    def set_client_property(self, wid, name, value, type=None, format=None):
+        """
+            Set a property of a client window. Properties known to xcbq get
+            its type and format, others default to an 8 bit string.
+            Values for 32 bit properties are lists of integers.
+        """
+        if type is None:
+            type, format = xcbq.PropertyMap.get(name, ("STRING", 8))
+        if format == 32:
+            value = struct.pack("=%dL" % len(value), *value)
+        self.change_property(
+            self.windows[wid], self.intern(name), self.intern(type), format,
+            value
+        )
+
+    def map_client(self, wid):
+        """
+            Map a client window, through the window manager if it
+            redirects map requests.
+        """
+        w = self.windows[wid]
+        if self.redirected(w):
+            self.queue("MapRequest", parent=w.parent, window=wid)
+        else:
+            self.server.MapWindow(wid)
+
+    def configure_client(self, wid, **kwargs):
+        """
+            Ask for a new geometry for a client window, through the window
+            manager if it redirects configure requests. Arguments are the
+            same as for xcbq.Window.configure.
+        """
+        w = self.windows[wid]
+        mask, values = xcbq.ConfigureMasks(**kwargs)
+        if self.redirected(w):
+            values = _masked(mask, values)
+            self.queue(
+                "ConfigureRequest", parent=w.parent, window=wid,
+                value_mask=mask,
+                x=values.get(ConfigWindow.X, w.x),
+                y=values.get(ConfigWindow.Y, w.y),
+                width=values.get(ConfigWindow.Width, w.width),
+                height=values.get(ConfigWindow.Height, w.height),
+                border_width=values.get(
+                    ConfigWindow.BorderWidth, w.border_width
+                ),
+                sibling=values.get(ConfigWindow.Sibling, 0),
+                stack_mode=values.get(ConfigWindow.StackMode, 0)
+            )
+        else:
+            self.server.ConfigureWindow(wid, mask, values)
+
+    def unmap_client(self, wid):
+        self.server.UnmapWindow(wid)
+
+    def destroy_client(self, wid):
+        self.server.DestroyWindow(wid)
+
+
+def connect(screens=((0, 0, 800, 600),)):
+    """
+        Returns an xcbq.Connection to a new fake server, which is available
+        as its fake attribute.
+    """
+    fake = FakeConnection(screens)
+    conn = xcbq.Connection(None, fake)
+    conn.fake = fake
+    return conn
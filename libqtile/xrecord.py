@@ -0,0 +1,503 @@
+# Copyright (c) 2008, Aldo Cortesi. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    Recording and replay of X sessions.
+
+    A Recorder wraps the xpyb connection of a running Qtile and writes the
+    events polled in _xpoll, and the replies to the requests made through
+    xcbq, to a file. A recording can then be replayed, without an X server,
+    into a Qtile instance whose connection answers requests from the
+    recording.
+
+    The file starts with MAGIC, followed by records made of a header
+    (kind, key, class, length) and length bytes of data:
+
+        - NAME: defines a name (class path, request name or extension)
+          under id key, the data is the name
+        - SETUP: the connection setup, the data is its wire format
+        - EVENT: an event, the data is its wire format
+        - BATCH: marks the end of the events drained by one _xpoll
+        - REPLY: the reply to request key, the data is its wire format
+        - ERROR: request key failed with the exception of class class
+
+    Request keys are the request name, like "core.GetProperty", followed by
+    a space and the repr of its identifying arguments, see _args.
+"""
+import os
+import struct
+import sys
+import tempfile
+import time
+import xcb
+import xcb.randr
+import xcb.xinerama
+
+import config
+import xcbq
+
+MAGIC = "QXR1"
+HEADER = struct.Struct("!cHHI")
+
+NAME = "N"
+SETUP = "S"
+EVENT = "E"
+BATCH = "B"
+REPLY = "R"
+ERROR = "X"
+
+
+class ReplayError(Exception):
+    pass
+
+
+def _extension(key):
+    if key is xcb.xinerama.key:
+        return "xinerama"
+    elif key is xcb.randr.key:
+        return "randr"
+    raise ValueError("Unsupported extension: %r" % key)
+
+
+def _path(cls):
+    return "%s.%s" % (cls.__module__, cls.__name__)
+
+
+def _resolve(path):
+    module, name = path.rsplit(".", 1)
+    __import__(module)
+    return getattr(sys.modules[module], name)
+
+
+def _args(args, generated):
+    """
+        The identifying arguments of a request, such as windows, atoms and
+        properties: its integer and string arguments, as a string. Ids made
+        with generate_id differ between the recorded and the replayed
+        session, so they are replaced by their index in generated.
+    """
+    key = []
+    for a in args:
+        if isinstance(a, unicode):
+            key.append(a.encode("utf-8"))
+        elif isinstance(a, str):
+            key.append(a)
+        elif isinstance(a, (int, long)):
+            if a in generated:
+                key.append("#%d" % generated[a])
+            else:
+                key.append(int(a))
+    return repr(tuple(key))
+
+
+def _load(cls, data):
+    if issubclass(cls, xcb.Struct):
+        return cls(data, 0, len(data))
+    return cls(data)
+
+
+class Writer:
+    def __init__(self, fname):
+        self.fp = open(fname, "wb")
+        self.fp.write(MAGIC)
+        self.names = {}
+
+    def _id(self, name):
+        try:
+            return self.names[name]
+        except KeyError:
+            i = self.names[name] = len(self.names) + 1
+            self.fp.write(HEADER.pack(NAME, i, 0, len(name)))
+            self.fp.write(name)
+            return i
+
+    def write(self, kind, key=None, obj=None, cls=None):
+        data = "" if obj is None else str(buffer(obj))
+        if cls is None and obj is not None:
+            cls = obj.__class__
+        self.fp.write(HEADER.pack(
+            kind,
+            self._id(key) if key else 0,
+            self._id(_path(cls)) if cls else 0,
+            len(data)
+        ))
+        self.fp.write(data)
+
+    def close(self):
+        self.fp.close()
+
+
+class MemoryWriter:
+    """
+        Keeps the records in memory instead of writing them to a file, for
+        connections whose replies can't be written out, like libqtile.xfake
+        ones. Records are (kind, key, obj) tuples, with the exception class
+        as obj for errors.
+    """
+    def __init__(self):
+        self.records = []
+
+    def write(self, kind, key=None, obj=None, cls=None):
+        self.records.append((kind, key, cls if kind == ERROR else obj))
+
+    def close(self):
+        pass
+
+
+def read(fname):
+    """
+        Yields (kind, key, class, data) tuples for the records of a file.
+    """
+    fp = open(fname, "rb")
+    try:
+        if fp.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a Qtile X recording: %s" % fname)
+        names = {0: None}
+        while True:
+            header = fp.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return
+            kind, key, cls, length = HEADER.unpack(header)
+            data = fp.read(length)
+            if kind == NAME:
+                names[key] = data
+            else:
+                yield kind, names[key], names[cls], data
+    finally:
+        fp.close()
+
+
+class _RecordingCookie(xcbq._Wrapper):
+    def __init__(self, cookie, recorder, request):
+        # request is the request key, the name and identifying arguments.
+        xcbq._Wrapper.__init__(self, cookie)
+        self.recorder = recorder
+        self.request = request
+
+    def reply(self):
+        try:
+            r = self.wrapped.reply()
+        except Exception, v:
+            self.recorder.writer.write(ERROR, self.request, cls=v.__class__)
+            raise
+        self.recorder.writer.write(REPLY, self.request, r)
+        return r
+
+
+class _RecordingExtension(xcbq._Wrapper):
+    def __init__(self, ext, recorder, name):
+        xcbq._Wrapper.__init__(self, ext)
+        self.recorder = recorder
+        self.name = name
+
+    def __getattr__(self, x):
+        request = getattr(self.wrapped, x)
+        if not callable(request):
+            return request
+        name = "%s.%s" % (self.name, x)
+        recorder = self.recorder
+
+        def call(*args):
+            return _RecordingCookie(
+                request(*args),
+                recorder,
+                "%s %s" % (name, _args(args, recorder.generated))
+            )
+        return call
+
+
+class _RecordingConnection(xcbq._Wrapper):
+    def __init__(self, conn, recorder):
+        xcbq._Wrapper.__init__(self, conn)
+        self.recorder = recorder
+        self.core = _RecordingExtension(conn.core, recorder, "core")
+
+    def __call__(self, key):
+        return _RecordingExtension(
+            self.wrapped(key), self.recorder, _extension(key)
+        )
+
+    def generate_id(self):
+        i = self.wrapped.generate_id()
+        self.recorder.generated[i] = len(self.recorder.generated)
+        return i
+
+    def get_setup(self):
+        setup = self.wrapped.get_setup()
+        self.recorder.writer.write(SETUP, None, setup)
+        return setup
+
+
+class Recorder:
+    """
+        Records a session to the file fname, or to writer if it is given.
+    """
+    def __init__(self, fname, writer=None):
+        self.writer = writer or Writer(fname)
+        self.generated = {}
+
+    def wrap(self, conn):
+        """
+            Returns a wrapper around the xpyb connection conn that records
+            the replies it receives.
+        """
+        return _RecordingConnection(conn, self)
+
+    def event(self, e):
+        self.writer.write(EVENT, None, e)
+
+    def batch(self):
+        self.writer.write(BATCH)
+
+    def close(self):
+        self.writer.close()
+
+
+class _ReplayCookie:
+    def __init__(self, conn, request, args):
+        self.conn = conn
+        self.request = request
+        self.args = args
+
+    def reply(self):
+        return self.conn.reply(self.request, self.args)
+
+    def check(self):
+        pass
+
+
+class _ReplayExtension:
+    def __init__(self, conn, name):
+        self.conn = conn
+        self.name = name
+
+    def __getattr__(self, x):
+        request = "%s.%s" % (self.name, x)
+        conn = self.conn
+        return lambda *args: _ReplayCookie(
+            conn, request, _args(args, conn.generated)
+        )
+
+
+class ReplayConnection:
+    """
+        A stand-in for an xpyb connection that answers requests with the
+        recorded replies, given as (request, args, reply) tuples in the
+        order they were received, args being _args of the request's
+        arguments or None if unknown.
+
+        Each request is answered with the next unused reply recorded for
+        the same request and arguments. If there is none, as when the code
+        being measured makes requests the recorded session didn't, the next
+        unused reply to a request of the same name is used instead, or the
+        last reply to one once they are all used. Those fallbacks are
+        counted in misses, except for replies recorded without arguments,
+        which can only be matched by name.
+    """
+    pref_screen = 0
+
+    def __init__(self, setup, replies):
+        self.setup = setup
+        self.exact = {}
+        self.byName = {}
+        for request, args, r in replies:
+            # Entries are shared by both tables, and marked once used.
+            entry = [r, False, args]
+            self.exact.setdefault((request, args), []).append(entry)
+            self.byName.setdefault(request, []).append(entry)
+        self.last = {}
+        self.misses = {}
+        self.generated = {}
+        self.nextId = 0x1000000
+        self.core = _ReplayExtension(self, "core")
+
+    def __call__(self, key):
+        return _ReplayExtension(self, _extension(key))
+
+    def _next(self, queue):
+        while queue:
+            entry = queue.pop(0)
+            if not entry[1]:
+                entry[1] = True
+                return entry
+        return None
+
+    def _miss(self, request):
+        self.misses[request] = self.misses.get(request, 0) + 1
+
+    def reply(self, request, args=None):
+        entry = self._next(self.exact.get((request, args)))
+        if entry is None:
+            entry = self._next(self.byName.get(request))
+            if entry is None:
+                entry = self.last.get(request)
+                if entry is None:
+                    raise ReplayError("No recorded reply for %s" % request)
+                self._miss(request)
+            elif entry[2] is not None:
+                self._miss(request)
+        self.last[request] = entry
+        r = entry[0]
+        if isinstance(r, type):
+            raise r()
+        return r
+
+    def get_setup(self):
+        return self.setup
+
+    def generate_id(self):
+        self.nextId += 1
+        self.generated[self.nextId] = len(self.generated)
+        return self.nextId
+
+    def poll_for_event(self):
+        return None
+
+    def flush(self):
+        pass
+
+
+def load(fname):
+    """
+        Read a recording. Returns a (connection, batches) tuple: a
+        ReplayConnection, and the recorded events grouped by _xpoll batch.
+    """
+    classes = {}
+
+    def records():
+        for kind, key, cls, data in read(fname):
+            if cls is not None and cls not in classes:
+                classes[cls] = _resolve(cls)
+            if kind == ERROR:
+                yield kind, key, classes[cls]
+            elif kind in (SETUP, EVENT, REPLY):
+                yield kind, key, _load(classes[cls], data)
+            else:
+                yield kind, key, None
+    conn, batches = build(records())
+    if conn.setup is None:
+        raise ValueError("Recording has no connection setup: %s" % fname)
+    return conn, batches
+
+
+def build(records):
+    """
+        Make a (connection, batches) tuple, as load does, from (kind, key,
+        obj) records like those of MemoryWriter.
+    """
+    setup = None
+    replies = []
+    batches = []
+    batch = []
+    for kind, key, obj in records:
+        if kind == SETUP:
+            setup = obj
+        elif kind == EVENT:
+            batch.append(obj)
+        elif kind == BATCH:
+            batches.append(batch)
+            batch = []
+        elif kind in (REPLY, ERROR):
+            # Recordings made before requests were keyed by their
+            # arguments only have the request name.
+            request, _, args = key.partition(" ")
+            replies.append((request, args or None, obj))
+    if batch:
+        batches.append(batch)
+    return ReplayConnection(setup, replies), batches
+
+
+def replay(fname, qtileconfig, log=None):
+    """
+        Replay the recording fname into a Qtile instance configured with
+        config. Bars are not set up, since drawing needs a real X
+        connection. Returns a dictionary with the number of events, the
+        time spent handling them, the handler statistics of
+        Qtile.cmd_event_stats, and the requests that had no matching
+        recorded reply.
+    """
+    conn, batches = load(fname)
+    return play(conn, batches, qtileconfig, log)
+
+
+def play(conn, batches, qtileconfig, log=None):
+    """
+        Replay the batches of events into a Qtile instance on the
+        ReplayConnection conn, see replay.
+    """
+    import manager
+
+    qtileconfig.screens = [config.Screen() for _ in qtileconfig.screens]
+    sockdir = tempfile.mkdtemp()
+    sock = os.path.join(sockdir, "qtile-replay")
+    try:
+        q = manager.Qtile(
+            qtileconfig,
+            displayName=":replay",
+            fname=sock,
+            no_spawn=True,
+            log=log,
+            conn=xcbq.Connection(None, conn)
+        )
+        q.eventStats.reset()
+        count = 0
+        start = time.time()
+        for events in batches:
+            count += len(events)
+            q._handle_events(events)
+            q.flushLayout()
+        elapsed = time.time() - start
+        return dict(
+            events=count,
+            seconds=elapsed,
+            stats=q.cmd_event_stats(),
+            misses=dict(conn.misses),
+        )
+    finally:
+        if os.path.exists(sock):
+            os.unlink(sock)
+        os.rmdir(sockdir)
+
+
+def report(result, out=sys.stdout):
+    """
+        Print the result of replay as a table of handlers, slowest first.
+    """
+    seconds = result["seconds"]
+    rate = result["events"] / seconds if seconds else 0
+    print >> out, "%d events in %.3fs (%.0f events/s)" % (
+        result["events"], seconds, rate
+    )
+    rows = []
+    for kind, names in result["stats"]["events"].items():
+        for name, h in names.items():
+            rows.append((h["total"], kind, name, h))
+    rows.sort(reverse=True)
+    print >> out, "%-10s %-24s %8s %10s %10s %10s" % (
+        "target", "event", "count", "total ms", "mean ms", "max ms"
+    )
+    for total, kind, name, h in rows:
+        print >> out, "%-10s %-24s %8d %10.2f %10.3f %10.3f" % (
+            kind, name, h["count"], total, total / h["count"], h["max"]
+        )
+    if result["misses"]:
+        print >> out, "Requests without a matching recorded reply:"
+        for request, n in sorted(result["misses"].items()):
+            print >> out, "    %s: %d" % (request, n)
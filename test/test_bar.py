@@ -1,11 +1,13 @@
 import time
 import libqtile.layout
 import libqtile.bar
+import libqtile.drawer
 import libqtile.widget
 import libqtile.manager
 import libqtile.config
 import libqtile.confreader
 from utils import Xephyr
+from test_drawer import ImageDrawer
 
 
 class GBConfig:
@@ -121,6 +123,72 @@ def test_textbox(self):
     time.sleep(3)
 
 
+class DrawConfig(GBConfig):
+    screens = [
+        libqtile.config.Screen(
+            top=libqtile.bar.Bar(
+                [
+                    libqtile.widget.TextBox(name="left", text="left"),
+                    libqtile.widget.TextBox(name="text", text="text"),
+                    libqtile.widget.TextBox(name="right", text="right"),
+                ],
+                50
+            ),
+        )
+    ]
+
+
+@Xephyr(True, DrawConfig())
+def test_draw_only_changed(self):
+    # The same text keeps the same width, only the widget is redrawn.
+    self.c.bar["top"].draw_stats(reset=True)
+    self.c.widget["text"].update("text")
+    time.sleep(1)
+    assert self.c.bar["top"].draw_stats(reset=True) == \
+        dict(drawn=1, avoided=2)
+
+    # A wider text moves the widget after it, which is redrawn too.
+    self.c.widget["text"].update("a longer string than before")
+    time.sleep(1)
+    assert self.c.bar["top"].draw_stats() == dict(drawn=2, avoided=1)
+
+
+def test_merge_spans():
+    b = libqtile.bar.Bar([], 10)
+    assert b._merge([(0, 10), (10, 5), (20, 5), (25, 0), (30, 0)]) == \
+        [(0, 15), (20, 5)]
+
+
+class CopyingWidget:
+    """
+        Draws itself and copies its region to the window, like widgets do.
+    """
+    width_type = libqtile.bar.STATIC
+
+    def __init__(self, width, parent):
+        self.width = width
+        self.drawer = libqtile.drawer.SubDrawer(parent)
+
+    def draw(self):
+        self.drawer.clear("ff0000")
+        self.drawer.draw(self.offset, self.width)
+
+
+def test_hold_copies():
+    parent = ImageDrawer(100, 10)
+    b = libqtile.bar.Bar(
+        [CopyingWidget(10, parent), CopyingWidget(20, parent)], 10
+    )
+    b.screen = type("Screen", (), dict(top=b, bottom=None, width=100))()
+    b.drawer = parent
+    b._actual_draw()
+    # The widgets' copies are left to the bar, which makes a single one.
+    assert parent.qtile.core.copies == [(0, 100)]
+    assert not parent.holdCopies
+    b.widgets[1].draw()
+    assert parent.qtile.core.copies == [(0, 100), (10, 20)]
+
+
 @Xephyr(True, GBConfig())
 def test_textbox_errors(self):
     self.c.widget["text"].update(None)
@@ -0,0 +1,133 @@
+import cairo
+import libqtile.drawer
+
+
+def test_extent_cache():
+    c = libqtile.drawer.ExtentCache(size=2)
+    measured = []
+
+    def measure(size):
+        def f():
+            measured.append(size)
+            return size
+        return f
+
+    assert c.get(("a", "sans", 10), measure((5, 10))) == (5, 10)
+    assert c.get(("a", "sans", 10), measure((0, 0))) == (5, 10)
+    assert c.get(("a", "sans", 12), measure((6, 12))) == (6, 12)
+    assert measured == [(5, 10), (6, 12)]
+    assert (c.hits, c.misses) == (1, 2)
+
+    # The least recently used entry is dropped.
+    c.get(("a", "sans", 10), measure((0, 0)))
+    c.get(("b", "sans", 10), measure((5, 10)))
+    assert ("a", "sans", 12) not in c.sizes
+    assert ("a", "sans", 10) in c.sizes
+
+
+class FakeSurface:
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
+
+
+def test_surface_cache():
+    c = libqtile.drawer.SurfaceCache(maxPixels=100)
+
+    def render(width, height):
+        return lambda: (FakeSurface(width, height), 0, 0)
+
+    a = c.get("a", render(5, 10))
+    assert c.get("a", render(1, 1)) is a
+    c.get("b", render(5, 8))
+    assert c.pixels == 90
+
+    # Surfaces are dropped, least recently used first, to stay under
+    # maxPixels.
+    c.get("c", render(2, 10))
+    assert "a" not in c.surfaces
+    assert c.pixels == 60
+
+    # Surfaces bigger than the whole cache aren't kept.
+    c.get("d", render(20, 10))
+    assert "d" not in c.surfaces
+    assert (c.hits, c.misses) == (1, 4)
+
+
+def test_pattern_cache_colours():
+    c = libqtile.drawer.PatternCache(size=2)
+    red = c.rgba("#ff0000")
+    assert red == (1.0, 0.0, 0.0, 1)
+    assert c.rgba("#ff0000") is red
+    assert c.rgba((0, 0, 255, 0.5)) == (0.0, 0.0, 1.0, 0.5)
+
+    # Past size colours, the table starts over.
+    c.rgba("00ff00")
+    assert list(c.colours) == ["00ff00"]
+
+
+def test_pattern_cache_list_stops():
+    c = libqtile.drawer.PatternCache()
+    assert c.rgba([0, 0, 255]) == (0.0, 0.0, 1.0, 1)
+    colours = [[255, 0, 0], [0, 0, 255]]
+    g = c.gradient(colours, 10)
+    assert c.gradient([[255, 0, 0], [0, 0, 255]], 10) is g
+    assert c.gradient(colours, 20) is not g
+
+
+class FakeCore:
+    def __init__(self):
+        self.copies = []
+
+    def CopyArea(self, src, dst, gc, srcx, srcy, dstx, dsty, width, height):
+        self.copies.append((srcx, width))
+
+
+class FakeQtile:
+    def __init__(self):
+        self.core = FakeCore()
+        conn = type("Connection", (), {})()
+        conn.conn = type("XConnection", (), {})()
+        conn.conn.core = self.core
+        self.conn = conn
+
+
+class ImageDrawer(libqtile.drawer.Drawer):
+    """
+        A Drawer drawing into an image surface instead of a pixmap, whose
+        copies to the window are recorded in qtile.core.copies.
+    """
+    def __init__(self, width, height):
+        self.qtile = FakeQtile()
+        self.wid, self.width, self.height = 1, width, height
+        self.pixmap, self.gc = 2, 3
+        self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        self.ctx = self.new_ctx()
+
+    def painted(self):
+        """
+            The columns of the first row that have been drawn to.
+        """
+        self.surface.flush()
+        data = str(self.surface.get_data())
+        return [
+            x for x in range(self.width)
+            if data[x * 4:x * 4 + 4] != "\0\0\0\0"
+        ]
+
+
+def test_subdrawer_region():
+    parent = ImageDrawer(40, 5)
+    sub = libqtile.drawer.SubDrawer(parent)
+    sub.set_region(10, 20)
+    # Drawing is translated to the region, and clipped to it.
+    sub.clear("ff0000")
+    assert parent.painted() == range(10, 30)
+    sub.set_region(30, 5)
+    sub.fillrect(0, 0, 40, 5)
+    assert parent.painted() == range(10, 35)
@@ -0,0 +1,65 @@
+import socket
+import libqtile.eventloop
+import libqtile.utils
+
+
+def backends():
+    for name, cls in sorted(libqtile.eventloop.BACKENDS.items()):
+        try:
+            yield name, cls()
+        except libqtile.utils.QtileError:
+            continue
+
+
+def run(loop, done):
+    for _ in range(100):
+        if done():
+            return
+        loop.iteration()
+    raise AssertionError("main loop did not run callbacks")
+
+
+def test_unknown_backend():
+    try:
+        libqtile.eventloop.init("nonexistent")
+    except libqtile.utils.QtileError:
+        pass
+    else:
+        raise AssertionError("unknown main loop accepted")
+
+
+def test_timeout_repeats_until_false():
+    for name, loop in backends():
+        calls = []
+
+        def tick():
+            calls.append(1)
+            return len(calls) < 3
+        loop.timeout_add(0.01, tick)
+        run(loop, lambda: len(calls) == 3)
+
+
+def test_idle_and_remove():
+    for name, loop in backends():
+        calls = []
+        tag = loop.timeout_add(0.01, calls.append, "timer")
+        loop.source_remove(tag)
+        loop.idle_add(calls.append, "idle")
+        run(loop, lambda: calls)
+        assert calls == ["idle"]
+
+
+def test_reader():
+    for name, loop in backends():
+        a, b = socket.socketpair()
+        got = []
+
+        def read():
+            got.append(b.recv(10))
+            return False
+        loop.add_reader(b, read)
+        a.send("x")
+        run(loop, lambda: got)
+        assert got == ["x"]
+        a.close()
+        b.close()
@@ -0,0 +1,109 @@
+import random
+import libqtile.config
+import libqtile.layout.geometry as geometry
+
+
+def rect(x, y, width, height):
+    return libqtile.config.ScreenRect(x, y, width, height)
+
+
+def both(f, jobs):
+    """
+        The results of f with the pure Python code, and with NumPy if it is
+        installed.
+    """
+    threshold = geometry.numpy_threshold
+    try:
+        geometry.numpy_threshold = float("inf")
+        python = f(jobs)
+        if geometry.numpy is None:
+            return python, python
+        geometry.numpy_threshold = 0
+        return python, f(jobs)
+    finally:
+        geometry.numpy_threshold = threshold
+
+
+def test_grid():
+    python, vectorized = both(geometry.grid, [
+        (3, 2, rect(0, 0, 800, 600), 1),
+        (0, 2, rect(0, 0, 800, 600), 1),
+        (1, 2, rect(800, 0, 1024, 768), 0),
+    ])
+    assert python == vectorized == [
+        [(0, 0, 398, 298), (400, 0, 398, 298), (0, 300, 398, 298)],
+        [],
+        [(800, 0, 512, 768)],
+    ]
+
+
+def test_tile():
+    python, vectorized = both(geometry.tile, [
+        (3, 1, 0.6, False, 0, rect(0, 0, 800, 600), 1),
+        (1, 1, 0.6, True, 2, rect(0, 0, 800, 600), 0),
+    ])
+    assert python == vectorized == [
+        [(0, 0, 478, 598), (480, 0, 318, 298), (480, 300, 318, 298)],
+        [(2, 2, 796, 596)],
+    ]
+
+
+def test_rows():
+    python, vectorized = both(geometry.rows, [
+        (3, rect(10, 20, 400, 600), 1),
+    ])
+    assert python == vectorized == [
+        [(10, 20, 398, 198), (10, 220, 398, 198), (10, 420, 398, 198)],
+    ]
+
+
+def test_stacked():
+    python, vectorized = both(geometry.stacked, [
+        ([0.25, 0.75], rect(0, 0, 400, 600), 1),
+        ([], rect(0, 0, 400, 600), 1),
+    ])
+    assert python == vectorized == [
+        [(0, 0, 398, 148), (0, 150, 398, 448)],
+        [],
+    ]
+
+
+def test_identical_results():
+    r = random.Random(0)
+
+    def randrect():
+        return rect(
+            r.randint(0, 2000), r.randint(0, 2000),
+            r.randint(100, 4000), r.randint(100, 4000)
+        )
+
+    def sizes(n):
+        s = [r.random() for i in range(n)]
+        return [i / sum(s) for i in s]
+
+    screens = range(4)
+    jobs = [
+        (geometry.grid, [
+            (r.randint(0, 500), r.randint(1, 8), randrect(), r.randint(0, 3))
+            for i in screens
+        ]),
+        (geometry.tile, [
+            (
+                r.randint(0, 500), r.randint(1, 4), r.random(),
+                r.choice([True, False]), r.randint(0, 5), randrect(),
+                r.randint(0, 3)
+            )
+            for i in screens
+        ]),
+        (geometry.rows, [
+            (r.randint(0, 500), randrect(), r.randint(0, 3))
+            for i in screens
+        ]),
+        (geometry.stacked, [
+            (sizes(r.randint(0, 500)), randrect(), r.randint(0, 3))
+            for i in screens
+        ]),
+    ]
+    for f, j in jobs:
+        python, vectorized = both(f, j)
+        assert python == vectorized
@@ -481,6 +481,17 @@ def test_ratiotile_add_windows_golden_ratio(self):
                 (532, 450, 266, 150)]
 
 
+def test_ratiotile_grid_cache():
+    cache = layout.ratiotile.GridCache()
+    sizes = cache.get_sizes(5, 800, 600, 0.5, False)
+    assert sizes == tuple(
+        layout.ratiotile.GridInfo(0.5, 5, 800, 600).get_sizes(800, 600)
+    )
+    assert cache.get_sizes(5, 800, 600, 0.6, False) is not sizes
+    assert cache.get_sizes(5, 800, 600, 0.5, False) is sizes
+    assert cache.get_sizes(5, 800, 600, 0.5, True) is not sizes
+
+
 @Xephyr(False, RatioTileConfig())
 def test_ratiotile_basic(self):
     self.testWindow("one")
@@ -703,3 +714,118 @@ def test_zoomy_one(self):
     assertDimensions(self, 0, 0, 600, 600)
     assertFocusPath(self, 'one', 'two', 'three')
     # TODO(pc) find a way to check size of inactive windows
+
+
+class _TreeTabWindow:
+    def __init__(self, name):
+        self.name = name
+
+
+class _TreeTabText:
+    """
+        Stands in for the panel's TextLayout, with fixed row heights.
+    """
+    height = 10
+
+    def __init__(self):
+        self.width = None
+
+    def _get_width(self):
+        return self._width
+
+    def _set_width(self, value):
+        self._width = value
+
+    def _del_width(self):
+        self._width = None
+
+    width = property(_get_width, _set_width, _del_width)
+
+    def framed(self, border_width, colour, pad_x, pad_y):
+        return self
+
+
+class _TreeTabDrawer:
+    height = 600
+
+    def __init__(self):
+        self.spans = []
+
+    def clear(self, colour):
+        pass
+
+    def draw(self, offset, width, y, height):
+        self.spans.append((y, y + height))
+
+
+class _TreeTabGroup:
+    def focus(self, win, warp):
+        pass
+
+
+def _treetab(*names):
+    """
+        A TreeTab with a fake panel, that records the rows it paints in
+        painted and the spans it copies to the panel in _drawer.spans.
+    """
+    tt = layout.TreeTab()
+    tt.group = _TreeTabGroup()
+    tt._panel = object()
+    tt._drawer = _TreeTabDrawer()
+    tt._layout = _TreeTabText()
+    tt.painted = []
+
+    def paint_row(node, top, bottom, level):
+        if isinstance(node, layout.tree.Window):
+            node = node.window.name
+        elif node is not None:
+            node = node.title
+        tt.painted.append((node, top, bottom))
+    tt._paint_row = paint_row
+    windows = [_TreeTabWindow(i) for i in names]
+    for w in windows:
+        tt.add(w)
+    tt.focus(windows[0])
+    tt.draw_panel()
+    del tt.painted[:], tt._drawer.spans[:]
+    return tt, windows
+
+
+def test_treetab_title_change():
+    tt, (one, two, three) = _treetab("one", "two", "three")
+    # The section's row is 18 pixels high, and windows' rows 14.
+    assert [r[-2:] for r in tt._rows] == \
+        [(0, 18), (18, 32), (32, 46), (46, 66)]
+    two.name = "TWO"
+    tt._client_name_updated(two)
+    assert tt.painted == [("TWO", 32, 46)]
+    assert tt._drawer.spans == [(32, 46)]
+    assert tt._rows[2][1] == "TWO"
+    # Nothing changed since.
+    tt.draw_panel()
+    assert tt.painted == [("TWO", 32, 46)]
+    assert tt._drawer.spans == [(32, 46)]
+
+
+def test_treetab_focus_change():
+    tt, (one, two, three) = _treetab("one", "two", "three")
+    tt.focus(two)
+    tt.draw_panel()
+    assert tt.painted == [("one", 18, 32), ("two", 32, 46)]
+    assert tt._drawer.spans == [(18, 46)]
+
+
+def test_treetab_remove_clears_tail():
+    tt, (one, two, three) = _treetab("one", "two", "three")
+    tt.remove(three)
+    # The last row now ends with the section, and the rest is cleared.
+    assert tt.painted == [("two", 32, 52), (None, 52, 66)]
+    assert tt._drawer.spans == [(32, 66)]
+    assert tt._rowsEnd == 52
+
+
+def test_treetab_other_group_name_change():
+    tt, windows = _treetab("one", "two")
+    tt._client_name_updated(_TreeTabWindow("other"))
+    assert tt.painted == []
+    assert tt._drawer.spans == []
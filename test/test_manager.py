@@ -608,6 +608,33 @@ def test_move_floating(self):
     assert self.c.window.info()['y'] == 20
 
 
+@Xephyr(False, TestConfig())
+def test_event_counters(self):
+    self.testWindow("one")
+    counters = self.c.event_counters()
+    assert counters["polled"] > 0
+    collapsed = sum(counters["collapsed"].values())
+    assert counters["dispatched"] + collapsed == counters["polled"]
+
+    before = self.c.event_counters(reset=True)
+    assert before["polled"] >= counters["polled"]
+    assert self.c.event_counters()["polled"] < before["polled"]
+
+
+@Xephyr(False, TestConfig())
+def test_event_stats(self):
+    self.testWindow("one")
+    stats = self.c.event_stats()
+    assert stats["events"]["root"]["MapRequest"]["count"] > 0
+    assert stats["events"]["hook"]["client_new"]["count"] > 0
+    h = stats["events"]["root"]["MapRequest"]
+    assert len(h["buckets"]) == len(stats["bounds"]) + 1
+    assert sum(h["buckets"]) == h["count"]
+
+    self.c.event_stats(reset=True)
+    assert "MapRequest" not in self.c.event_stats()["events"].get("root", {})
+
+
 @Xephyr(False, TestConfig(), randr=True)
 def test_screens(self):
     assert len(self.c.screens())
@@ -860,3 +887,16 @@ def test_minimal__(self):
     a = self.testWindow("one")
     assert len(self.c.group["d"].info()["windows"]) == 1
     self.kill(a)
+
+
+@Xephyr(False, TestConfig())
+def test_property_cache_stats(self):
+    self.testWindow("one")
+    self.c.property_cache_stats(reset=True)
+    self.c.window.match(wmclass="one")
+    self.c.window.match(wmclass="one")
+    stats = self.c.property_cache_stats()
+    assert stats["hits"] > 0
+
+    self.c.property_cache_stats(reset=True)
+    assert self.c.property_cache_stats()["hits"] == 0
@@ -0,0 +1,81 @@
+import libqtile.registry
+
+
+class FakeXWindow:
+    def __init__(self, wid, wm_class=None):
+        self.wid = wid
+        self.wm_class = wm_class
+
+    def get_wm_class(self):
+        return self.wm_class
+
+
+class FakeClient:
+    def __init__(self, wid, group=None, wm_class=None, urgent=False):
+        self.window = FakeXWindow(wid, wm_class)
+        self.group = group
+        self.hints = dict(urgent=urgent)
+
+
+def test_add_remove():
+    r = libqtile.registry.WindowRegistry()
+    a = FakeClient(1, group="a")
+    b = FakeClient(2)
+    r[1] = a
+    r[2] = b
+    assert r.get(1) is a
+    assert set(r.of_kind("other")) == set([a, b])
+    assert r.in_group("a") == [a]
+    assert r.client_list() == [1]
+
+    del r[1]
+    assert r.in_group("a") == []
+    assert r.client_list() == []
+    assert r.of_kind("other") == [b]
+    r.pop(2)
+    assert not r
+    assert r.of_kind("other") == []
+
+
+def test_regroup():
+    r = libqtile.registry.WindowRegistry()
+    a = FakeClient(1)
+    b = FakeClient(2)
+    r[1] = a
+    r[2] = b
+    b.group = "x"
+    r.regroup(b)
+    a.group = "x"
+    r.regroup(a)
+    assert r.client_list() == [2, 1]
+    a.group = "y"
+    r.regroup(a)
+    assert r.in_group("x") == [b]
+    assert r.in_group("y") == [a]
+    assert r.client_list() == [2, 1]
+    b.group = None
+    r.regroup(b)
+    assert r.client_list() == [1]
+
+    # Windows that are not registered are ignored.
+    r.regroup(FakeClient(3, group="x"))
+    assert r.in_group("x") == []
+
+
+def test_urgency_and_replace():
+    r = libqtile.registry.WindowRegistry()
+    a = FakeClient(1, group="a", urgent=True)
+    r[1] = a
+    assert r.urgent() == [a]
+    assert r.urgent("a") == [a]
+    assert r.urgent("b") == []
+    a.hints["urgent"] = False
+    r.update_urgency(a)
+    assert r.urgent() == []
+
+    # Replacing a window, as Window.static does, drops the old entries.
+    s = FakeClient(1)
+    r[1] = s
+    assert r.in_group("a") == []
+    assert r.client_list() == []
+    assert r[1] is s
@@ -86,3 +86,27 @@ def test_rgb_from_base10_tuple_with_alpha():
 # TODO: test shuffleUp, shuffleDown
 # Probably do not require a whole lot of tests, but at least one for each
 # function so that we can refactor with confidence.
+
+
+def test_latencystats_buckets():
+    s = utils.LatencyStats()
+    s.add("root", "MapRequest", 0.00005)
+    s.add("root", "MapRequest", 0.003)
+    s.add("root", "MapRequest", 1)
+    info = s.info()
+    assert info["bounds"] == list(utils.LatencyStats.bounds)
+    h = info["events"]["root"]["MapRequest"]
+    assert h["count"] == 3
+    assert h["max"] == 1000
+    assert h["buckets"][0] == 1
+    assert h["buckets"][info["bounds"].index(5)] == 1
+    assert h["buckets"][-1] == 1
+
+
+def test_latencystats_reset():
+    s = utils.LatencyStats()
+    s.add("managed", "PropertyNotify", 0.001)
+    info = s.info()
+    s.reset()
+    assert s.info()["events"] == {}
+    assert info["events"]["managed"]["PropertyNotify"]["count"] == 1
@@ -0,0 +1,461 @@
+import logging
+import os
+import struct
+import tempfile
+import xcb.xproto
+import libqtile.command
+import libqtile.config
+import libqtile.hook
+import libqtile.layout
+import libqtile.manager
+import libqtile.window
+import libqtile.xcbq
+import libqtile.xfake as xfake
+import libqtile.xrecord as xrecord
+
+
+class FakeConfig:
+    auto_fullscreen = True
+    groups = [
+        libqtile.config.Group("a"),
+        libqtile.config.Group("b"),
+    ]
+    layouts = [
+        libqtile.layout.max.Max(),
+    ]
+    floating_layout = libqtile.layout.floating.Floating()
+    keys = []
+    mouse = []
+    screens = [libqtile.config.Screen()]
+    main = None
+    follow_mouse_focus = False
+
+
+def fake_qtile(conn=None):
+    sockdir = tempfile.mkdtemp()
+    q = libqtile.manager.Qtile(
+        FakeConfig(),
+        displayName=":fake",
+        fname=os.path.join(sockdir, "qtilesocket"),
+        log=libqtile.manager.init_log(logging.CRITICAL),
+        conn=conn or xfake.connect()
+    )
+    return q, q.conn.fake
+
+
+def teardown_qtile(q):
+    os.unlink(q.fname)
+    os.rmdir(os.path.dirname(q.fname))
+    libqtile.hook.clear()
+
+
+def test_make_event():
+    e = xfake.make_event("MapRequest", parent=1, window=2)
+    assert isinstance(e, xcb.xproto.MapRequestEvent)
+    assert e.parent == 1
+    assert e.window == 2
+    e = xfake.make_event("ConfigureRequest", window=3, width=10, value_mask=4)
+    assert (e.window, e.width, e.value_mask) == (3, 10, 4)
+
+
+def test_manage_and_unmanage():
+    q, fake = fake_qtile()
+    try:
+        wid = fake.create_client(name="one", wm_class=("one", "One"))
+        fake.map_client(wid)
+        q._xpoll()
+        assert wid in q.windowMap
+        assert q.windowMap[wid].name == "one"
+        w = fake.windows[wid]
+        assert w.mapped
+        assert (w.x, w.y, w.width, w.height) == (0, 0, 800, 600)
+        assert q.cmd_windows()[0]["wm_class"] == ("one", "One")
+
+        fake.destroy_client(wid)
+        q._xpoll()
+        assert wid not in q.windowMap
+    finally:
+        teardown_qtile(q)
+
+
+def test_group_switch_hides_windows():
+    q, fake = fake_qtile()
+    try:
+        wid = fake.create_client(name="one")
+        fake.map_client(wid)
+        q._xpoll()
+        q.groupMap["b"].cmd_toscreen()
+        q._xpoll()
+        assert not fake.windows[wid].mapped
+        assert wid in q.windowMap
+        assert fake.requests["ConfigureWindow"] > 0
+    finally:
+        teardown_qtile(q)
+
+
+def test_poll_until_drained():
+    q, fake = fake_qtile()
+    try:
+        wid = fake.create_client(name="one")
+        fake.map_client(wid)
+        q._xpoll()
+        c = q.windowMap[wid]
+        seen = []
+
+        # The handler's request makes the server queue a PropertyNotify
+        # while the first batch is being handled.
+        def handler(e):
+            seen.append(e)
+            c.window.set_property("_NET_WM_NAME", "two")
+        c.handle_ClientMessage = handler
+        fake.queue(
+            "ClientMessage", format=32, window=wid,
+            type=fake.intern("QTILE_TEST"), data="\0" * 20
+        )
+        q._xpoll()
+        assert len(seen) == 1
+        assert c.name == "two"
+        assert not fake.events
+    finally:
+        teardown_qtile(q)
+
+
+def test_snapshot():
+    conn = xfake.connect()
+    fake = conn.fake
+    wid = fake.create_client(name="one", wm_class=("one", "One"))
+    w = libqtile.xcbq.Window(conn, wid)
+    with libqtile.xcbq.Snapshot(w) as s:
+        sent = fake.requests["GetProperty"]
+        assert w.get_name() == "one"
+        assert w.get_wm_class() == ("one", "One")
+        assert s.geometry.width == 100
+        assert fake.requests["GetProperty"] == sent
+        w.set_property("_NET_WM_DESKTOP", 1)
+        assert w.get_wm_desktop() == 1
+    assert w.snapshot is None
+
+
+def test_batch():
+    conn = xfake.connect()
+    fake = conn.fake
+    windows = [
+        libqtile.xcbq.Window(
+            conn, fake.create_client(wm_class=("c%d" % i, "C"))
+        )
+        for i in range(3)
+    ]
+    with conn.batch() as batch:
+        classes = [batch.add(w.fetch_wm_class()) for w in windows]
+        batch.snapshot(windows[0], ["name"])
+        assert windows[0].snapshot is not None
+    assert [c.result() for c in classes] == [
+        ("c0", "C"), ("c1", "C"), ("c2", "C")
+    ]
+    assert windows[0].snapshot is None
+
+
+def test_property_of_destroyed_window():
+    conn = xfake.connect()
+    fake = conn.fake
+    wid = fake.create_client(name="one", wm_class=("one", "One"))
+    w = libqtile.xcbq.Window(conn, wid)
+    fake.destroy_client(wid)
+    assert w.get_property("WM_NAME") is None
+    assert w.get_wm_class() is None
+    assert w.get_wm_protocols() == set()
+
+    class BadCookie:
+        def reply(self):
+            raise xcb.xproto.BadWindow(wid)
+
+    def parse(r):
+        raise AssertionError("parse called without a reply")
+
+    f = libqtile.xcbq.Future(BadCookie(), parse, (xcb.xproto.BadWindow,))
+    assert f.result() is None
+    assert f.result() is None
+
+
+def test_property_cache():
+    q, fake = fake_qtile()
+    try:
+        wid = fake.create_client(name="one", wm_class=("one", "One"))
+        fake.map_client(wid)
+        q._xpoll()
+        c = q.windowMap[wid]
+        assert c.window.get_wm_class() == ("one", "One")
+        sent = fake.requests["GetProperty"]
+        assert c.window.get_wm_class() == ("one", "One")
+        assert fake.requests["GetProperty"] == sent
+
+        fake.set_client_property(wid, "WM_CLASS", "two\0Two\0")
+        q._xpoll()
+        assert c.window.get_wm_class() == ("two", "Two")
+        assert q.windowMap.by_wm_class("Two") == [c]
+        assert q.windowMap.by_wm_class("One") == []
+        stats = q.cmd_property_cache_stats()
+        assert stats["hits"] > 0
+        assert stats["invalidations"] == 1
+    finally:
+        teardown_qtile(q)
+
+
+def test_atoms_preloaded():
+    conn = xfake.connect()
+    fake = conn.fake
+    sent = fake.requests["InternAtom"]
+    conn.atoms["_NET_SYSTEM_TRAY_S0"]
+    conn.atoms["_NET_WM_WINDOW_TYPE_DIALOG"]
+    assert fake.requests["InternAtom"] == sent
+
+    foo = fake.intern("FOO")
+    bar = fake.intern("BAR")
+    names = conn.atoms.get_names([foo, bar, foo])
+    assert names == ["FOO", "BAR", "FOO"]
+    assert fake.requests["GetAtomName"] == 2
+
+
+def test_scan_adopts_existing_windows():
+    conn = xfake.connect()
+    wids = [conn.fake.create_client(name="w%d" % i) for i in range(3)]
+    for wid in wids:
+        conn.fake.map_client(wid)
+    hidden = conn.fake.create_client(name="hidden")
+    q, fake = fake_qtile(conn)
+    try:
+        for wid in wids:
+            assert wid in q.windowMap
+            assert q.windowMap[wid].window.snapshot is None
+        assert hidden not in q.windowMap
+        assert len(q.currentGroup.windows) == 3
+        assert q.layoutHold == 0
+        assert not q.layoutPending
+    finally:
+        teardown_qtile(q)
+
+
+def test_layout_coalesced():
+    q, fake = fake_qtile()
+    try:
+        q.cmd_layout_counters(reset=True)
+        wids = [fake.create_client(name="w%d" % i) for i in range(3)]
+        for wid in wids:
+            fake.map_client(wid)
+        q._xpoll()
+        counters = q.cmd_layout_counters()
+        assert counters["performed"] < counters["requested"]
+        assert not q.layoutPending
+        for wid in wids:
+            assert wid in q.windowMap
+
+        q.currentGroup.layoutAll()
+        assert q.currentGroup in q.layoutPending
+        q.flushLayout()
+        assert not q.layoutPending
+    finally:
+        teardown_qtile(q)
+
+
+def test_place_skips_unchanged():
+    q, fake = fake_qtile()
+    try:
+        wid = fake.create_client(name="one")
+        fake.map_client(wid)
+        q._xpoll()
+        c = q.windowMap[wid]
+        c.place(10, 20, 300, 200, 1, None)
+        sent = fake.requests["ConfigureWindow"]
+        c.place(10, 20, 300, 200, 1, None)
+        assert fake.requests["ConfigureWindow"] == sent
+        c.place(10, 20, 400, 200, 1, None)
+        assert fake.requests["ConfigureWindow"] == sent + 1
+        assert fake.windows[wid].width == 400
+        c.place(10, 20, 400, 200, 1, None, twice=True)
+        assert fake.requests["ConfigureWindow"] == sent + 3
+    finally:
+        teardown_qtile(q)
+
+
+def test_layout_arrange():
+    q, fake = fake_qtile()
+    try:
+        wids = [fake.create_client(name="w%d" % i) for i in range(3)]
+        for wid in wids:
+            fake.map_client(wid)
+        q._xpoll()
+        clients = [q.windowMap[wid] for wid in wids]
+        tile = libqtile.layout.Tile().clone(q.currentGroup)
+        for c in clients[:2]:
+            tile.add(c)
+        screen = q.currentScreen.get_rect()
+        arrangement = tile.arrange(clients, screen)
+        assert [c for c, _ in arrangement] == clients
+        assert arrangement[2][1] is None
+
+        tile.layout(clients, screen)
+        for c, placement in arrangement[:2]:
+            x, y, width, height = placement[:4]
+            assert (c.x, c.y, c.width, c.height) == (x, y, width, height)
+            assert fake.windows[c.window.wid].mapped
+        assert not fake.windows[wids[2]].mapped
+    finally:
+        teardown_qtile(q)
+
+
+def test_dispatch_targets():
+    q, fake = fake_qtile()
+    try:
+        wid = fake.create_client(name="one")
+        fake.map_client(wid)
+        q._xpoll()
+        c = q.windowMap[wid]
+        internal = libqtile.window.Internal.create(q, 0, 0, 10, 10)
+        q.windowMap[internal.window.wid] = internal
+        exposed = []
+        internal.handle_Expose = exposed.append
+
+        # Each event is dispatched twice, the second time from the cached
+        # entry of its class.
+        for i in range(2):
+            other = fake.create_client(name="w%d" % i)
+            e = xfake.make_event("MapRequest", parent=q.root.wid, window=other)
+            assert q.get_target_chain(e) == [q.handle_MapRequest]
+            q._dispatch(e)
+            assert other in q.windowMap
+
+            e = xfake.make_event(
+                "PropertyNotify", window=wid, atom=fake.intern("WM_NAME"),
+                time=0, state=0
+            )
+            assert q.get_target_chain(e)[0] == c.handle_PropertyNotify
+
+            e = xfake.make_event(
+                "Expose", window=internal.window.wid, x=0, y=0, width=10,
+                height=10, count=0
+            )
+            assert q.get_target_chain(e)[0] == internal.handle_Expose
+            q._dispatch(e)
+        assert len(exposed) == 2
+    finally:
+        teardown_qtile(q)
+
+
+def test_drag_pacing():
+    q, fake = fake_qtile()
+    try:
+        moves = []
+        q.cmd_drag_probe = lambda x, y: moves.append((x, y))
+        q.dragInterval = 3600
+        q._drag = (0, 0, 5, 5, q._drag_commands([
+            libqtile.command._Call([], "drag_probe"),
+            libqtile.command._Call([], "drag_probe").when(layout="none"),
+        ]))
+
+        def motion(x, y):
+            q.handle_MotionNotify(xfake.make_event(
+                "MotionNotify", root=q.root.wid, event=q.root.wid,
+                event_x=x, event_y=y
+            ))
+
+        # The first motion is applied at once, the next ones wait for the
+        # frame interval and only the last position is applied.
+        motion(10, 10)
+        assert moves == [(15, 15)]
+        motion(20, 20)
+        motion(30, 30)
+        assert moves == [(15, 15)]
+        assert q._dragTimer is not None
+        q.eventloop.source_remove(q._dragTimer)
+        q._drag_update()
+        assert moves == [(15, 15), (35, 35)]
+        q._drag = None
+    finally:
+        teardown_qtile(q)
+
+
+def test_zoomy_arrange_single_window():
+    q, fake = fake_qtile()
+    try:
+        wid = fake.create_client(name="one")
+        fake.map_client(wid)
+        q._xpoll()
+        c = q.windowMap[wid]
+        zoomy = libqtile.layout.Zoomy(columnwidth=200).clone(q.currentGroup)
+        zoomy.add(c)
+        screen = q.currentScreen.get_rect()
+        assert zoomy.arrange([c], screen)[0][1][:4] == (0, 0, 600, 600)
+    finally:
+        teardown_qtile(q)
+
+
+def test_static_configure_request_unchanged():
+    q, fake = fake_qtile()
+    try:
+        wid = fake.create_client(name="one")
+        fake.map_client(wid)
+        q._xpoll()
+        s = q.windowMap[wid].static(0, 10, 20, 100, 50)
+        configured = fake.requests["ConfigureWindow"]
+        sent = len(fake.sent)
+        s.handle_ConfigureRequest(xfake.make_event(
+            "ConfigureRequest", window=wid, x=10, y=20, width=100,
+            height=50, value_mask=0
+        ))
+        # Nothing changed, so the client is told with a synthetic event.
+        assert fake.requests["ConfigureWindow"] == configured
+        assert len(fake.sent) == sent + 1
+        destination, event = fake.sent[-1]
+        assert destination == wid
+        assert struct.unpack_from("=BxHIIIhhHH", event) == \
+            (22, 0, wid, wid, 0, 10, 20, 100, 50)
+    finally:
+        teardown_qtile(q)
+
+
+def test_record_and_replay():
+    managed = []
+    killed = []
+
+    # Both sessions run the hooks, so that they make the same requests.
+    def subscribe():
+        libqtile.hook.subscribe.client_managed(
+            lambda c: managed.append((c.name, c.window.get_wm_class()))
+        )
+        libqtile.hook.subscribe.client_killed(
+            lambda c: killed.append(c.name)
+        )
+
+    recorder = xrecord.Recorder(None, xrecord.MemoryWriter())
+    fake = xfake.FakeConnection(((0, 0, 800, 600),))
+    conn = libqtile.xcbq.Connection(None, recorder.wrap(fake))
+    conn.fake = fake
+    subscribe()
+    q, fake = fake_qtile(conn)
+    q.recorder = recorder
+    try:
+        one = fake.create_client(name="one", wm_class=("one", "One"))
+        two = fake.create_client(name="two", wm_class=("two", "Two"))
+        fake.map_client(one)
+        fake.map_client(two)
+        q._xpoll()
+        fake.destroy_client(one)
+        q._xpoll()
+    finally:
+        teardown_qtile(q)
+    recorded = (managed[:], killed[:])
+    del managed[:], killed[:]
+
+    replay, batches = xrecord.build(recorder.writer.records)
+    subscribe()
+    try:
+        result = xrecord.play(
+            replay, batches, FakeConfig(),
+            libqtile.manager.init_log(logging.CRITICAL)
+        )
+    finally:
+        libqtile.hook.clear()
+    assert managed == [("one", ("one", "One")), ("two", ("two", "Two"))]
+    assert killed == ["one"]
+    assert (managed, killed) == recorded
+    assert result["misses"] == {}
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import libqtile.xrecord as xrecord
+
+
+def test_write_read():
+    fd, fname = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        w = xrecord.Writer(fname)
+        w.write(xrecord.EVENT, None, "event", cls=str)
+        w.write(xrecord.BATCH)
+        w.write(xrecord.REPLY, "core.GetProperty", "reply", cls=str)
+        w.write(xrecord.ERROR, "core.GetProperty", cls=ValueError)
+        w.close()
+        records = list(xrecord.read(fname))
+    finally:
+        os.unlink(fname)
+    assert records == [
+        (xrecord.EVENT, None, "__builtin__.str", "event"),
+        (xrecord.BATCH, None, None, ""),
+        (xrecord.REPLY, "core.GetProperty", "__builtin__.str", "reply"),
+        (xrecord.ERROR, "core.GetProperty", "exceptions.ValueError", ""),
+    ]
+
+
+def test_replay_connection_repeats_last_reply():
+    conn = xrecord.ReplayConnection(None, [
+        ("core.GetGeometry", "(1,)", 1),
+        ("core.GetGeometry", "(1,)", 2),
+    ])
+    assert conn.core.GetGeometry(1).reply() == 1
+    # Other arguments fall back to the unused replies, then the last one.
+    assert conn.core.GetGeometry(2).reply() == 2
+    assert conn.core.GetGeometry(1).reply() == 2
+    assert conn.misses == {"core.GetGeometry": 2}
+    try:
+        conn.core.QueryTree(1).reply()
+    except xrecord.ReplayError:
+        pass
+    else:
+        raise AssertionError("missing reply not reported")
+
+
+def test_replay_connection_matches_arguments():
+    conn = xrecord.ReplayConnection(None, [
+        ("core.GetProperty", "(0, 1, 5)", "one"),
+        ("core.GetProperty", "(0, 2, 5)", "two"),
+        ("core.GetProperty", None, "old"),
+    ])
+    # Requests made in another order get the replies for their arguments.
+    assert conn.core.GetProperty(False, 2, 5).reply() == "two"
+    assert conn.core.GetProperty(False, 1, 5).reply() == "one"
+    assert conn.misses == {}
+    # Replies recorded without arguments are matched by name.
+    assert conn.core.GetProperty(False, 3, 5).reply() == "old"
+    assert conn.misses == {}
+    assert conn.core.GetProperty(False, 3, 5).reply() == "old"
+    assert conn.misses == {"core.GetProperty": 1}
+
+
+def test_replay_connection_generated_ids():
+    conn = xrecord.ReplayConnection(None, [
+        ("core.GetGeometry", "('#0',)", 1),
+    ])
+    wid = conn.generate_id()
+    assert conn.core.GetGeometry(wid).reply() == 1
+    assert conn.misses == {}